@@ -0,0 +1,86 @@
+import os
+import config
+
+def available_cores():
+    """CPU ids this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def pin_current_thread(cores):
+    """
+    Restrict the calling thread to cores (Linux; a no-op elsewhere).
+    Threads started afterwards from this thread inherit the mask.
+    """
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, cores)
+        return True
+    except OSError as e:
+        print(f"Could not set CPU affinity to {sorted(cores)}: {e}")
+        return False
+
+class CoreAllocator:
+    """
+    Splits the available cores into disjoint sets per role ('haar', 'gender',
+    'yolo') in proportion to CORE_SPLIT, so detectors running side by side
+    stop competing for the same cores. Every role gets at least one core;
+    on machines with fewer cores than roles the sets overlap.
+    """
+    def __init__(self, split=None, cores=None):
+        self.split = dict(split or config.CORE_SPLIT)
+        self.cores = list(cores or available_cores())
+        self.assignment = self._assign()
+
+    def _assign(self):
+        roles = list(self.split)
+        total = sum(self.split.values()) or 1
+        if len(self.cores) < len(roles):
+            return {role: [self.cores[i % len(self.cores)]] for i, role in enumerate(roles)}
+
+        # At least one core each, the rest handed out by weight (largest remainder first)
+        counts = {role: 1 for role in roles}
+        spare = len(self.cores) - len(roles)
+        shares = {role: spare * self.split[role] / total for role in roles}
+        for role in roles:
+            counts[role] += int(shares[role])
+        leftover = len(self.cores) - sum(counts.values())
+        for role in sorted(roles, key=lambda r: shares[r] - int(shares[r]), reverse=True)[:leftover]:
+            counts[role] += 1
+
+        assignment = {}
+        start = 0
+        for role in roles:
+            assignment[role] = self.cores[start:start + counts[role]]
+            start += counts[role]
+        return assignment
+
+    def cores_for(self, *roles):
+        cores = []
+        for role in roles:
+            cores.extend(c for c in self.assignment.get(role, []) if c not in cores)
+        return cores
+
+    def pin(self, *roles):
+        """Pin the calling thread to the cores of the given roles when CPU_AFFINITY is on."""
+        if not config.CPU_AFFINITY:
+            return False
+        return pin_current_thread(self.cores_for(*roles))
+
+    def partition(self, n):
+        """Split all cores into n near-equal slices (e.g. one per worker process)."""
+        n = max(1, n)
+        if len(self.cores) < n:
+            return [[self.cores[i % len(self.cores)]] for i in range(n)]
+        size, extra = divmod(len(self.cores), n)
+        slices = []
+        start = 0
+        for i in range(n):
+            end = start + size + (1 if i < extra else 0)
+            slices.append(self.cores[start:end])
+            start = end
+        return slices
+
+# Shared allocator for the running app
+CORES = CoreAllocator()
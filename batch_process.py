@@ -0,0 +1,225 @@
+"""
+Headless batch processing of archived footage.
+
+Runs video files and image globs through FaceDetector as fast as the CPU
+allows (not at camera pace) and streams one record per frame to JSONL or CSV.
+With every-frame object detection ('sync' cadence), consecutive frames go
+through a YoloBatchDispatcher so up to --yolo-batch of them share one YOLO
+forward pass.
+
+Usage:
+    python batch_process.py footage/*.mp4 --every 5 --output results.jsonl
+    python batch_process.py "stills/*.jpg" --output results.csv
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import cv2
+import config
+from detection import FaceDetector
+from object_scheduler import YoloBatchDispatcher
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+_END = object()
+
+def expand_inputs(inputs):
+    """Turn CLI arguments into a list of ('video' | 'image', path)."""
+    items = []
+    for arg in inputs:
+        if os.path.isdir(arg):
+            paths = sorted(glob.glob(os.path.join(arg, "*")))
+        elif any(c in arg for c in "*?["):
+            paths = sorted(glob.glob(arg))
+        else:
+            paths = [arg]
+        for path in paths:
+            kind = 'image' if path.lower().endswith(IMAGE_EXTENSIONS) else 'video'
+            items.append((kind, path))
+    return items
+
+class FrameReader(threading.Thread):
+    """Decodes frames ahead of the detector into a bounded queue."""
+    def __init__(self, items, every=1, prefetch=64):
+        super().__init__(daemon=True)
+        self.items = items
+        self.every = max(1, every)
+        self.frames = queue.Queue(maxsize=prefetch)
+        self.decode_ms = 0.0
+        self.running = True
+
+    def run(self):
+        image_index = 0
+        for kind, path in self.items:
+            if not self.running:
+                break
+            if kind == 'image':
+                if image_index % self.every == 0:
+                    start = time.perf_counter()
+                    frame = cv2.imread(path)
+                    self.decode_ms += (time.perf_counter() - start) * 1000
+                    if frame is not None:
+                        self.frames.put((path, 0, frame))
+                    else:
+                        print(f"Warning: could not read image {path}")
+                image_index += 1
+                continue
+
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                print(f"Warning: could not open video {path}")
+                continue
+            index = 0
+            while self.running:
+                start = time.perf_counter()
+                if index % self.every == 0:
+                    ret, frame = cap.read()
+                else:
+                    # grab() skips the pixel decode for frames we are not sampling
+                    ret, frame = cap.grab(), None
+                self.decode_ms += (time.perf_counter() - start) * 1000
+                if not ret:
+                    break
+                if frame is not None:
+                    self.frames.put((path, index, frame))
+                index += 1
+            cap.release()
+        self.frames.put(_END)
+
+def take_chunk(frames, size):
+    """Up to size decoded items: waits for the first only, and stops after the end marker."""
+    chunk = [frames.get()]
+    while chunk[-1] is not _END and len(chunk) < size:
+        try:
+            chunk.append(frames.get_nowait())
+        except queue.Empty:
+            break
+    return chunk
+
+def to_record(source, index, results, latency):
+    faces = []
+    for i, ((x, y, w, h), gender) in enumerate(results.get('faces', [])):
+        face = {'box': [int(x), int(y), int(w), int(h)], 'gender': gender}
+        if 'tracks' in results:
+            face['track'] = int(results['tracks'][i])
+        faces.append(face)
+    objects = [
+        {'label': label, 'confidence': round(float(conf), 4), 'box': [int(v) for v in box]}
+        for label, conf, box in results.get('objects', [])
+    ]
+    return {'source': source, 'frame': index, 'faces': faces, 'objects': objects, 'latency_ms': round(latency, 2)}
+
+class ResultWriter:
+    """Streams records to JSONL (default) or CSV, chosen by file extension."""
+    CSV_FIELDS = ['source', 'frame', 'num_faces', 'num_objects', 'latency_ms', 'faces', 'objects']
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', newline='') if path else None
+        self.csv = None
+        if path and path.lower().endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=self.CSV_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.file is None:
+            return
+        if self.csv:
+            self.csv.writerow({
+                'source': record['source'], 'frame': record['frame'],
+                'num_faces': len(record['faces']), 'num_objects': len(record['objects']),
+                'latency_ms': record['latency_ms'],
+                'faces': json.dumps(record['faces']), 'objects': json.dumps(record['objects']),
+            })
+        else:
+            self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batch face/object detection")
+    parser.add_argument("inputs", nargs="+", help="video files, image globs or directories")
+    parser.add_argument("--output", "-o", help="results file (.jsonl or .csv); omit to only print the summary")
+    parser.add_argument("--every", type=int, default=1, help="process every Nth frame")
+    parser.add_argument("--prefetch", type=int, default=64, help="decoded frames buffered ahead of the detector")
+    parser.add_argument("--yolo-batch", type=int, default=config.YOLO_MAX_BATCH,
+                        help="consecutive frames per YOLO forward pass (1 = one pass per frame)")
+    args = parser.parse_args()
+
+    items = expand_inputs(args.inputs)
+    if not items:
+        raise SystemExit("No inputs found.")
+
+    detector = FaceDetector()
+    dispatcher = None
+    if args.yolo_batch > 1 and detector.object_detector.enabled and detector.object_scheduler.mode == 'sync':
+        dispatcher = YoloBatchDispatcher(detector.object_detector, max_batch=args.yolo_batch)
+    reader = FrameReader(items, every=args.every, prefetch=args.prefetch)
+    writer = ResultWriter(args.output)
+
+    stage_totals = {}
+    frames = 0
+    faces = 0
+    current_source = None
+    start = time.perf_counter()
+    reader.start()
+    try:
+        done = False
+        while not done:
+            chunk = take_chunk(reader.frames, args.yolo_batch if dispatcher else 1)
+            if chunk[-1] is _END:
+                chunk.pop()
+                done = True
+            # Queue the whole chunk before waiting, so its frames share a forward pass
+            futures = [dispatcher.submit(frame) for _, _, frame in chunk] if dispatcher else [None] * len(chunk)
+            for (source, index, frame), future in zip(chunk, futures):
+                if source != current_source:
+                    # Tracks and cached genders do not carry over between videos
+                    detector.reset()
+                    current_source = source
+                if future is None:
+                    results, latency = detector.detect(frame)
+                else:
+                    try:
+                        objects, object_times = future.result(), future.stage_times
+                    except Exception as e:
+                        print(f"Batched Object Detection Error: {e}")
+                        objects, object_times = [], {}
+                    results, latency = detector.detect(frame, objects=objects, object_times=object_times)
+                for stage, ms in detector.stage_times.items():
+                    stage_totals[stage] = stage_totals.get(stage, 0.0) + ms
+                record = to_record(source, index, results, latency)
+                writer.write(record)
+                frames += 1
+                faces += len(record['faces'])
+    except KeyboardInterrupt:
+        print("Interrupted, writing summary...")
+        reader.running = False
+    finally:
+        writer.close()
+        if dispatcher:
+            dispatcher.close()
+        detector.close()
+    elapsed = time.perf_counter() - start
+
+    print("========================================")
+    print(f" Frames processed : {frames} from {len(items)} input(s)")
+    print(f" Faces found      : {faces}")
+    print(f" Wall time        : {elapsed:.1f} s")
+    print(f" Throughput       : {frames / elapsed if elapsed > 0 else 0:.1f} frames/s")
+    if frames:
+        print(f"   decode         : {reader.decode_ms / frames:.2f} ms/frame (reader thread)")
+        for stage, total in stage_totals.items():
+            print(f"   {stage:<14} : {total / frames:.2f} ms/frame")
+    if args.output:
+        print(f" Results written to {args.output}")
+    print("========================================")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import glob
+import os
+import time
+import cv2
+import numpy as np
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of numbers (q in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+def summarize(samples_ms):
+    """Mean / p50 / p90 / p99 summary of latency samples in ms."""
+    if not samples_ms:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p90_ms': 0.0, 'p99_ms': 0.0}
+    return {
+        'count': len(samples_ms),
+        'mean_ms': sum(samples_ms) / len(samples_ms),
+        'p50_ms': percentile(samples_ms, 50),
+        'p90_ms': percentile(samples_ms, 90),
+        'p99_ms': percentile(samples_ms, 99),
+    }
+
+def time_call(fn, repeats=100, warmup=5):
+    """Run fn() repeatedly, returning per-call latencies in ms (warm-up excluded)."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def synthetic_frames(count=30, width=640, height=480, seed=0):
+    """Deterministic noise frames with a few bright blobs so detectors have something to chew on."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        cx = int(width * (0.3 + 0.4 * ((i % 10) / 10.0)))
+        cy = height // 2
+        cv2.circle(frame, (cx, cy), max(20, height // 8), (200, 180, 160), -1)
+        frames.append(frame)
+    return frames
+
+def load_frames(source=None, limit=100, every=1, size=None):
+    """
+    Load frames from a video file, an image glob or a directory of images.
+    Falls back to synthetic frames when no source is given.
+    """
+    if not source:
+        w, h = size if size else (640, 480)
+        return synthetic_frames(limit, w, h)
+
+    frames = []
+    if os.path.isdir(source) or any(c in source for c in "*?["):
+        pattern = os.path.join(source, "*") if os.path.isdir(source) else source
+        for path in sorted(glob.glob(pattern))[::every]:
+            img = cv2.imread(path)
+            if img is not None:
+                frames.append(img)
+            if len(frames) >= limit:
+                break
+    else:
+        cap = cv2.VideoCapture(source)
+        index = 0
+        while len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if index % every == 0:
+                frames.append(frame)
+            index += 1
+        cap.release()
+
+    if size:
+        frames = [cv2.resize(f, size) for f in frames]
+    return frames
+
+def print_table(rows, columns):
+    """Print a list of dicts as a fixed-width table."""
+    widths = [max(len(c), *(len(f"{r.get(c, '')}") for r in rows)) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in rows:
+        print("  ".join(f"{r.get(c, '')}".ljust(w) for c, w in zip(columns, widths)))
@@ -0,0 +1,82 @@
+"""
+Benchmark: detection-log write throughput for the SQLite and MySQL backends
+at a paced event rate (30 and 300 events/s by default).
+
+Usage (from the repo root):
+    python -m benchmarks.db_write --backends sqlite mysql --rates 30 300 --duration 10
+"""
+import argparse
+import os
+import tempfile
+import time
+import config
+from db import BatchWriter
+from storage import create_backend
+from benchmarks.common import print_table, summarize
+
+def run(backend_name, rate, duration):
+    backend = create_backend(backend_name)
+    if backend_name == 'sqlite':
+        backend.path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    backend.connect()
+    if not backend.is_connected():
+        return None
+    backend.create_tables()
+
+    batch_ms = []
+    def write_batch(rows):
+        start = time.perf_counter()
+        backend.insert_detections(rows)
+        batch_ms.append((time.perf_counter() - start) * 1000)
+
+    writer = BatchWriter(write_batch)
+    submit_ms = []
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    n = 0
+    while time.perf_counter() - start < duration:
+        t0 = time.perf_counter()
+        writer.submit((1, 'CPU', 30.0, 15.0))
+        submit_ms.append((time.perf_counter() - t0) * 1000)
+        n += 1
+        # Pace to the target rate
+        sleep = start + n * interval - time.perf_counter()
+        if sleep > 0:
+            time.sleep(sleep)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    backend.close()
+
+    stats = writer.get_stats()
+    batches = summarize(batch_ms)
+    submits = summarize(submit_ms)
+    return {
+        'backend': backend_name,
+        'rate': rate,
+        'written/s': f"{stats['written'] / elapsed:.0f}",
+        'dropped': stats['dropped'],
+        'batch_p50_ms': f"{batches['p50_ms']:.2f}",
+        'batch_p99_ms': f"{batches['p99_ms']:.2f}",
+        'submit_p99_ms': f"{submits['p99_ms']:.3f}",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage backend write benchmark")
+    parser.add_argument("--backends", nargs="+", default=['sqlite', 'mysql'])
+    parser.add_argument("--rates", type=int, nargs="+", default=[30, 300])
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for name in args.backends:
+        for rate in args.rates:
+            row = run(name, rate, args.duration)
+            if row is None:
+                print(f"Skipping {name}: backend unavailable.")
+                break
+            rows.append(row)
+    print(f"Batch size {config.DB_WRITE_BATCH_SIZE}, flush interval {config.DB_FLUSH_INTERVAL}s")
+    print_table(rows, ['backend', 'rate', 'written/s', 'dropped', 'batch_p50_ms', 'batch_p99_ms', 'submit_p99_ms'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: forward latency of each network across DNN backend/target pairs
+and OpenCV thread counts.
+
+Only pairs this OpenCV build reports as available are run (OpenVINO, CUDA
+and FP16 targets appear when the build supports them). With --split the
+matrix also runs Haar and YOLO concurrently, once sharing all cores and once
+pinned to disjoint cores by CoreAllocator, to show oversubscription.
+
+Usage (from the repo root):
+    python -m benchmarks.dnn_matrix
+    python -m benchmarks.dnn_matrix --models yolo-tiny mobilenet-ssd --threads 1 2 4 --split
+"""
+import argparse
+import os
+import threading
+import time
+import cv2
+import numpy as np
+import config
+import dnn_backend
+from affinity import CoreAllocator, available_cores, pin_current_thread
+from model_cache import MODEL_SOURCES, source_paths
+from benchmarks.common import print_table, summarize, synthetic_frames, time_call
+
+INPUT_SIZES = {'gender': 227, 'yolo-tiny': 416, 'yolo-full': 416, 'mobilenet-ssd': 300}
+
+def load(name, backend, target):
+    paths = source_paths(name)
+    net = cv2.dnn.readNet(*paths)
+    dnn_backend.apply(net, backend, target)
+    layer_names = net.getLayerNames()
+    outputs = [layer_names[int(np.array(i).flatten()[0]) - 1] for i in net.getUnconnectedOutLayers()]
+    return net, outputs
+
+def forward_fn(net, outputs, size):
+    blob = np.random.default_rng(0).random((1, 3, size, size), dtype=np.float32)
+
+    def run():
+        net.setInput(blob)
+        net.forward(outputs)
+    return run
+
+def run_matrix(models, threads, repeats):
+    rows = []
+    for backend, target in dnn_backend.available_pairs():
+        for name in models:
+            try:
+                net, outputs = load(name, backend, target)
+                fn = forward_fn(net, outputs, INPUT_SIZES[name])
+                fn() # compile/allocate for this backend before timing
+            except cv2.error as e:
+                rows.append({'model': name, 'backend': backend, 'target': target, 'threads': '-',
+                             'p50_ms': 'error', 'p90_ms': str(e).splitlines()[0][:40]})
+                continue
+            for n in threads:
+                cv2.setNumThreads(n)
+                s = summarize(time_call(fn, repeats, warmup=2))
+                rows.append({'model': name, 'backend': backend, 'target': target, 'threads': n,
+                             'p50_ms': f"{s['p50_ms']:.1f}", 'p90_ms': f"{s['p90_ms']:.1f}"})
+    return rows
+
+def run_split(duration):
+    """Haar and YOLO-tiny side by side: shared cores vs CoreAllocator's disjoint sets."""
+    cascade = cv2.CascadeClassifier(os.path.join("data", config.HAAR_CASCADE_FILENAME))
+    gray = cv2.cvtColor(synthetic_frames(1, 1280, 720)[0], cv2.COLOR_BGR2GRAY)
+    net, outputs = load('yolo-tiny', 'opencv', 'cpu')
+    yolo = forward_fn(net, outputs, INPUT_SIZES['yolo-tiny'])
+    allocator = CoreAllocator(cores=available_cores())
+
+    rows = []
+    for label, pinned in (('shared', False), ('split', True)):
+        samples = {'haar': [], 'yolo': []}
+        stop = time.time() + duration
+
+        def worker(role, fn):
+            if pinned:
+                pin_current_thread(allocator.cores_for(*(('haar', 'gender') if role == 'haar' else ('yolo',))))
+            while time.time() < stop:
+                t0 = time.perf_counter()
+                fn()
+                samples[role].append((time.perf_counter() - t0) * 1000)
+
+        threads = [
+            threading.Thread(target=worker, args=('haar', lambda: cascade.detectMultiScale(gray, 1.1, 5))),
+            threading.Thread(target=worker, args=('yolo', yolo)),
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for role, data in samples.items():
+            s = summarize(data)
+            rows.append({'cores': label, 'stage': role, 'runs': s['count'],
+                         'p50_ms': f"{s['p50_ms']:.1f}", 'p90_ms': f"{s['p90_ms']:.1f}"})
+    pin_current_thread(available_cores())
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="DNN backend/target/thread matrix")
+    parser.add_argument("--models", nargs="+", default=['gender', 'yolo-tiny', 'mobilenet-ssd'],
+                        choices=sorted(MODEL_SOURCES))
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--split", action="store_true", help="also compare shared vs pinned cores for Haar + YOLO")
+    parser.add_argument("--split-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    models = [m for m in args.models if all(os.path.exists(p) for p in source_paths(m))]
+    if not models:
+        raise SystemExit("No model files found; run setup_data.py first.")
+    print(f"OpenCV {cv2.__version__}, available backend/targets: {dnn_backend.available_pairs()}")
+    print_table(run_matrix(models, sorted(set(args.threads)), args.repeats),
+                ['model', 'backend', 'target', 'threads', 'p50_ms', 'p90_ms'])
+
+    if args.split:
+        print()
+        print_table(run_split(args.split_seconds), ['cores', 'stage', 'runs', 'p50_ms', 'p90_ms'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: face-stage latency and recall with tracking vs full detection on every frame,
+plus gender-cache hit rate and saved inferences. The 'full' baseline classifies
+every face on every frame; 'tracked' keeps each track's first label and
+'tracked+cache' uses the gender cache's rolling vote instead.
+
+Usage (from the repo root):
+    python -m benchmarks.face_tracking --source clip.mp4 --interval 5
+"""
+import argparse
+import config
+from detection import FaceDetector
+from tracking import FaceTracker, GenderCache, iou
+from benchmarks.common import load_frames, print_table, summarize
+
+def face_stage_ms(detector):
+    t = detector.stage_times
+    return t['grayscale'] + t['haar'] + t['gender']
+
+def run(detector, frames):
+    boxes = []
+    samples = []
+    for frame in frames:
+        results, _ = detector.detect(frame)
+        boxes.append([rect for rect, _ in results['faces']])
+        samples.append(face_stage_ms(detector))
+    return boxes, samples
+
+def recall(reference, candidate, threshold=0.5):
+    """Fraction of reference faces matched by a candidate box with IoU >= threshold."""
+    total = matched = 0
+    for ref_boxes, cand_boxes in zip(reference, candidate):
+        for r in ref_boxes:
+            total += 1
+            if any(iou(r, c) >= threshold for c in cand_boxes):
+                matched += 1
+    return matched / total if total else 1.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Face tracking benchmark")
+    parser.add_argument("--source", help="video file or image glob (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--interval", type=int, nargs="+", default=[config.FACE_DETECT_INTERVAL])
+    args = parser.parse_args()
+
+    # Face stage only
+    config.ENABLE_OBJECT_DETECTION = False
+    config.ENABLE_FACE_TRACKING = False
+    config.ENABLE_GENDER_CACHE = False
+    frames = load_frames(args.source, limit=args.frames)
+    detector = FaceDetector()
+
+    ref_boxes, ref_ms = run(detector, frames)
+    base = summarize(ref_ms)
+    rows = [{'mode': 'full', 'interval': 1, 'mean_ms': f"{base['mean_ms']:.2f}",
+             'p90_ms': f"{base['p90_ms']:.2f}", 'speedup': "1.00x", 'recall': "1.000"}]
+
+    for interval in args.interval:
+        for mode, use_cache in (('tracked', False), ('tracked+cache', True)):
+            if use_cache and not detector.gender_detector.enabled:
+                continue
+            detector.tracker = FaceTracker(detector.detect_face_rects, detect_interval=interval)
+            detector.gender_cache = GenderCache() if use_cache else None
+            boxes, ms = run(detector, frames)
+            s = summarize(ms)
+            rows.append({
+                'mode': mode, 'interval': interval,
+                'mean_ms': f"{s['mean_ms']:.2f}", 'p90_ms': f"{s['p90_ms']:.2f}",
+                'speedup': f"{base['mean_ms'] / s['mean_ms']:.2f}x" if s['mean_ms'] else "-",
+                'recall': f"{recall(ref_boxes, boxes):.3f}",
+            })
+            tracker = detector.tracker
+            print(f"{mode} interval {interval}: {tracker.full_detections} full / {tracker.roi_detections} ROI frames, "
+                  f"{tracker.next_id - 1} track ids issued")
+            if detector.gender_cache:
+                stats = detector.gender_cache.get_stats()
+                print(f"  gender cache: hit rate {stats['hit_rate']:.1%}, "
+                      f"{stats['saved_inferences']} inferences saved, {stats['evictions']} evictions")
+    print_table(rows, ['mode', 'interval', 'mean_ms', 'p90_ms', 'speedup', 'recall'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: memory allocated per displayed frame, fresh frames vs. the frame ring.
+
+'fresh' is the old path: cap.read() returns a new array each frame, the GUI
+draws on it in place and (Tk) converts it to a new RGB array. 'ring' reads
+into preallocated FrameRing slots and draws on a reused OverlayCanvas.
+Allocations are measured with tracemalloc (NumPy and OpenCV's Python
+bindings report their buffers to it) as the peak bytes allocated while
+handling each frame.
+
+Usage (from the repo root):
+    python -m benchmarks.frame_alloc
+    python -m benchmarks.frame_alloc --source clip.mp4 --width 1920 --height 1080
+"""
+import argparse
+import tracemalloc
+import cv2
+import numpy as np
+from frame_ring import FrameRing, OverlayCanvas
+from benchmarks.common import print_table, synthetic_frames
+
+class ReplayCapture:
+    """Stands in for cv2.VideoCapture, with the same read(image=...) reuse semantics."""
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+
+    def read(self, image=None):
+        src = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        if image is None or image.shape != src.shape:
+            image = np.empty_like(src)
+        np.copyto(image, src)
+        return True, image
+
+def draw_overlay(image):
+    cv2.rectangle(image, (50, 50), (200, 220), (0, 255, 0), 2)
+    cv2.putText(image, "FPS: 30.0", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+def fresh_frame(cap, state, rgb):
+    ret, frame = cap.read()
+    if not ret:
+        return None
+    draw_overlay(frame)
+    if rgb:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return frame
+
+def ring_frame(cap, state, rgb):
+    frame = state['ring'].read(cap)
+    if frame is None:
+        return None
+    image = state['canvas'].compose(frame.image, cv2.COLOR_BGR2RGB if rgb else None)
+    frame.release()
+    draw_overlay(image)
+    return image
+
+def measure(step, cap, frames, rgb, warmup=10):
+    state = {'ring': FrameRing(4), 'canvas': OverlayCanvas()}
+    for _ in range(warmup):
+        step(cap, state, rgb)
+
+    per_frame = []
+    tracemalloc.start()
+    for _ in range(frames):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(cap, state, rgb)
+        per_frame.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return per_frame
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame allocation benchmark")
+    parser.add_argument("--source", help="video file to capture from (synthetic frames if omitted)")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    def open_capture():
+        if args.source:
+            return cv2.VideoCapture(args.source)
+        return ReplayCapture(synthetic_frames(10, args.width, args.height))
+
+    rows = []
+    for gui, rgb in (('cv2', False), ('tk', True)):
+        for name, step in (('fresh', fresh_frame), ('ring', ring_frame)):
+            samples = measure(step, open_capture(), args.frames, rgb)
+            rows.append({
+                'gui': gui,
+                'path': name,
+                'kb_per_frame': f"{sum(samples) / len(samples) / 1024:.1f}",
+                'max_kb': f"{max(samples) / 1024:.1f}",
+            })
+    print_table(rows, ['gui', 'path', 'kb_per_frame', 'max_kb'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: per-frame gender latency against face count, per-face vs batched.
+
+Usage (from the repo root):
+    python -m benchmarks.gender_batch --max-faces 20 --batch-size 16
+"""
+import argparse
+import numpy as np
+import config
+from detection import GenderDetector
+from benchmarks.common import print_table, summarize, time_call
+
+def main():
+    parser = argparse.ArgumentParser(description="Gender batch benchmark")
+    parser.add_argument("--max-faces", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=config.GENDER_BATCH_SIZE)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    config.GENDER_BATCH_SIZE = args.batch_size
+    detector = GenderDetector()
+    if not detector.enabled:
+        raise SystemExit("Gender model files not found; run setup_data.py first.")
+
+    rng = np.random.default_rng(0)
+    crops = [rng.integers(0, 255, (int(rng.integers(60, 160)),) * 2 + (3,), dtype=np.uint8)
+             for _ in range(args.max_faces)]
+
+    rows = []
+    for n in (1, 2, 4, 8, 12, 16, 20):
+        if n > args.max_faces:
+            break
+        faces = crops[:n]
+        single = summarize(time_call(lambda: [detector.predict_gender(f) for f in faces], args.repeats))
+        batched = summarize(time_call(lambda: detector.predict_genders(faces), args.repeats))
+        rows.append({
+            'faces': n,
+            'per_face_ms': f"{single['mean_ms']:.1f}",
+            'batched_ms': f"{batched['mean_ms']:.1f}",
+            'speedup': f"{single['mean_ms'] / batched['mean_ms']:.2f}x" if batched['mean_ms'] else "-",
+        })
+    print(f"Gender batch size: {args.batch_size}")
+    print_table(rows, ['faces', 'per_face_ms', 'batched_ms', 'speedup'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: Haar latency vs recall over downscale factor and scale factor,
+at 720p and 1080p. Recall is measured against full-resolution detection with
+the configured SCALE_FACTOR, so use a recorded clip with real faces.
+
+Usage (from the repo root):
+    python -m benchmarks.haar_sweep --source clip.mp4 --min-size 60
+"""
+import argparse
+import time
+import cv2
+import config
+from detection import FaceDetector
+from tracking import iou
+from benchmarks.common import load_frames, print_table, summarize
+
+RESOLUTIONS = {'720p': (1280, 720), '1080p': (1920, 1080)}
+DOWNSCALES = (1.0, 0.75, 0.5, 0.33, 0.25)
+SCALE_FACTORS = (1.05, 1.1, 1.2, 1.3)
+
+def run(detector, grays, scale):
+    boxes = []
+    samples = []
+    for gray in grays:
+        start = time.perf_counter()
+        if scale < 1.0:
+            rects = detector.detect_face_rects_scaled(gray, scale)
+        else:
+            rects = detector.cpu_cascade.detectMultiScale(
+                gray, config.SCALE_FACTOR, config.MIN_NEIGHBORS, minSize=config.MIN_SIZE
+            )
+        samples.append((time.perf_counter() - start) * 1000)
+        boxes.append([tuple(int(v) for v in r) for r in rects])
+    return boxes, samples
+
+def recall(reference, candidate, threshold=0.5):
+    total = matched = 0
+    for ref_boxes, cand_boxes in zip(reference, candidate):
+        for r in ref_boxes:
+            total += 1
+            if any(iou(r, c) >= threshold for c in cand_boxes):
+                matched += 1
+    return matched / total if total else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Haar downscale sweep")
+    parser.add_argument("--source", help="video file or image glob (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--min-size", type=int, default=config.MIN_SIZE[0], help="smallest face (px at full resolution)")
+    args = parser.parse_args()
+
+    config.ENABLE_GENDER_DETECTION = False
+    config.ENABLE_OBJECT_DETECTION = False
+    config.MIN_SIZE = (args.min_size, args.min_size)
+    detector = FaceDetector()
+    base_frames = load_frames(args.source, limit=args.frames)
+
+    for name, size in RESOLUTIONS.items():
+        grays = [cv2.cvtColor(cv2.resize(f, size), cv2.COLOR_BGR2GRAY) for f in base_frames]
+        config.SCALE_FACTOR = 1.1
+        reference, ref_ms = run(detector, grays, 1.0)
+        ref_mean = summarize(ref_ms)['mean_ms']
+        faces = sum(len(b) for b in reference)
+
+        rows = []
+        for scale_factor in SCALE_FACTORS:
+            config.SCALE_FACTOR = scale_factor
+            for downscale in DOWNSCALES:
+                boxes, ms = run(detector, grays, downscale)
+                s = summarize(ms)
+                r = recall(reference, boxes)
+                rows.append({
+                    'scale_factor': scale_factor, 'downscale': downscale,
+                    'mean_ms': f"{s['mean_ms']:.1f}", 'p90_ms': f"{s['p90_ms']:.1f}",
+                    'speedup': f"{ref_mean / s['mean_ms']:.2f}x" if s['mean_ms'] else "-",
+                    'recall': f"{r:.3f}" if r is not None else "-",
+                })
+        print(f"\n{name} {size[0]}x{size[1]}: reference {ref_mean:.1f} ms/frame, {faces} faces "
+              f"(min size {args.min_size}px, auto downscale would be {min(1.0, config.HAAR_WINDOW[0] / args.min_size):.2f})")
+        print_table(rows, ['scale_factor', 'downscale', 'mean_ms', 'p90_ms', 'speedup', 'recall'])
+    config.SCALE_FACTOR = 1.1
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: cold vs. warm model load time and first-frame latency.
+
+Every measurement runs in a fresh interpreter, like an app launch.
+'cold' uses an empty cache directory (nothing recorded yet); 'warm'
+repeats the launch against the now populated cache (an ONNX conversion is
+used if registered, and the files sit in the OS page cache). hash_ms is
+the fingerprint time, a few stat() calls. Each launch reports the first
+forward pass with and without the warm-up pass that MODEL_WARMUP adds at
+load time. For truly cold disk reads drop the OS page cache first
+(Linux: echo 3 > /proc/sys/vm/drop_caches).
+
+Usage (from the repo root):
+    python -m benchmarks.model_load
+    python -m benchmarks.model_load --models yolo-tiny --size 416
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import cv2
+import numpy as np
+from model_cache import MODEL_SOURCES, ModelCache, source_paths
+from benchmarks.common import print_table
+
+def input_shape(name, size):
+    return (1, 3, 227, 227) if name == 'gender' else (1, 3, size, size)
+
+def measure_launch(name, cache_dir, size, warmup):
+    """Load one model the way the app does and time the first frames."""
+    paths = source_paths(name)
+    cache = ModelCache(cache_dir)
+    net, info = cache.load(name, paths, lambda: cv2.dnn.readNet(*paths))
+    outputs = None
+    if name != 'gender':
+        layer_names = net.getLayerNames()
+        outputs = [layer_names[int(np.array(i).flatten()[0]) - 1] for i in net.getUnconnectedOutLayers()]
+
+    warmup_ms = cache.warm_up(name, net, input_shape(name, size), outputs) if warmup else 0.0
+
+    blob = np.random.default_rng(0).random(input_shape(name, size), dtype=np.float32)
+    frames = []
+    for _ in range(6):
+        t0 = time.perf_counter()
+        net.setInput(blob)
+        net.forward(outputs) if outputs else net.forward()
+        frames.append((time.perf_counter() - t0) * 1000)
+    return {
+        'source': info['source'],
+        'hash_ms': info['hash_ms'],
+        'load_ms': info['load_ms'],
+        'warmup_ms': warmup_ms,
+        'first_frame_ms': frames[0],
+        'steady_ms': float(np.median(frames[1:])),
+    }
+
+def launch(name, cache_dir, size, warmup):
+    cmd = [sys.executable, "-m", "benchmarks.model_load", "--child", name, "--cache-dir", cache_dir,
+           "--size", str(size)]
+    if not warmup:
+        cmd.append("--no-warmup")
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    # Model loading prints progress lines; the result is the last one
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Model load benchmark")
+    parser.add_argument("--models", nargs="+", default=sorted(MODEL_SOURCES), choices=sorted(MODEL_SOURCES))
+    parser.add_argument("--size", type=int, default=416, help="YOLO input size for the forward passes")
+    parser.add_argument("--cache-dir", help="populated cache to use for the warm runs (default: a fresh one)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--no-warmup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_launch(args.child, args.cache_dir, args.size, not args.no_warmup)))
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.models:
+            if not all(os.path.exists(p) for p in source_paths(name)):
+                print(f"{name}: model files not found; run setup_data.py first.")
+                continue
+            cold_dir = os.path.join(tmp, name)
+            warm_dir = args.cache_dir or cold_dir
+            runs = [
+                ('cold', cold_dir, False),
+                ('warm', warm_dir, False),
+                ('warm+warmup', warm_dir, True),
+            ]
+            for label, cache_dir, warmup in runs:
+                r = launch(name, cache_dir, args.size, warmup)
+                rows.append({
+                    'model': name, 'launch': label, 'source': r['source'],
+                    'hash_ms': f"{r['hash_ms']:.0f}", 'load_ms': f"{r['load_ms']:.0f}",
+                    'warmup_ms': f"{r['warmup_ms']:.0f}", 'first_frame_ms': f"{r['first_frame_ms']:.1f}",
+                    'steady_ms': f"{r['steady_ms']:.1f}",
+                })
+    print_table(rows, ['model', 'launch', 'source', 'hash_ms', 'load_ms', 'warmup_ms', 'first_frame_ms',
+                       'steady_ms'])
+
+if __name__ == "__main__":
+    main()
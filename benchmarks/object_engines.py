@@ -0,0 +1,130 @@
+"""
+Benchmark: accuracy vs. latency of the object detection engines
+(MobileNet-SSD, YOLOv4-tiny, YOLOv4 full) on the same frames.
+
+Accuracy is precision/recall at IoU >= 0.5 on the classes both label sets
+share (VOC names are mapped onto COCO ones). The reference is a labels file
+when given, otherwise the output of the --reference setting (full@608), so
+without labels the numbers measure agreement with the most accurate engine.
+A labels file is JSON with one list per frame of [label, x, y, w, h] entries.
+
+Usage (from the repo root):
+    python -m benchmarks.object_engines --source clip.mp4
+    python -m benchmarks.object_engines --source frames/ --labels labels.json --settings ssd:300 tiny:416 full:416
+"""
+import argparse
+import json
+import config
+from detection import ObjectDetector
+from tracking import iou
+from benchmarks.common import load_frames, print_table, summarize
+
+# VOC label -> COCO label for the classes both datasets have
+VOC_TO_COCO = {
+    'aeroplane': 'airplane', 'bicycle': 'bicycle', 'bird': 'bird', 'boat': 'boat', 'bottle': 'bottle',
+    'bus': 'bus', 'car': 'car', 'cat': 'cat', 'chair': 'chair', 'cow': 'cow', 'diningtable': 'dining table',
+    'dog': 'dog', 'horse': 'horse', 'motorbike': 'motorcycle', 'person': 'person', 'pottedplant': 'potted plant',
+    'sheep': 'sheep', 'sofa': 'couch', 'train': 'train', 'tvmonitor': 'tv',
+}
+SHARED_CLASSES = set(VOC_TO_COCO.values())
+
+def normalize(detections):
+    """(label, box) pairs in COCO naming, restricted to the shared classes."""
+    out = []
+    for label, _, box in detections:
+        label = VOC_TO_COCO.get(label, label)
+        if label in SHARED_CLASSES:
+            out.append((label, box))
+    return out
+
+def match(predicted, reference, threshold=0.5):
+    """Greedy same-class IoU matching; returns (true positives, predicted count, reference count)."""
+    used = set()
+    tp = 0
+    for label, box in predicted:
+        best, best_iou = None, threshold
+        for j, (ref_label, ref_box) in enumerate(reference):
+            if j in used or ref_label != label:
+                continue
+            score = iou(box, ref_box)
+            if score >= best_iou:
+                best, best_iou = j, score
+        if best is not None:
+            used.add(best)
+            tp += 1
+    return tp, len(predicted), len(reference)
+
+def run_setting(detector, setting, frames):
+    variant, size = setting
+    detector.set_variant(variant)
+    if variant not in detector.FIXED_SIZE:
+        detector.set_input_size(size)
+    detector.detect(frames[0]) # first pass at a new size pays allocation costs
+    outputs, latencies = [], []
+    for frame in frames:
+        outputs.append(normalize(detector.detect(frame)))
+        latencies.append(detector.stage_times['yolo_forward'] + detector.stage_times['yolo_decode'])
+    return outputs, latencies
+
+def parse_setting(text):
+    variant, _, size = text.partition(":")
+    return variant, int(size) if size else config.YOLO_INPUT_SIZE
+
+def main():
+    parser = argparse.ArgumentParser(description="Object engine accuracy/latency comparison")
+    parser.add_argument("--source", help="video file or image glob (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--settings", nargs="+", default=["ssd:300", "tiny:416", "tiny:608", "full:608"],
+                        help="engine:input_size pairs to compare")
+    parser.add_argument("--reference", default="full:608", help="setting used as ground truth without --labels")
+    parser.add_argument("--labels", help="JSON ground truth, one [[label, x, y, w, h], ...] list per frame")
+    args = parser.parse_args()
+
+    config.YOLO_PRELOAD_ALL_VARIANTS = True
+    config.YOLO_AUTO_TUNE = False
+    detector = ObjectDetector()
+    settings = [parse_setting(s) for s in args.settings]
+    missing = {v for v, _ in settings if v not in detector.nets}
+    if missing:
+        print(f"Skipping engines without model files: {', '.join(sorted(missing))}")
+        settings = [s for s in settings if s[0] not in missing]
+    if not settings:
+        raise SystemExit("No object models found; run setup_data.py first.")
+
+    frames = load_frames(args.source, limit=args.frames)
+    if args.labels:
+        with open(args.labels) as f:
+            reference = [normalize([(r[0], 1.0, tuple(r[1:5])) for r in entries]) for entries in json.load(f)]
+        frames = frames[:len(reference)]
+        ref_name = args.labels
+    else:
+        ref_setting = parse_setting(args.reference)
+        if ref_setting[0] not in detector.nets:
+            raise SystemExit(f"Reference engine '{ref_setting[0]}' is not loaded; pass --labels instead.")
+        reference, _ = run_setting(detector, ref_setting, frames)
+        ref_name = "{}@{}".format(*ref_setting)
+
+    rows = []
+    for setting in settings:
+        outputs, latencies = run_setting(detector, setting, frames)
+        tp = n_pred = n_ref = 0
+        for predicted, expected in zip(outputs, reference):
+            t, p, r = match(predicted, expected)
+            tp, n_pred, n_ref = tp + t, n_pred + p, n_ref + r
+        precision = tp / n_pred if n_pred else 0.0
+        recall = tp / n_ref if n_ref else 0.0
+        s = summarize(latencies)
+        rows.append({
+            'engine': "{}@{}".format(*detector.setting()),
+            'p50_ms': f"{s['p50_ms']:.1f}",
+            'p90_ms': f"{s['p90_ms']:.1f}",
+            'fps': f"{1000 / s['mean_ms']:.1f}" if s['mean_ms'] else "-",
+            'precision': f"{precision:.2f}",
+            'recall': f"{recall:.2f}",
+            'f1': f"{2 * precision * recall / (precision + recall):.2f}" if precision + recall else "0.00",
+        })
+    print(f"Reference: {ref_name} ({len(frames)} frames, shared VOC/COCO classes, IoU >= 0.5)")
+    print_table(rows, ['engine', 'p50_ms', 'p90_ms', 'fps', 'precision', 'recall', 'f1'])
+
+if __name__ == "__main__":
+    main()
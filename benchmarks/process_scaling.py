@@ -0,0 +1,64 @@
+"""
+Benchmark: process-pool inference throughput for 1/2/4/8 workers on a recorded clip.
+
+Usage (from the repo root):
+    python -m benchmarks.process_scaling --source clip.mp4 --workers 1 2 4 8
+"""
+import argparse
+import threading
+import time
+import config
+from detection import FaceDetector
+from inference_pool import ProcessInferencePool
+from benchmarks.common import load_frames, print_table, summarize
+
+def run_pool(frames, num_workers):
+    pool = ProcessInferencePool(num_workers, frame_shape=frames[0].shape)
+    try:
+        feeder = threading.Thread(target=lambda: [pool.submit(f) for f in frames])
+        start = time.perf_counter()
+        feeder.start()
+        latencies = []
+        last_seq = -1
+        for _ in frames:
+            result = pool.get_ordered(timeout=config.PROCESS_TASK_TIMEOUT)
+            if result is None:
+                raise SystemExit(f"No result from the {num_workers}-worker pool; did a worker die?")
+            seq, _, latency = result
+            assert seq == last_seq + 1, "Results out of order"
+            last_seq = seq
+            latencies.append(latency)
+        elapsed = time.perf_counter() - start
+        feeder.join()
+    finally:
+        pool.close()
+    return len(frames) / elapsed, summarize(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description="Process pool scaling benchmark")
+    parser.add_argument("--source", help="video file or image glob (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, limit=args.frames)
+    print(f"Loaded {len(frames)} frames")
+
+    # In-process baseline
+    detector = FaceDetector()
+    start = time.perf_counter()
+    for f in frames:
+        detector.detect(f)
+    baseline_fps = len(frames) / (time.perf_counter() - start)
+
+    rows = [{'backend': 'thread', 'workers': 1, 'fps': f"{baseline_fps:.1f}", 'speedup': "1.00x", 'p50_ms': '-'}]
+    for n in args.workers:
+        fps, lat = run_pool(frames, n)
+        rows.append({
+            'backend': 'process', 'workers': n, 'fps': f"{fps:.1f}",
+            'speedup': f"{fps / baseline_fps:.2f}x", 'p50_ms': f"{lat['p50_ms']:.1f}",
+        })
+    print_table(rows, ['backend', 'workers', 'fps', 'speedup', 'p50_ms'])
+
+if __name__ == "__main__":
+    main()
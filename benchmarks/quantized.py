@@ -0,0 +1,116 @@
+"""
+Benchmark: accuracy delta and speedup of the INT8 gender and YOLO-tiny
+networks (built by `python -m quantize`) against their FP32 originals.
+
+Both variants see the same fixed frame set. Gender reports how often the
+INT8 label agrees with FP32 and the mean change in P(Female); YOLO-tiny
+reports precision/recall of INT8 detections against the FP32 ones at
+IoU >= 0.5. Latency is single-input forward time.
+
+Usage (from the repo root):
+    python -m benchmarks.quantized --source clip.mp4
+    python -m benchmarks.quantized --models gender --source faces/ --frames 200
+"""
+import argparse
+import time
+import cv2
+import config
+from detection import GenderDetector, ObjectDetector
+from quantize import face_crops, int8_path
+from benchmarks.common import load_frames, print_table, summarize
+from benchmarks.object_engines import match
+
+def load_pair(factory):
+    """(fp32, int8) instances of a detector, toggling USE_INT8_MODELS around construction."""
+    config.USE_INT8_MODELS = False
+    fp32 = factory()
+    config.USE_INT8_MODELS = True
+    int8 = factory()
+    return fp32, int8
+
+def gender_probs(detector, face):
+    blob = cv2.dnn.blobFromImage(face, 1.0, (227, 227), config.GENDER_MEAN, swapRB=False)
+    detector.net.setInput(blob)
+    return detector.net.forward()[0]
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def compare_gender(frames):
+    fp32, int8 = load_pair(GenderDetector)
+    crops = face_crops(frames)
+    for d in (fp32, int8):
+        gender_probs(d, crops[0]) # allocate before timing
+    agree, delta = 0, 0.0
+    latencies = {'fp32': [], 'int8': []}
+    for face in crops:
+        p32, ms32 = timed(gender_probs, fp32, face)
+        p8, ms8 = timed(gender_probs, int8, face)
+        latencies['fp32'].append(ms32)
+        latencies['int8'].append(ms8)
+        agree += int(p32.argmax() == p8.argmax())
+        delta += abs(float(p32[1]) - float(p8[1]))
+    accuracy = {
+        'gender_agreement': f"{agree / len(crops):.3f}",
+        'mean_abs_dP(Female)': f"{delta / len(crops):.4f}",
+    }
+    return len(crops), latencies, accuracy
+
+def compare_tiny(frames):
+    config.YOLO_VARIANT = 'tiny'
+    config.YOLO_INPUT_SIZE = config.INT8_INPUT_SIZE
+    config.YOLO_PRELOAD_ALL_VARIANTS = False
+    config.YOLO_AUTO_TUNE = False
+    fp32, int8 = load_pair(ObjectDetector)
+    outputs = {'fp32': [], 'int8': []}
+    latencies = {'fp32': [], 'int8': []}
+    for key, detector in (('fp32', fp32), ('int8', int8)):
+        detector.detect(frames[0])
+        for frame in frames:
+            outputs[key].append([(label, box) for label, _, box in detector.detect(frame)])
+            latencies[key].append(detector.stage_times['yolo_forward'])
+    tp = n_pred = n_ref = 0
+    for predicted, expected in zip(outputs['int8'], outputs['fp32']):
+        t, p, r = match(predicted, expected)
+        tp, n_pred, n_ref = tp + t, n_pred + p, n_ref + r
+    accuracy = {
+        'precision_vs_fp32': f"{tp / n_pred:.3f}" if n_pred else "-",
+        'recall_vs_fp32': f"{tp / n_ref:.3f}" if n_ref else "-",
+    }
+    return len(frames), latencies, accuracy
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 vs FP32 accuracy delta and speedup")
+    parser.add_argument("--source", help="video file or image glob (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--models", nargs="+", default=['gender', 'yolo-tiny'], choices=sorted(config.INT8_MODELS))
+    args = parser.parse_args()
+
+    config.USE_INT8_MODELS = True
+    models = [m for m in args.models if int8_path(m)]
+    skipped = set(args.models) - set(models)
+    if skipped:
+        print(f"Skipping models without an INT8 file (python -m quantize ...): {', '.join(sorted(skipped))}")
+    if not models:
+        raise SystemExit("No INT8 models found.")
+
+    frames = load_frames(args.source, limit=args.frames)
+    runners = {'gender': compare_gender, 'yolo-tiny': compare_tiny}
+    rows = []
+    for name in models:
+        count, latencies, accuracy = runners[name](frames)
+        s32, s8 = summarize(latencies['fp32']), summarize(latencies['int8'])
+        rows.append({
+            'model': name,
+            'inputs': count,
+            'fp32_p50_ms': f"{s32['p50_ms']:.1f}",
+            'int8_p50_ms': f"{s8['p50_ms']:.1f}",
+            'speedup': f"{s32['mean_ms'] / s8['mean_ms']:.2f}x" if s8['mean_ms'] else "-",
+            'accuracy': ", ".join(f"{k} {v}" for k, v in accuracy.items()),
+        })
+    print_table(rows, ['model', 'inputs', 'fp32_p50_ms', 'int8_p50_ms', 'speedup', 'accuracy'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: overlay render time per frame, per-call putText/rectangle vs
+OverlayRenderer (batched boxes, cached text sprites, per-line cached stats
+panel).
+
+Each frame gets N object boxes with labels, a few faces and an eight-line
+stats panel whose FPS/latency lines take a new, never repeated value every
+--panel-every frames (1 = every frame, the worst case for the panel cache). Labels are drawn
+from a realistic pool (class name + confidence) so the sprite cache sees
+a mix of hits and misses.
+
+Usage (from the repo root):
+    python -m benchmarks.render
+    python -m benchmarks.render --boxes 10 30 60 --width 1920 --height 1080 --panel-every 5
+"""
+import argparse
+import random
+import cv2
+from renderer import OverlayRenderer
+from benchmarks.common import print_table, summarize, synthetic_frames, time_call
+
+LABELS = ['person', 'car', 'chair', 'bottle', 'cup', 'laptop', 'dog', 'tv']
+
+def scene(boxes, width, height, frames, seed=0):
+    """Per-frame (objects, faces) lists with jittered boxes and confidences."""
+    rng = random.Random(seed)
+    scenes = []
+    for _ in range(frames):
+        objects = []
+        for _ in range(boxes):
+            w, h = rng.randint(40, 200), rng.randint(40, 200)
+            x, y = rng.randint(0, width - w), rng.randint(20, height - h)
+            objects.append((rng.choice(LABELS), rng.uniform(0.5, 0.99), (x, y, w, h)))
+        faces = [((rng.randint(0, width - 120), rng.randint(0, height - 160), 100, 100), rng.choice(['Male', 'Female']))
+                 for _ in range(3)]
+        scenes.append((objects, faces))
+    return scenes
+
+def panel_lines(i, every):
+    tick = i // every
+    return [f"FPS: {25 + tick * 0.01:.2f}", f"Latency: {38 + tick * 0.001:.3f} ms", "Faces: 3",
+            "Objects: 30", "Mode: CPU", "YOLO: tiny@416", "Pipe: cap 30fps -0 | det 25fps -5",
+            " Controls: [S]tart/Stop [B]enchmark [G]PU [Y]OLO [R]es [A]uto [Q]uit"]
+
+def draw_putText(frame, objects, faces, lines):
+    for (label, conf, (x, y, w, h)) in objects:
+        cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
+        cv2.putText(frame, f"{label} {conf*100:.0f}%", (x, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+    for ((x, y, w, h), gender) in faces:
+        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+        color = (255, 100, 100) if gender == "Female" else (100, 100, 255)
+        cv2.putText(frame, gender, (x, y+h+20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+    for i, line in enumerate(lines):
+        cv2.putText(frame, line, (10, 30 + i*25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+def make_renderer_draw():
+    renderer = OverlayRenderer()
+
+    def draw(frame, objects, faces, lines):
+        renderer.draw_objects(frame, objects)
+        renderer.draw_faces(frame, faces)
+        renderer.draw_panel(frame, lines)
+    return draw, renderer
+
+def run(draw, frames, scenes, every, repeats):
+    canvas = frames[0].copy()
+    state = {'i': 0}
+
+    def one():
+        i = state['i']
+        state['i'] += 1
+        canvas[:] = frames[i % len(frames)]
+        objects, faces = scenes[i % len(scenes)]
+        draw(canvas, objects, faces, panel_lines(i, every))
+    return summarize(time_call(one, repeats, warmup=10))
+
+def main():
+    parser = argparse.ArgumentParser(description="Overlay render time: putText vs OverlayRenderer")
+    parser.add_argument("--boxes", type=int, nargs="+", default=[0, 10, 30, 60])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--panel-every", type=int, default=1, help="frames between stats panel changes")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = synthetic_frames(10, args.width, args.height)
+    rows = []
+    for boxes in args.boxes:
+        scenes = scene(boxes, args.width, args.height, 50)
+        draw, renderer = make_renderer_draw()
+        for name, fn in (('putText', draw_putText), ('renderer', draw)):
+            s = run(fn, frames, scenes, args.panel_every, args.repeats)
+            rows.append({'boxes': boxes, 'path': name, 'p50_ms': f"{s['p50_ms']:.2f}",
+                         'p90_ms': f"{s['p90_ms']:.2f}", 'mean_ms': f"{s['mean_ms']:.2f}"})
+        stats = renderer.get_stats()
+        rows[-1]['cache'] = f"{stats['hits']} hits / {stats['misses']} misses, {stats['panel_redraws']} panel lines rasterized"
+    print(f"{args.width}x{args.height}, stats panel changes every {args.panel_every} frame(s)")
+    print_table(rows, ['boxes', 'path', 'p50_ms', 'p90_ms', 'mean_ms', 'cache'])
+
+if __name__ == "__main__":
+    main()
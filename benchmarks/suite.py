@@ -0,0 +1,199 @@
+"""
+Reproducible headless benchmark suite.
+
+Replays a fixed frame set (deterministic synthetic frames, or a recorded
+clip / image glob) through FaceDetector and reports p50/p90/p99 latency and
+throughput per stage with warm-up frames excluded. Results are written as
+JSON so runs can be compared across commits.
+
+Usage (from the repo root):
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --source clip.mp4 --baseline bench.json --threshold 10
+    python -m benchmarks.suite --source corridor.mp4 --set ENABLE_MOTION_GATING=True
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import cv2
+import config
+from detection import FaceDetector
+from benchmarks.common import load_frames, print_table, summarize
+
+STAGES = ['motion', 'grayscale', 'haar', 'gender', 'yolo_forward', 'yolo_decode']
+
+# Differences below this are treated as timer noise by the regression check
+NOISE_FLOOR_MS = 0.5
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def config_snapshot():
+    """Settings that change what the benchmark measures."""
+    keys = [
+        'FRAME_WIDTH', 'FRAME_HEIGHT', 'SCALE_FACTOR', 'MIN_NEIGHBORS', 'MIN_SIZE',
+        'ENABLE_GENDER_DETECTION', 'ENABLE_OBJECT_DETECTION', 'USE_FULL_YOLO_MODEL',
+        'YOLO_VARIANT', 'YOLO_INPUT_SIZE', 'YOLO_AUTO_TUNE',
+        'ENABLE_FACE_TRACKING', 'FACE_DETECT_INTERVAL', 'ENABLE_GENDER_CACHE', 'GENDER_BATCH_SIZE',
+        'OBJECT_DETECTION_CADENCE', 'OBJECT_DETECTION_INTERVAL', 'ENABLE_MOTION_GATING', 'MOTION_METHOD',
+    ]
+    return {k: getattr(config, k) for k in keys if hasattr(config, k)}
+
+def collect_extras(detector):
+    """Counters from optional detector features, reported alongside the timings."""
+    extras = {}
+    if detector.motion_gate:
+        extras['motion_gate'] = detector.motion_gate.get_stats()
+    if detector.gender_cache:
+        extras['gender_cache'] = detector.gender_cache.get_stats()
+    if detector.object_scheduler.mode != 'sync':
+        extras['object_scheduler'] = {
+            'mode': detector.object_scheduler.mode,
+            'runs': detector.object_scheduler.runs,
+        }
+    if detector.tracker:
+        extras['tracker'] = {
+            'full_detections': detector.tracker.full_detections,
+            'roi_detections': detector.tracker.roi_detections,
+        }
+    return extras
+
+def run_suite(frames, warmup, passes):
+    detector = FaceDetector()
+
+    # Warm-up: first forward passes pay one-time allocation/initialisation costs
+    for frame in frames[:warmup]:
+        detector.detect(frame)
+    detector.reset()
+
+    stage_samples = {stage: [] for stage in STAGES}
+    totals = []
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for _ in range(passes):
+        for frame in frames:
+            _, latency = detector.detect(frame)
+            totals.append(latency)
+            for stage in STAGES:
+                stage_samples[stage].append(detector.stage_times.get(stage, 0.0))
+        detector.reset()
+    elapsed = time.perf_counter() - start
+    cpu_seconds = time.process_time() - cpu_start
+
+    stages = {}
+    for stage, samples in stage_samples.items():
+        s = summarize(samples)
+        s['throughput_fps'] = 1000 / s['mean_ms'] if s['mean_ms'] > 0 else None
+        stages[stage] = s
+    total = summarize(totals)
+    total['throughput_fps'] = len(totals) / elapsed if elapsed > 0 else 0
+    total['cpu_ms_per_frame'] = cpu_seconds * 1000 / len(totals) if totals else 0
+    extras = collect_extras(detector)
+    detector.close()
+    return stages, total, extras
+
+def check_regressions(report, baseline, threshold_pct):
+    """Compare p50/p90 per stage against a baseline report; returns a list of failures."""
+    failures = []
+    rows = []
+    for name in STAGES + ['total']:
+        cur = report['stages'].get(name) if name != 'total' else report['total']
+        old = baseline['stages'].get(name) if name != 'total' else baseline.get('total')
+        if not cur or not old:
+            continue
+        for metric in ('p50_ms', 'p90_ms'):
+            delta = cur[metric] - old[metric]
+            pct = delta / old[metric] * 100 if old[metric] > 0 else 0.0
+            regressed = delta > NOISE_FLOOR_MS and pct > threshold_pct
+            rows.append({
+                'stage': name, 'metric': metric, 'baseline': f"{old[metric]:.2f}",
+                'current': f"{cur[metric]:.2f}", 'change': f"{pct:+.1f}%", 'status': "REGRESSED" if regressed else "ok",
+            })
+            if regressed:
+                failures.append(f"{name} {metric}: {old[metric]:.2f} -> {cur[metric]:.2f} ms ({pct:+.1f}%)")
+    print_table(rows, ['stage', 'metric', 'baseline', 'current', 'change', 'status'])
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage FaceDetector benchmark suite")
+    parser.add_argument("--source", help="recorded clip, image glob or directory (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=60, help="frames in the replay set")
+    parser.add_argument("--warmup", type=int, default=5, help="frames run before measuring")
+    parser.add_argument("--passes", type=int, default=3, help="times the frame set is replayed")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p50/p90 slowdown in percent")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a config setting, e.g. --set ENABLE_MOTION_GATING=True")
+    args = parser.parse_args()
+
+    for override in args.set:
+        key, _, value = override.partition("=")
+        if not hasattr(config, key):
+            raise SystemExit(f"Unknown config setting: {key}")
+        try:
+            setattr(config, key, ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            setattr(config, key, value)
+
+    frames = load_frames(args.source, limit=args.frames, size=(config.FRAME_WIDTH, config.FRAME_HEIGHT))
+    if not frames:
+        raise SystemExit("No frames loaded.")
+
+    stages, total, extras = run_suite(frames, args.warmup, args.passes)
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'source': args.source or "synthetic",
+            'frames': len(frames),
+            'passes': args.passes,
+            'warmup': args.warmup,
+            'opencv': cv2.__version__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'config': config_snapshot(),
+        },
+        'stages': stages,
+        'total': total,
+        'extras': extras,
+    }
+
+    rows = [
+        {'stage': name, 'p50_ms': f"{s['p50_ms']:.2f}", 'p90_ms': f"{s['p90_ms']:.2f}",
+         'p99_ms': f"{s['p99_ms']:.2f}",
+         'fps': f"{s['throughput_fps']:.1f}" if s['throughput_fps'] else "-"}
+        for name, s in list(stages.items()) + [('total', total)]
+    ]
+    print_table(rows, ['stage', 'p50_ms', 'p90_ms', 'p99_ms', 'fps'])
+    print(f"CPU time: {total['cpu_ms_per_frame']:.2f} ms/frame")
+    for name, values in extras.items():
+        print(f"{name}: {values}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = check_regressions(report, baseline, args.threshold)
+        if failures:
+            print("Performance regressions detected:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("No regressions beyond threshold.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: YOLO throughput for batched forward passes (batch sizes 1/2/4/8),
+then through YoloBatchDispatcher with --producers threads each submitting one
+frame at a time (like multi_camera workers), for each max batch size.
+
+Usage (from the repo root):
+    python -m benchmarks.yolo_batch --source clip.mp4 --sizes 1 2 4 8
+"""
+import argparse
+import threading
+import time
+import config
+from detection import ObjectDetector
+from object_scheduler import YoloBatchDispatcher
+from benchmarks.common import load_frames, print_table, summarize
+
+def run_dispatcher(detector, frames, producers, max_batch, max_wait_ms):
+    """images/s and per-frame wait (submit -> result, ms) with producers threads sharing one dispatcher."""
+    dispatcher = YoloBatchDispatcher(detector, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    waits = [[] for _ in range(producers)]
+
+    def produce(k):
+        for frame in frames[k::producers]:
+            t0 = time.perf_counter()
+            dispatcher.detect(frame)
+            waits[k].append((time.perf_counter() - t0) * 1000)
+
+    threads = [threading.Thread(target=produce, args=(k,)) for k in range(producers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+    return len(frames) / elapsed, dispatcher.frames / max(dispatcher.batches, 1), summarize(sum(waits, []))
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched YOLO throughput benchmark")
+    parser.add_argument("--source", help="video file or image glob (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=48)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--variant", default=config.YOLO_VARIANT, choices=['tiny', 'full', 'ssd'])
+    parser.add_argument("--input-size", type=int, default=config.YOLO_INPUT_SIZE)
+    parser.add_argument("--producers", type=int, default=4, help="threads submitting to the dispatcher")
+    parser.add_argument("--max-wait-ms", type=float, default=config.YOLO_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    config.YOLO_PRELOAD_ALL_VARIANTS = False
+    config.YOLO_VARIANT = args.variant
+    detector = ObjectDetector()
+    if not detector.enabled:
+        raise SystemExit("YOLO model files not found; run setup_data.py first.")
+    detector.set_input_size(args.input_size)
+
+    frames = load_frames(args.source, limit=args.frames)
+    # Warm-up so the first batch does not pay network initialisation
+    detector.detect_batch(frames[:1])
+
+    # Batched decoding must agree with the single-image path
+    single = [detector.detect(f) for f in frames[:4]]
+    batched = detector.detect_batch(frames[:4])
+    mismatched = sum(1 for a, b in zip(single, batched) if [r[0] for r in a] != [r[0] for r in b])
+    print(f"{detector.setting_label()}: {4 - mismatched}/4 frames give the same labels batched vs single")
+
+    rows = []
+    base_fps = None
+    for size in args.sizes:
+        batch_ms = []
+        start = time.perf_counter()
+        done = 0
+        for i in range(0, len(frames) - size + 1, size):
+            t0 = time.perf_counter()
+            detector.detect_batch(frames[i:i + size])
+            batch_ms.append((time.perf_counter() - t0) * 1000)
+            done += size
+        elapsed = time.perf_counter() - start
+        fps = done / elapsed if elapsed > 0 else 0
+        base_fps = base_fps or fps
+        s = summarize(batch_ms)
+        rows.append({
+            'batch': size, 'images/s': f"{fps:.1f}", 'speedup': f"{fps / base_fps:.2f}x",
+            'batch_p50_ms': f"{s['p50_ms']:.1f}", 'per_image_ms': f"{s['mean_ms'] / size:.1f}",
+        })
+    print_table(rows, ['batch', 'images/s', 'speedup', 'batch_p50_ms', 'per_image_ms'])
+
+    print(f"\nYoloBatchDispatcher, {args.producers} producer threads, max wait {args.max_wait_ms:.0f} ms")
+    rows = []
+    for size in args.sizes:
+        fps, mean_batch, wait = run_dispatcher(detector, frames, args.producers, size, args.max_wait_ms)
+        rows.append({
+            'max_batch': size, 'images/s': f"{fps:.1f}", 'speedup': f"{fps / base_fps:.2f}x",
+            'mean_batch': f"{mean_batch:.1f}", 'wait_p50_ms': f"{wait['p50_ms']:.1f}",
+            'wait_p90_ms': f"{wait['p90_ms']:.1f}",
+        })
+    print_table(rows, ['max_batch', 'images/s', 'speedup', 'mean_batch', 'wait_p50_ms', 'wait_p90_ms'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark: vectorized YOLO decoding vs the original per-row Python loop.
+
+Usage (from the repo root):
+    python -m benchmarks.yolo_decode                      # synthetic YOLOv4 608x608 outputs
+    python -m benchmarks.yolo_decode --record clip.mp4    # record real forward outputs first
+    python -m benchmarks.yolo_decode --outputs data/yolo_outs.npz
+"""
+import argparse
+import cv2
+import numpy as np
+import config
+from detection import ObjectDetector
+from benchmarks.common import load_frames, summarize, time_call
+
+# YOLOv4 @ 608: three heads at stride 8/16/32 with 3 anchors each
+GRID_SIZES = (76, 38, 19)
+
+def decode_loop(outs, width, height, classes):
+    """The original nested-loop decoder, kept verbatim as the reference."""
+    class_ids = []
+    confidences = []
+    boxes = []
+    for out in outs:
+        for detection in out:
+            scores = detection[5:]
+            class_id = np.argmax(scores)
+            confidence = scores[class_id]
+            if confidence > 0.3:
+                center_x = int(detection[0] * width)
+                center_y = int(detection[1] * height)
+                w = int(detection[2] * width)
+                h = int(detection[3] * height)
+                x = int(center_x - w / 2)
+                y = int(center_y - h / 2)
+                boxes.append([x, y, w, h])
+                confidences.append(float(confidence))
+                class_ids.append(class_id)
+
+    indexes = cv2.dnn.NMSBoxes(boxes, confidences, 0.3, 0.3)
+    results = []
+    if len(indexes) > 0:
+        for i in np.array(indexes).flatten():
+            results.append((str(classes[class_ids[i]]), confidences[i], tuple(boxes[i])))
+    return results
+
+def synthetic_outputs(num_classes=80, seed=0):
+    """Random outputs shaped like YOLOv4 608x608 heads with a sprinkling of confident rows."""
+    rng = np.random.default_rng(seed)
+    outs = []
+    for grid in GRID_SIZES:
+        rows = grid * grid * 3
+        out = np.zeros((rows, 5 + num_classes), dtype=np.float32)
+        out[:, 0:2] = rng.random((rows, 2), dtype=np.float32)
+        out[:, 2:4] = rng.random((rows, 2), dtype=np.float32) * 0.3
+        out[:, 4] = rng.random(rows, dtype=np.float32)
+        out[:, 5:] = rng.random((rows, num_classes), dtype=np.float32) * 0.05
+        hot = rng.choice(rows, size=max(1, rows // 500), replace=False)
+        out[hot, 5 + rng.integers(0, num_classes, len(hot))] = rng.uniform(0.3, 1.0, len(hot))
+        outs.append(out)
+    return outs
+
+def record_outputs(source, path, limit=10):
+    """Run the real YOLO network over a clip and store the raw forward outputs."""
+    detector = ObjectDetector()
+    if not detector.enabled:
+        raise SystemExit("YOLO model files not found; run setup_data.py first.")
+    arrays = {}
+    for n, frame in enumerate(load_frames(source, limit=limit)):
+        blob = cv2.dnn.blobFromImage(frame, 0.00392, (608, 608), (0, 0, 0), True, crop=False)
+        detector.net.setInput(blob)
+        for k, out in enumerate(detector.net.forward(detector.output_layers)):
+            arrays[f"f{n}_o{k}"] = out
+    np.savez(path, **arrays)
+    print(f"Recorded {n + 1} frames of YOLO outputs to {path}")
+
+def load_outputs(path):
+    """Group a recorded .npz back into a list of per-frame output lists."""
+    data = np.load(path)
+    frames = {}
+    for key in data.files:
+        f, o = key[1:].split("_o")
+        frames.setdefault(int(f), {})[int(o)] = data[key]
+    return [[outs[k] for k in sorted(outs)] for _, outs in sorted(frames.items())]
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO decode micro-benchmark")
+    parser.add_argument("--outputs", help="recorded .npz of forward outputs")
+    parser.add_argument("--record", help="video/image source to record outputs from")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.record:
+        args.outputs = args.outputs or "data/yolo_outs.npz"
+        record_outputs(args.record, args.outputs)
+
+    classes = [f"class{i}" for i in range(80)]
+    if args.outputs:
+        recorded = load_outputs(args.outputs)
+        with open(f"data/{config.OBJECT_NAMES}") as f:
+            classes = [line.strip() for line in f.readlines()]
+    else:
+        recorded = [synthetic_outputs(seed=s) for s in range(5)]
+
+    # Decoder without loading any network weights
+    detector = ObjectDetector.__new__(ObjectDetector)
+    detector.classes = classes
+
+    width, height = config.FRAME_WIDTH, config.FRAME_HEIGHT
+    for outs in recorded:
+        expected = decode_loop(outs, width, height, classes)
+        actual = detector.decode(outs, width, height)
+        assert actual == expected, "Vectorized decode diverged from the reference loop"
+
+    rows = sum(len(o) for o in recorded[0])
+    print(f"Candidate rows per frame: {rows} ({len(recorded)} frames, results identical)")
+    for name, fn in (("loop", decode_loop), ("vectorized", None)):
+        samples = []
+        for outs in recorded:
+            if fn is None:
+                samples += time_call(lambda: detector.decode(outs, width, height), args.repeats)
+            else:
+                samples += time_call(lambda: fn(outs, width, height, classes), args.repeats)
+        s = summarize(samples)
+        print(f"{name:>10}: mean {s['mean_ms']:.3f} ms  p50 {s['p50_ms']:.3f}  p99 {s['p99_ms']:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,25 @@
 import os
 
 # Database Configuration
+# Storage backend: 'sqlite' (embedded, WAL mode) or 'mysql'
+DB_BACKEND = 'sqlite'
+SQLITE_PATH = os.path.join("data", "face_detection.db")
+SQLITE_SCHEMA_PATH = os.path.join("data", "schema_sqlite.sql")
+
+# MySQL (only used when DB_BACKEND = 'mysql')
+DB_POOL_SIZE = 4
 DB_HOST = "localhost"
 DB_USER = "root"
 DB_PASSWORD = "NewPassword123!" # User should update this
 DB_NAME = "face_detection_db"
 
+# Background DB writer: rows are flushed with executemany every
+# DB_WRITE_BATCH_SIZE rows or DB_FLUSH_INTERVAL seconds, whichever comes first
+DB_WRITE_QUEUE_SIZE = 1000
+DB_WRITE_BATCH_SIZE = 50
+DB_FLUSH_INTERVAL = 1.0
+DB_OVERFLOW_POLICY = 'drop_oldest' # or 'block'
+
 # Camera Configuration
 CAMERA_INDEX = 0  # Default webcam
 FRAME_WIDTH = 640
@@ -16,18 +30,93 @@ HAAR_CASCADE_FILENAME = "haarcascade_frontalface_default.xml"
 SCALE_FACTOR = 1.1
 MIN_NEIGHBORS = 5
 MIN_SIZE = (30, 30)
+# Run full-frame Haar on a downscaled grayscale image: 1.0 (off), a factor
+# such as 0.5, or 'auto' (chosen from MIN_SIZE so the smallest wanted face
+# maps onto the cascade window). Gender crops always use full resolution.
+# For 720p/1080p cameras raise MIN_SIZE to the smallest face you care about.
+HAAR_DOWNSCALE = 1.0
+HAAR_WINDOW = (24, 24) # native window of haarcascade_frontalface_default
+
+# Motion Gating: compare a downscaled, blurred copy of each frame with the
+# last processed one; unchanged frames reuse the previous results and changed
+# frames only re-run Haar inside the regions that moved
+ENABLE_MOTION_GATING = False
+MOTION_METHOD = 'diff' # 'diff' (frame differencing) or 'mog2' (background subtraction)
+MOTION_SCALE = 0.25
+MOTION_THRESHOLD = 25 # per-pixel gray level change that counts as motion
+MOTION_MIN_CHANGED = 0.002 # fraction of changed pixels below which a frame is skipped
+MOTION_ROI_MARGIN = 0.5
+MOTION_FULL_FRAME_FRACTION = 0.5 # ROIs covering more than this scan the full frame instead
+
+# Face Tracking: run full Haar detection every FACE_DETECT_INTERVAL frames and
+# follow known faces with a small-ROI re-detect in between (each track keeps its
+# first gender label, or the gender cache's vote when ENABLE_GENDER_CACHE is on)
+ENABLE_FACE_TRACKING = False
+FACE_DETECT_INTERVAL = 5
+TRACK_ROI_MARGIN = 0.5 # ROI grows the last box by this fraction on each side
+TRACK_MAX_MISSES = 2 # frames a face may go unseen before its track is dropped
 
 # Performance
 TARGET_FPS = 30
+# Inference threads in the capture -> inference -> output pipeline
+# (each extra worker loads its own FaceDetector)
+INFERENCE_WORKERS = 1
+# Inference backend: 'thread' (in-process) or 'process' (worker processes with
+# shared-memory frames; GPU toggling only affects the in-process detector).
+# The camera's frames are spread over the processes, so per-stream state
+# (face tracking, motion gating, the gender cache) is not used in process mode
+# and objects are detected inline on every frame.
+INFERENCE_BACKEND = 'thread'
+PROCESS_WORKERS = 4
+# Seconds to wait for worker processes to load their models, and for one frame's results
+PROCESS_START_TIMEOUT = 120
+PROCESS_TASK_TIMEOUT = 10
+# DNN execution per network role. backend: 'default', 'opencv', 'openvino' (Inference
+# Engine, needs an OpenVINO-enabled OpenCV build), 'cuda' or 'auto' (OpenVINO when
+# available). target: 'cpu', 'cpu_fp16', 'opencl', 'opencl_fp16', 'myriad', 'cuda',
+# 'cuda_fp16'. Unavailable pairs fall back to opencv/cpu. INT8 comes from quantized
+# models rather than a target.
+DNN_SETTINGS = {
+    'gender': {'backend': 'opencv', 'target': 'cpu'},
+    'objects': {'backend': 'opencv', 'target': 'cpu'},
+}
+# OpenCV worker threads per process (0 = OpenCV default, one per core)
+DNN_NUM_THREADS = 0
+# Pin face (Haar + gender) and YOLO threads to disjoint cores, split by CORE_SPLIT
+# weights; process workers each get their own slice of cores (Linux only)
+CPU_AFFINITY = False
+CORE_SPLIT = {'haar': 1, 'gender': 1, 'yolo': 2}
+# Preallocated capture buffers shared by the pipeline and GUI (0 = sized from the worker count)
+FRAME_RING_SIZE = 0
+
+# Multi-camera (multi_camera.py): detector workers shared by all streams and
+# how many streams one worker serves per scheduling round
+MULTI_WORKERS = 4
+MULTI_BATCH_SIZE = 4
+MULTI_BATCH_YOLO = True # batch all workers' frames through one YoloBatchDispatcher (YOLO_MAX_BATCH / YOLO_MAX_WAIT_MS)
+
+# Metrics: Prometheus text format at http://METRICS_HOST:METRICS_PORT/metrics.
+# Recording is a lock and a few adds per sample, cheap enough to leave on.
+METRICS_ENABLED = True
+METRICS_HOST = "127.0.0.1" # local only; use "0.0.0.0" to let a remote Prometheus scrape
+METRICS_PORT = 9108
 
 # GUI Backend ('tk' or 'cv2')
 # Use 'cv2' if Tkinter crashes on macOS
 GUI_BACKEND = 'cv2'
+# Display refresh rate; the GUI sleeps until a frame is due instead of polling
+DISPLAY_REFRESH_HZ = 60
 
 # Feature Toggles
 ENABLE_GENDER_DETECTION = True
 ENABLE_OBJECT_DETECTION = True
 
+# Object detection cadence: 'sync' (every frame, inline), 'interval' (every
+# OBJECT_DETECTION_INTERVAL frames on a worker) or 'adaptive' (worker runs as
+# often as it can keep up). Frames in between reuse the latest objects.
+OBJECT_DETECTION_CADENCE = 'sync'
+OBJECT_DETECTION_INTERVAL = 5
+
 # Models
 GENDER_MODEL_URLS = {
     # Backup Source: https://github.com/smahesh29/Gender-and-Age-Detection
@@ -39,6 +128,16 @@ GENDER_PROTO = "gender_deploy.prototxt"
 GENDER_MODEL = "gender_net.caffemodel"
 GENDER_MEAN = (78.4263377603, 87.7689143744, 114.895847746)
 GENDER_LIST = ['Male', 'Female']
+# Gender Cache: keep a rolling vote per face and only re-run the net every
+# GENDER_CACHE_REFRESH frames or while the vote agreement is below the minimum
+ENABLE_GENDER_CACHE = False
+GENDER_CACHE_REFRESH = 15
+GENDER_CACHE_VOTES = 5
+GENDER_CACHE_MIN_AGREEMENT = 0.6
+GENDER_CACHE_TTL = 30 # frames unseen before an entry expires
+GENDER_CACHE_MAX_ENTRIES = 64 # LRU bound
+# Max faces per gender forward pass (larger frames are split into chunks)
+GENDER_BATCH_SIZE = 16
 
 # YOLOv4-tiny
 OBJECT_CONFIG_TINY = "yolov4-tiny.cfg"
@@ -50,9 +149,53 @@ OBJECT_WEIGHTS_FULL = "yolov4.weights"
 
 OBJECT_NAMES = "coco.names"
 
+# MobileNet-SSD (Caffe, 300x300, PASCAL VOC classes): fastest, lowest accuracy
+SSD_PROTO = "MobileNetSSD_deploy.prototxt"
+SSD_MODEL = "MobileNetSSD_deploy.caffemodel"
+SSD_INPUT_SIZE = 300
+SSD_CLASSES = [
+    "background", "aeroplane", "bicycle", "bird", "boat", "bottle", "bus", "car", "cat", "chair", "cow",
+    "diningtable", "dog", "horse", "motorbike", "person", "pottedplant", "sheep", "sofa", "train", "tvmonitor",
+]
+
 # Toggle: Set to True for High Accuracy (Slower), False for Fast (Tiny)
 USE_FULL_YOLO_MODEL = True
 
+# Runtime object detection settings (switchable while running; loaded variants stay loaded).
+# YOLO_VARIANT picks the engine: 'tiny' / 'full' (YOLOv4) or 'ssd' (MobileNet-SSD,
+# fixed 300x300 input). The auto-tuner drops to 'ssd' when even tiny YOLO is over budget.
+YOLO_VARIANT = 'full' if USE_FULL_YOLO_MODEL else 'tiny'
+YOLO_INPUT_SIZES = (320, 416, 512, 608)
+YOLO_INPUT_SIZE = 608
+# Load every object engine at startup so switching is instant. Only the app's main
+# detector does; extra instances (INFERENCE_WORKERS > 1, MULTI_WORKERS, PROCESS_WORKERS)
+# load just the active engine and the others on their first switch.
+YOLO_PRELOAD_ALL_VARIANTS = True
+# Auto-tune: pick the largest variant/size whose latency stays within the budget
+YOLO_AUTO_TUNE = False
+YOLO_LATENCY_BUDGET_MS = 100
+# Batched YOLO (YoloBatchDispatcher): frames per forward pass and how long to wait to fill a batch
+YOLO_MAX_BATCH = 4
+YOLO_MAX_WAIT_MS = 20
+
+# Model cache: source files are fingerprinted by name, size and mtime (data/model_cache/manifest.json).
+# An ONNX conversion registered for the current fingerprint (python -m model_cache add ...)
+# is loaded instead of the original files. MODEL_WARMUP runs one forward pass on
+# each network while it loads, so the first real frame does not pay setup costs.
+MODEL_CACHE_ENABLED = True
+MODEL_CACHE_DIR = "data/model_cache"
+MODEL_WARMUP = True
+
+# INT8 models for CPU-only hosts: built by `python -m quantize gender|yolo-tiny` from an FP32
+# ONNX export, and loaded instead of the FP32 gender / YOLO-tiny nets when present.
+USE_INT8_MODELS = False
+INT8_MODELS = {'gender': "gender_net_int8.onnx", 'yolo-tiny': "yolov4-tiny_int8.onnx"}
+INT8_INPUT_SIZE = 416 # YOLO input the INT8 export was calibrated at
+
+# Overlay text sprites kept rasterized (LRU) by the CV2 GUI's renderer. Object labels
+# are "<class> <confidence>%", so this should hold classes seen x ~50 confidence values.
+RENDER_SPRITE_CACHE_SIZE = 1024
+
 # Sources
 OBJECT_MODEL_URL_NAMES = "https://raw.githubusercontent.com/AlexeyAB/darknet/master/data/coco.names"
 
@@ -64,5 +207,8 @@ OBJECT_MODEL_URL_WEIGHTS_TINY = "https://github.com/AlexeyAB/darknet/releases/do
 OBJECT_MODEL_URL_CONFIG_FULL = "https://raw.githubusercontent.com/AlexeyAB/darknet/master/cfg/yolov4.cfg"
 OBJECT_MODEL_URL_WEIGHTS_FULL = "https://github.com/AlexeyAB/darknet/releases/download/darknet_yolo_v4_pre/yolov4.weights"
 
+# MobileNet-SSD weights matching data/MobileNetSSD_deploy.prototxt (~23MB)
+SSD_MODEL_URL = "https://raw.githubusercontent.com/chuanqi305/MobileNet-SSD/master/mobilenet_iter_73000.caffemodel"
+
 OBJECT_CLASSES = [] # Will be loaded from coco.names
 
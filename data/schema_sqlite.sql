@@ -0,0 +1,20 @@
+-- SQLite equivalent of schema.sql (the database is the file itself)
+
+CREATE TABLE IF NOT EXISTS detections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    faces_detected INTEGER,
+    mode VARCHAR(10), -- 'CPU' or 'GPU'
+    fps REAL,
+    latency_ms REAL
+);
+
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    cpu_fps REAL,
+    gpu_fps REAL,
+    cpu_latency_ms REAL,
+    gpu_latency_ms REAL,
+    notes TEXT
+);
@@ -1,80 +1,191 @@
-import mysql.connector
-from mysql.connector import Error
+import threading
+import time
+from collections import deque
 import config
+from storage import create_backend
+from startup import STARTUP
+import metrics
+
+class BatchWriter:
+    """
+    Single background writer thread fed by a bounded in-memory queue.
+    Rows are handed to write_batch(rows) once batch_size rows are waiting or
+    flush_interval seconds have passed. When the queue is full, 'drop_oldest'
+    discards the oldest row and 'block' makes submit() wait for space.
+    """
+    def __init__(self, write_batch, max_queue=None, batch_size=None, flush_interval=None, overflow=None):
+        self.write_batch = write_batch
+        self.max_queue = max_queue or config.DB_WRITE_QUEUE_SIZE
+        self.batch_size = batch_size or config.DB_WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.DB_FLUSH_INTERVAL
+        self.overflow = overflow or config.DB_OVERFLOW_POLICY
+        if self.overflow not in ('drop_oldest', 'block'):
+            raise ValueError(f"Unknown overflow policy: {self.overflow}")
+
+        self.rows = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.in_flight = 0
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, row):
+        """Queue one row; never touches the database on the caller's thread."""
+        with self.cond:
+            if self.closed:
+                metrics.DB_ROWS.labels('dropped').inc()
+                self.dropped += 1
+                return False
+            if len(self.rows) >= self.max_queue:
+                if self.overflow == 'drop_oldest':
+                    self.rows.popleft()
+                    metrics.DB_ROWS.labels('dropped').inc()
+                    self.dropped += 1
+                else:
+                    self.cond.wait_for(lambda: len(self.rows) < self.max_queue or self.closed)
+                    if self.closed:
+                        metrics.DB_ROWS.labels('dropped').inc()
+                        self.dropped += 1
+                        return False
+            self.rows.append(row)
+            self.queued += 1
+            if len(self.rows) >= self.batch_size:
+                self.cond.notify_all()
+            return True
+
+    def _run(self):
+        last_flush = time.time()
+        while True:
+            with self.cond:
+                self.cond.wait_for(
+                    lambda: self.closed or len(self.rows) >= self.batch_size,
+                    timeout=max(0, self.flush_interval - (time.time() - last_flush))
+                )
+                if not self.rows:
+                    last_flush = time.time()
+                    if self.closed:
+                        return
+                    continue
+                if len(self.rows) < self.batch_size and not self.closed \
+                        and time.time() - last_flush < self.flush_interval:
+                    continue
+                batch = [self.rows.popleft() for _ in range(min(self.batch_size, len(self.rows)))]
+                self.in_flight = len(batch)
+                # Wake blocked producers now that there is space
+                self.cond.notify_all()
+
+            t0 = time.perf_counter()
+            try:
+                self.write_batch(batch)
+                ok = True
+            except Exception as e:
+                print(f"Error writing batch: {e}")
+                ok = False
+            last_flush = time.time()
+            metrics.STAGE_SECONDS.labels('db_write').observe(time.perf_counter() - t0)
+            metrics.DB_ROWS.labels('written' if ok else 'failed').inc(len(batch))
+
+            with self.cond:
+                if ok:
+                    self.written += len(batch)
+                    self.batches += 1
+                else:
+                    self.failed += len(batch)
+                self.in_flight = 0
+                self.cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until every queued row has been written (or failed)."""
+        with self.cond:
+            self.cond.notify_all()
+            return self.cond.wait_for(lambda: not self.rows and not self.in_flight, timeout)
+
+    def close(self, timeout=10):
+        """Stop accepting rows, write everything still queued and stop the thread."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
+
+    def get_stats(self):
+        with self.cond:
+            return {
+                'queued': self.queued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'pending': len(self.rows) + self.in_flight,
+                'batches': self.batches,
+            }
 
 class DatabaseManager:
-    def __init__(self):
-        self.connection = None
-        self.connect()
-        self.create_tables()
+    """Logs detections and benchmarks through a pluggable StorageBackend."""
+    def __init__(self, backend=None, connect_async=False):
+        """
+        connect_async: open the backend on a background thread so a slow
+        server does not hold up startup. Detections logged meanwhile wait
+        in the writer queue.
+        """
+        self.backend = backend or create_backend()
+        self.ready = threading.Event()
+        self.writer = BatchWriter(self._write_detections)
+        if connect_async:
+            threading.Thread(target=self._open, name="db-connect", daemon=True).start()
+        else:
+            self._open()
 
-    def connect(self):
-        """Establish a connection to the database."""
+    def _open(self):
         try:
-            # First connect to MySQL server to check/create DB
-            temp_conn = mysql.connector.connect(
-                host=config.DB_HOST,
-                user=config.DB_USER,
-                password=config.DB_PASSWORD
-            )
-            if temp_conn.is_connected():
-                cursor = temp_conn.cursor()
-                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {config.DB_NAME}")
-                temp_conn.close()
-
-            # Now connect to the specific database
-            self.connection = mysql.connector.connect(
-                host=config.DB_HOST,
-                user=config.DB_USER,
-                password=config.DB_PASSWORD,
-                database=config.DB_NAME
-            )
-            print("Successfully connected to the database.")
-
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            self.connection = None
+            with STARTUP.measure('database'):
+                self.connect()
+                self.create_tables()
+        except Exception as e:
+            print(f"Error opening database: {e}")
+        finally:
+            self.ready.set()
+
+    def connect(self):
+        """Open the storage backend (SQLite file or MySQL pool)."""
+        self.backend.connect()
+
+    def is_connected(self):
+        return self.backend.is_connected()
 
     def create_tables(self):
-        """Execute the schema.sql file to create tables."""
-        if self.connection and self.connection.is_connected():
-            try:
-                cursor = self.connection.cursor()
-                # Read schema.sql
-                schema_path = "data/schema.sql"
-                with open(schema_path, 'r') as f:
-                    statements = f.read().split(';')
-                    for statement in statements:
-                        if statement.strip():
-                            cursor.execute(statement)
-                self.connection.commit()
-                print("Tables checked/created successfully.")
-            except Error as e:
-                print(f"Error creating tables: {e}")
+        """Create the detections/benchmarks tables if missing."""
+        self.backend.create_tables()
     
     def log_detection(self, faces_detected, mode, fps, latency):
-        """Log a single detection event."""
-        if self.connection and self.connection.is_connected():
-            try:
-                cursor = self.connection.cursor()
-                query = "INSERT INTO detections (faces_detected, mode, fps, latency_ms) VALUES (%s, %s, %s, %s)"
-                cursor.execute(query, (faces_detected, mode, fps, latency))
-                self.connection.commit()
-            except Error as e:
-                print(f"Error logging detection: {e}")
+        """Queue a single detection event for the background writer."""
+        if not self.ready.is_set() or self.is_connected():
+            self.writer.submit((faces_detected, mode, fps, latency))
+
+    def _write_detections(self, rows):
+        """Insert a batch of detection rows in one transaction."""
+        self.ready.wait()
+        if not self.is_connected():
+            raise RuntimeError("database is not connected")
+        self.backend.insert_detections(rows)
 
     def log_benchmark(self, cpu_fps, gpu_fps, cpu_latency, gpu_latency):
         """Log benchmark results."""
-        if self.connection and self.connection.is_connected():
+        if self.ready.wait(5) and self.is_connected():
             try:
-                cursor = self.connection.cursor()
-                query = "INSERT INTO benchmarks (cpu_fps, gpu_fps, cpu_latency_ms, gpu_latency_ms) VALUES (%s, %s, %s, %s)"
-                cursor.execute(query, (cpu_fps, gpu_fps, cpu_latency, gpu_latency))
-                self.connection.commit()
-            except Error as e:
+                self.backend.insert_benchmark((cpu_fps, gpu_fps, cpu_latency, gpu_latency))
+            except Exception as e:
                 print(f"Error logging benchmark: {e}")
 
     def close(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        # Flush pending detections before the connection goes away
+        self.writer.close()
+        stats = self.writer.get_stats()
+        print(f"DB writer: {stats['written']} written, {stats['dropped']} dropped, {stats['failed']} failed.")
+        if self.is_connected():
+            self.backend.close()
             print("Database connection closed.")
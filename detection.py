@@ -1,22 +1,51 @@
 import cv2
 import time
 import os
+import threading
 import numpy as np
 import config
+from tracking import FaceTracker, GenderCache, iou
+from motion import MotionGate
+from object_scheduler import ObjectScheduler
+from startup import STARTUP
+from model_cache import MODEL_CACHE
+from quantize import int8_path
+import metrics
+import dnn_backend
 
 class GenderDetector:
-    def __init__(self):
+    def __init__(self, load=True):
         self.net = None
+        self.int8 = False
         self.enabled = config.ENABLE_GENDER_DETECTION
-        if self.enabled:
-             proto_path = os.path.join("data", config.GENDER_PROTO)
-             model_path = os.path.join("data", config.GENDER_MODEL)
-             if os.path.exists(proto_path) and os.path.exists(model_path):
-                 print(f"Loading Gender Model from {model_path}")
-                 self.net = cv2.dnn.readNet(model_path, proto_path)
-             else:
-                 print("Gender model files not found. Disabling gender detection.")
-                 self.enabled = False
+        if load:
+            self.load()
+
+    def load(self):
+        """Read the Caffe net (or its INT8 variant); until this returns, predictions are "Unknown"."""
+        if not self.enabled:
+            return
+        proto_path = os.path.join("data", config.GENDER_PROTO)
+        model_path = os.path.join("data", config.GENDER_MODEL)
+        if os.path.exists(proto_path) and os.path.exists(model_path):
+            quantized = int8_path('gender')
+            if quantized:
+                name, paths, reader = 'gender-int8', [quantized], lambda: cv2.dnn.readNetFromONNX(quantized)
+            else:
+                name, paths, reader = 'gender', [model_path, proto_path], lambda: cv2.dnn.readNet(model_path, proto_path)
+            print(f"Loading Gender Model from {paths[0]}")
+            with STARTUP.measure('gender model'):
+                net, info = MODEL_CACHE.load(name, paths, reader)
+                backend, target = dnn_backend.configure(net, 'gender')
+                print(f"Gender model loaded from {info['source']} in {info['load_ms']:.0f} ms ({backend}/{target})")
+                if config.MODEL_WARMUP:
+                    MODEL_CACHE.warm_up(name, net, (1, 3, 227, 227))
+            # Published only once warm, so the first real face does not pay setup costs
+            self.int8 = bool(quantized)
+            self.net = net
+        else:
+            print("Gender model files not found. Disabling gender detection.")
+            self.enabled = False
 
     def predict_gender(self, face_img):
         if not self.enabled or self.net is None:
@@ -34,114 +63,534 @@ class GenderDetector:
             print(f"Gender Error: {e}")
             return "Error"
 
+    def predict_genders(self, face_imgs):
+        """Classify a list of face crops with one forward pass per chunk."""
+        if not face_imgs:
+            return []
+        if not self.enabled or self.net is None:
+            return ["Unknown"] * len(face_imgs)
+
+        batch_size = max(1, config.GENDER_BATCH_SIZE)
+        genders = []
+        for start in range(0, len(face_imgs), batch_size):
+            chunk = face_imgs[start:start + batch_size]
+            try:
+                blob = cv2.dnn.blobFromImages(chunk, 1.0, (227, 227), config.GENDER_MEAN, swapRB=False)
+                self.net.setInput(blob)
+                preds = self.net.forward()
+                genders.extend(config.GENDER_LIST[i] for i in preds.argmax(axis=1))
+            except Exception as e:
+                print(f"Gender Error: {e}")
+                genders.extend(["Error"] * len(chunk))
+        return genders
+
+class YoloAutoTuner:
+    """
+    Picks the largest YOLO setting (variant, input size) whose measured
+    latency stays within the budget. Settings are ordered by cost; the tuner
+    steps down as soon as the moving average exceeds the budget and only
+    steps back up after a quiet period, never into a setting already seen
+    to be over budget.
+    """
+    def __init__(self, detector, budget_ms=None, cooldown=30):
+        self.detector = detector
+        self.budget_ms = budget_ms or config.YOLO_LATENCY_BUDGET_MS
+        self.cooldown = cooldown
+        self.enabled = True
+        self.ema = None
+        self.frames_at_setting = 0
+        self.measured = {} # setting -> last EMA seen there
+        # The ladder only has loaded engines; load the rest so it can step through them
+        for variant in detector.available_variants():
+            detector.load_variant_async(variant)
+
+    def ladder(self):
+        """
+        Available settings from cheapest to most expensive; MobileNet-SSD is
+        the bottom rung. A variant with a fixed input (SSD, INT8 exports) is
+        a single rung at that size, the others one rung per YOLO_INPUT_SIZES.
+        """
+        ladder = []
+        for variant in ('ssd', 'tiny', 'full'):
+            if variant not in self.detector.nets:
+                continue
+            fixed = self.detector.FIXED_SIZE.get(variant)
+            sizes = [fixed] if fixed else config.YOLO_INPUT_SIZES
+            ladder += [(variant, size) for size in sizes]
+        return ladder
+
+    def observe(self, latency_ms):
+        if not self.enabled:
+            return
+        self.ema = latency_ms if self.ema is None else 0.8 * self.ema + 0.2 * latency_ms
+        self.frames_at_setting += 1
+        if self.frames_at_setting < 5:
+            return
+
+        ladder = self.ladder()
+        current = self.detector.setting()
+        if current not in ladder:
+            return
+        idx = ladder.index(current)
+        self.measured[current] = self.ema
+
+        if self.ema > self.budget_ms and idx > 0:
+            self._switch(ladder[idx - 1])
+        elif self.frames_at_setting >= self.cooldown and idx + 1 < len(ladder):
+            nxt = ladder[idx + 1]
+            # Rough cost model: latency grows with input area
+            known = self.measured.get(nxt)
+            if known is not None and known > self.budget_ms:
+                return
+            if nxt[0] == current[0]:
+                estimate = self.ema * (nxt[1] / current[1]) ** 2
+                if estimate > self.budget_ms:
+                    return
+            self._switch(nxt)
+
+    def _switch(self, setting):
+        self.detector.set_variant(setting[0])
+        if setting[0] not in self.detector.FIXED_SIZE:
+            self.detector.set_input_size(setting[1])
+        self.ema = None
+        self.frames_at_setting = 0
+
 class ObjectDetector:
-    def __init__(self):
-        self.net = None
+    """
+    Object detection with interchangeable engines ("variants"): YOLOv4 'tiny'
+    and 'full' (COCO classes, selectable input size) and MobileNet-SSD 'ssd'
+    (VOC classes, fixed 300x300). Every engine returns
+    (class_name, confidence, (x, y, w, h)); stage times are reported as
+    yolo_forward / yolo_decode whichever engine ran.
+    """
+    STAGES = ('yolo_forward', 'yolo_decode')
+    VARIANTS = {
+        'tiny': (config.OBJECT_CONFIG_TINY, config.OBJECT_WEIGHTS_TINY),
+        'full': (config.OBJECT_CONFIG_FULL, config.OBJECT_WEIGHTS_FULL),
+        'ssd': (config.SSD_PROTO, config.SSD_MODEL),
+    }
+    # Engines with a fixed network input, ignoring input_size
+    FIXED_SIZE = {'ssd': config.SSD_INPUT_SIZE}
+
+    def __init__(self, load=True, preload=None):
+        """
+        preload: load every engine up front so switching is instant (default
+        YOLO_PRELOAD_ALL_VARIANTS); False loads only the active one and the
+        others on their first set_variant(). Extra detector instances pass
+        False so N workers do not hold N copies of every network.
+        """
+        self.preload = config.YOLO_PRELOAD_ALL_VARIANTS if preload is None else preload
+        self.nets = {} # variant -> (net, output_layers); kept loaded for hot switching
+        self.int8 = set() # variants running an INT8 network
+        self.missing = set() # variants whose model files are not on disk
+        self.loading = set() # variants being loaded in the background
+        self.load_lock = threading.Lock()
         self.classes = []
-        self.layer_names = []
-        self.output_layers = []
+        self.stage_times = {} # ms for the last detect(): yolo_forward, yolo_decode
         self.enabled = config.ENABLE_OBJECT_DETECTION
-        
+        self.variant = config.YOLO_VARIANT
+        self.input_size = config.YOLO_INPUT_SIZE
+        self.auto_tuner = None
+        if load:
+            self.load()
+
+    def load(self):
+        """
+        Read class names and the active network (the first available one if
+        its files are missing). Other variants load on their first
+        set_variant(), unless self.preload loads them all here.
+        """
+        if not self.enabled:
+            return
+        names_path = os.path.join("data", config.OBJECT_NAMES)
+        if os.path.exists(names_path):
+            # Load names
+            with open(names_path, "r") as f:
+                self.classes = [line.strip() for line in f.readlines()]
+            config.OBJECT_CLASSES = self.classes # Update config for reference
+
+        variants = [self.variant] + [v for v in self.VARIANTS if v != self.variant]
+        for variant in variants:
+            # YOLO engines need coco.names; SSD carries its own VOC labels
+            if variant == 'ssd' or self.classes:
+                self.load_variant(variant)
+            if self.nets and not self.preload:
+                break
+
+        if not self.nets:
+             print("Object model files (YOLO) not found. Disabling object detection.")
+             self.enabled = False
+        elif self.variant not in self.nets:
+            self.variant = next(iter(self.nets))
         if self.enabled:
-            if config.USE_FULL_YOLO_MODEL:
-                print("Using Full YOLOv4 Model (High Accuracy)")
-                config_path = os.path.join("data", config.OBJECT_CONFIG_FULL)
-                weights_path = os.path.join("data", config.OBJECT_WEIGHTS_FULL)
-            else:
-                print("Using YOLOv4-tiny Model (High Speed)")
-                config_path = os.path.join("data", config.OBJECT_CONFIG_TINY)
-                weights_path = os.path.join("data", config.OBJECT_WEIGHTS_TINY)
+            print(f"Active YOLO setting: {self.setting_label()}")
+            if config.YOLO_AUTO_TUNE:
+                self.auto_tuner = YoloAutoTuner(self)
 
-            names_path = os.path.join("data", config.OBJECT_NAMES)
-            
-            if os.path.exists(config_path) and os.path.exists(weights_path) and os.path.exists(names_path):
-                print(f"Loading YOLO Model from {weights_path}")
-                self.net = cv2.dnn.readNet(weights_path, config_path)
-                
-                # Load names
-                with open(names_path, "r") as f:
-                    self.classes = [line.strip() for line in f.readlines()]
-                config.OBJECT_CLASSES = self.classes # Update config for reference
-                
-                self.layer_names = self.net.getLayerNames()
-                try:
-                    self.output_layers = [self.layer_names[i - 1] for i in self.net.getUnconnectedOutLayers()]
-                except TypeError:
-                    # Fix for different OpenCV versions
-                    self.output_layers = [self.layer_names[i[0] - 1] for i in self.net.getUnconnectedOutLayers()]
-            else:
-                 print("Object model files (YOLO) not found. Disabling object detection.")
-                 self.enabled = False
+    def load_variant(self, variant):
+        cfg_name, weights_name = self.VARIANTS[variant]
+        config_path = os.path.join("data", cfg_name)
+        weights_path = os.path.join("data", weights_name)
+        if not (os.path.exists(config_path) and os.path.exists(weights_path)):
+            print(f"YOLO {variant} model files not found.")
+            self.missing.add(variant)
+            return False
+
+        name = "mobilenet-ssd" if variant == 'ssd' else f"yolo-{variant}"
+        quantized = int8_path(name)
+        if quantized:
+            # INT8 exports have a fixed input, so the variant stays at the size it was calibrated for
+            paths, reader = [quantized], lambda: cv2.dnn.readNetFromONNX(quantized)
+            name += "-int8"
+            self.int8.add(variant)
+            self.FIXED_SIZE = dict(self.FIXED_SIZE, **{variant: config.INT8_INPUT_SIZE})
+        else:
+            paths, reader = [weights_path, config_path], lambda: cv2.dnn.readNet(weights_path, config_path)
+            self.int8.discard(variant)
+        size = self.FIXED_SIZE.get(variant, self.input_size)
+        print(f"Loading YOLO Model from {paths[0]}")
+        with STARTUP.measure(f'yolo {variant} model'):
+            net, info = MODEL_CACHE.load(name, paths, reader)
+            backend, target = dnn_backend.configure(net, 'objects')
+            print(f"YOLO {variant} loaded from {info['source']} in {info['load_ms']:.0f} ms ({backend}/{target})")
+            layer_names = net.getLayerNames()
+            try:
+                output_layers = [layer_names[i - 1] for i in net.getUnconnectedOutLayers()]
+            except TypeError:
+                # Fix for different OpenCV versions
+                output_layers = [layer_names[i[0] - 1] for i in net.getUnconnectedOutLayers()]
+            if config.MODEL_WARMUP:
+                MODEL_CACHE.warm_up(name, net, (1, 3, size, size), output_layers)
+        self.nets[variant] = (net, output_layers)
+        return True
+
+    @property
+    def net(self):
+        return self.nets[self.variant][0] if self.variant in self.nets else None
+
+    @property
+    def output_layers(self):
+        return self.nets[self.variant][1] if self.variant in self.nets else []
+
+    def available_variants(self):
+        """Variants that are loaded or can be loaded (model files present, class names for YOLO)."""
+        return [v for v in self.VARIANTS
+                if v in self.nets or (v not in self.missing and (v == 'ssd' or self.classes))]
+
+    def set_variant(self, variant):
+        """
+        Switch engine; takes effect on the next frame. A variant that is not
+        loaded yet starts loading in the background and becomes active once
+        ready (returns False meanwhile; see self.loading).
+        """
+        if variant in self.nets:
+            self.variant = variant
+            return True
+        if variant not in self.available_variants():
+            print(f"Warning: YOLO variant '{variant}' is not available.")
+            return False
+        self.load_variant_async(variant, activate=True)
+        return False
+
+    def load_variant_async(self, variant, activate=False):
+        """Load a variant on a background thread (no-op if loaded or loading); optionally switch to it when ready."""
+        with self.load_lock:
+            if variant in self.nets or variant in self.loading:
+                return
+            self.loading.add(variant)
+        print(f"Loading YOLO {variant} in the background...")
+
+        def run():
+            try:
+                ok = self.load_variant(variant)
+            except Exception as e:
+                print(f"Error loading YOLO {variant}: {e}")
+                ok = False
+            finally:
+                with self.load_lock:
+                    self.loading.discard(variant)
+            if ok and activate:
+                self.variant = variant
+        threading.Thread(target=run, name=f"load-yolo-{variant}", daemon=True).start()
+
+    def set_input_size(self, size):
+        """Switch the network input resolution (one of YOLO_INPUT_SIZES)."""
+        if size not in config.YOLO_INPUT_SIZES:
+            print(f"Warning: unsupported YOLO input size {size}.")
+            return False
+        self.input_size = size
+        return True
+
+    def set_auto_tune(self, enabled):
+        if enabled and self.auto_tuner is None and self.enabled:
+            self.auto_tuner = YoloAutoTuner(self)
+        if self.auto_tuner:
+            self.auto_tuner.enabled = enabled
+        return bool(self.auto_tuner and self.auto_tuner.enabled)
+
+    def setting(self):
+        """(variant, effective network input size)"""
+        return self.variant, self.FIXED_SIZE.get(self.variant, self.input_size)
+
+    def setting_label(self):
+        label = "{}@{}".format(*self.setting())
+        if self.variant in self.int8:
+            label += " int8"
+        if self.auto_tuner and self.auto_tuner.enabled:
+            label += " (auto)"
+        return label
 
     def detect(self, frame):
         """Returns list of (class_name, confidence, box)"""
         if not self.enabled or self.net is None:
             return []
+
+        # Read the setting once so a switch from another thread never splits a frame
+        variant, size = self.setting()
+        net, output_layers = self.nets[variant]
         
         height, width, channels = frame.shape
         
-        # YOLO Preprocessing
-        # Increased to 608x608 for better accuracy
-        blob = cv2.dnn.blobFromImage(frame, 0.00392, (608, 608), (0, 0, 0), True, crop=False)
-        self.net.setInput(blob)
-        outs = self.net.forward(self.output_layers)
-        
-        class_ids = []
-        confidences = []
-        boxes = []
-        
-        # Parse Outputs
-        for out in outs:
-            for detection in out:
-                scores = detection[5:]
-                class_id = np.argmax(scores)
-                confidence = scores[class_id]
-                if confidence > 0.3:
-                    # Object detected
-                    center_x = int(detection[0] * width)
-                    center_y = int(detection[1] * height)
-                    w = int(detection[2] * width)
-                    h = int(detection[3] * height)
-
-                    # Rectangle coordinates
-                    x = int(center_x - w / 2)
-                    y = int(center_y - h / 2)
-
-                    boxes.append([x, y, w, h])
-                    confidences.append(float(confidence))
-                    class_ids.append(class_id)
-        
+        # Preprocessing
+        t0 = time.perf_counter()
+        net.setInput(self.blob([frame], variant, size))
+        outs = net.forward(output_layers)
+        t1 = time.perf_counter()
+
+        if variant == 'ssd':
+            results = self.decode_ssd(outs[0], width, height)
+        else:
+            results = self.decode(outs, width, height)
+        self.stage_times = {
+            'yolo_forward': (t1 - t0) * 1000,
+            'yolo_decode': (time.perf_counter() - t1) * 1000,
+        }
+        metrics.observe_stages(self.stage_times, self.STAGES)
+        if self.auto_tuner:
+            self.auto_tuner.observe((time.perf_counter() - t0) * 1000)
+        return results
+
+    def detect_batch(self, frames):
+        """
+        One forward pass over several frames (cameras or consecutive frames of a file).
+        Returns one (class_name, confidence, box) list per frame; NMS runs per image.
+        """
+        if not frames:
+            return []
+        if not self.enabled or self.net is None:
+            return [[] for _ in frames]
+
+        variant, size = self.setting()
+        net, output_layers = self.nets[variant]
+        n = len(frames)
+
+        t0 = time.perf_counter()
+        net.setInput(self.blob(frames, variant, size))
+        outs = net.forward(output_layers)
+        t1 = time.perf_counter()
+
+        if variant == 'ssd':
+            # One (1, 1, N, 7) table for the whole batch; column 0 is the image index
+            dets = outs[0].reshape(-1, 7)
+            results = [
+                self.decode_ssd(dets[dets[:, 0] == i], frame.shape[1], frame.shape[0])
+                for i, frame in enumerate(frames)
+            ]
+        else:
+            # Region layers return either (N, rows, 85) or the images' rows stacked as (N * rows, 85)
+            per_image = [out if out.ndim == 3 else out.reshape(n, -1, out.shape[-1]) for out in outs]
+            results = [
+                self.decode([out[i] for out in per_image], frame.shape[1], frame.shape[0])
+                for i, frame in enumerate(frames)
+            ]
+        self.stage_times = {
+            'yolo_forward': (t1 - t0) * 1000,
+            'yolo_decode': (time.perf_counter() - t1) * 1000,
+            'batch_size': n,
+        }
+        metrics.observe_stages(self.stage_times, self.STAGES)
+        return results
+
+    def blob(self, frames, variant, size):
+        if variant == 'ssd':
+            # MobileNet-SSD was trained on BGR input scaled to [-1, 1]
+            return cv2.dnn.blobFromImages(frames, 0.007843, (size, size), (127.5, 127.5, 127.5), False, crop=False)
+        return cv2.dnn.blobFromImages(frames, 0.00392, (size, size), (0, 0, 0), True, crop=False)
+
+    def decode_ssd(self, out, width, height, conf_threshold=0.3):
+        """
+        Decode a MobileNet-SSD DetectionOutput table, rows of
+        [image_id, class_id, confidence, x1, y1, x2, y2] with corners relative
+        to the image. The layer has already applied NMS.
+        """
+        dets = out.reshape(-1, 7)
+        class_ids = dets[:, 1].astype(np.int64)
+        mask = (dets[:, 2] > conf_threshold) & (class_ids > 0) & (class_ids < len(config.SSD_CLASSES))
+        if not np.any(mask):
+            return []
+        dets = dets[mask]
+        class_ids = class_ids[mask]
+
+        corners = dets[:, 3:7] * np.array([width, height, width, height], dtype=np.float32)
+        x1 = np.clip(corners[:, 0], 0, width - 1).astype(np.int64)
+        y1 = np.clip(corners[:, 1], 0, height - 1).astype(np.int64)
+        x2 = np.clip(corners[:, 2], 0, width - 1).astype(np.int64)
+        y2 = np.clip(corners[:, 3], 0, height - 1).astype(np.int64)
+
+        return [
+            (config.SSD_CLASSES[c], float(conf), (int(x), int(y), int(x_end - x), int(y_end - y)))
+            for c, conf, x, y, x_end, y_end in zip(class_ids, dets[:, 2], x1, y1, x2, y2)
+            if x_end > x and y_end > y
+        ]
+
+    def decode(self, outs, width, height, conf_threshold=0.3, nms_threshold=0.3):
+        """Decode raw YOLO outputs into (class_name, confidence, box) in one NumPy pass."""
+        if len(outs) == 0:
+            return []
+
+        # Stack every candidate row from all output layers
+        dets = np.concatenate([out.reshape(-1, out.shape[-1]) for out in outs], axis=0)
+        scores = dets[:, 5:]
+        class_ids = np.argmax(scores, axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+
+        # Confidence Masking
+        mask = confidences > conf_threshold
+        if not np.any(mask):
+            return []
+        dets = dets[mask]
+        class_ids = class_ids[mask]
+        confidences = confidences[mask]
+
+        # Center -> Corner (int truncation matches the old per-row int() calls)
+        center_x = (dets[:, 0] * width).astype(np.int64)
+        center_y = (dets[:, 1] * height).astype(np.int64)
+        w = (dets[:, 2] * width).astype(np.int64)
+        h = (dets[:, 3] * height).astype(np.int64)
+        x = (center_x - w / 2).astype(np.int64)
+        y = (center_y - h / 2).astype(np.int64)
+
+        boxes = np.stack([x, y, w, h], axis=1).tolist()
+        confidences = confidences.astype(np.float64).tolist()
+
         # Non-Max Suppression
-        indexes = cv2.dnn.NMSBoxes(boxes, confidences, 0.3, 0.3)
-        
+        indexes = cv2.dnn.NMSBoxes(boxes, confidences, conf_threshold, nms_threshold)
+
         results = []
         if len(indexes) > 0:
-            for i in indexes.flatten():
+            for i in np.array(indexes).flatten():
                 label = str(self.classes[class_ids[i]])
                 confidence = confidences[i]
                 box = boxes[i] # [x, y, w, h]
                 results.append((label, confidence, tuple(box)))
-        
+
         return results
 
+def haar_scale(downscale=None):
+    """
+    Downscale factor for full-frame Haar detection.
+    'auto' shrinks the image until a MIN_SIZE face just fills the cascade's
+    native window, the smallest image that can still find such a face.
+    """
+    downscale = config.HAAR_DOWNSCALE if downscale is None else downscale
+    if downscale == 'auto':
+        downscale = min(config.HAAR_WINDOW[0] / config.MIN_SIZE[0], config.HAAR_WINDOW[1] / config.MIN_SIZE[1])
+    return max(0.05, min(1.0, float(downscale)))
+
 class FaceDetector:
-    def __init__(self):
+    # Models loaded by load_models(), in the order their stages switch on
+    MODELS = ('haar', 'gender', 'objects')
+    # Stages timed here (YOLO stages are recorded by ObjectDetector, wherever it runs)
+    STAGES = ('motion', 'grayscale', 'haar', 'gender')
+
+    def __init__(self, lazy=False, cadence=None, preload_variants=None):
+        """
+        lazy: skip model loading here so the camera preview can start at once;
+        call load_models() (typically from a background thread) afterwards.
+        Stages whose model is not loaded yet are skipped by detect().
+        cadence: object detection cadence for this detector (default
+        OBJECT_DETECTION_CADENCE); see ObjectScheduler.
+        preload_variants: see ObjectDetector (default YOLO_PRELOAD_ALL_VARIANTS).
+        """
         self.use_cuda = False
         self.cascade_path = os.path.join("data", config.HAAR_CASCADE_FILENAME)
+        self.cpu_cascade = None
         
-        # Load CPU Cascade
-        self.cpu_cascade = cv2.CascadeClassifier(self.cascade_path)
-        if self.cpu_cascade.empty():
-            print(f"Error: Could not load Haar cascade from {self.cascade_path}")
-        
+        # Downscale factor for full-frame Haar (1.0 = full resolution)
+        self.haar_scale = haar_scale()
+
         # Check for CUDA/GPU support
         self.cuda_cascade = None
         self.gpu_available = False
-        self.check_cuda()
 
         # Sub-detectors
-        self.gender_detector = GenderDetector()
-        self.object_detector = ObjectDetector()
+        self.gender_detector = GenderDetector(load=False)
+        self.object_detector = ObjectDetector(load=False, preload=preload_variants)
+        self.object_scheduler = ObjectScheduler(self.object_detector, mode=cadence)
+        self.model_state = {name: 'pending' for name in self.MODELS}
+        self.models_ready = threading.Event()
+
+        # Optional tracking: full Haar every FACE_DETECT_INTERVAL frames, ROI re-detect in between
+        self.tracker = FaceTracker(self.detect_face_rects) if config.ENABLE_FACE_TRACKING else None
+        # Gender votes per face (by track id, or IoU with earlier boxes when not tracking)
+        self.gender_cache = GenderCache() if config.ENABLE_GENDER_CACHE and self.gender_detector.enabled else None
+        # Optional motion gating: skip unchanged frames, re-detect faces only in changed regions
+        self.motion_gate = MotionGate() if config.ENABLE_MOTION_GATING else None
+        self.last_results = None
+        self.stage_times = {}
+        if not lazy:
+            self.load_models()
+
+    def load_cascade(self):
+        """Load the Haar cascade (CPU, plus the CUDA one when available)."""
+        with STARTUP.measure('haar cascade'):
+            cascade = cv2.CascadeClassifier(self.cascade_path)
+            if cascade.empty():
+                print(f"Error: Could not load Haar cascade from {self.cascade_path}")
+                return False
+            self.check_cuda()
+        self.cpu_cascade = cascade
+        return True
+
+    def _load_model(self, name):
+        self.model_state[name] = 'loading'
+        try:
+            if name == 'haar':
+                ok = self.load_cascade()
+            elif name == 'gender':
+                self.gender_detector.load()
+                ok = self.gender_detector.enabled
+            else:
+                self.object_detector.load()
+                ok = self.object_detector.enabled
+        except Exception as e:
+            print(f"Error loading {name} model: {e}")
+            ok = False
+        self.model_state[name] = 'ready' if ok else 'off'
+
+    def load_models(self):
+        """
+        Load every model in parallel (cv2 releases the GIL while reading
+        weights). Each stage switches on as soon as its own model is ready.
+        """
+        threads = [
+            threading.Thread(target=self._load_model, args=(name,), name=f"load-{name}", daemon=True)
+            for name in self.MODELS
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if self.model_state['gender'] != 'ready':
+            self.gender_cache = None
+        self.models_ready.set()
+
+    def wait_until_ready(self, timeout=None):
+        return self.models_ready.wait(timeout)
+
+    def model_status(self):
+        """name -> 'pending' | 'loading' | 'ready' | 'off'"""
+        return dict(self.model_state)
 
     def check_cuda(self):
         try:
@@ -164,20 +613,58 @@ class FaceDetector:
                 print("Warning: GPU mode requested but not available. Falling back to CPU.")
         return self.use_cuda
 
-    def detect(self, frame):
-        """
-        Detect faces, gender, and objects.
-        Returns: 
-           faces: list of (x, y, w, h, gender_label)
-           objects: list of (label, confidence, (x,y,w,h))
-           latency: ms
-        """
-        start_time = time.time()
+    # Per-stream state that must not leak between cameras sharing one detector
+    STREAM_STATE = ('tracker', 'gender_cache', 'motion_gate', 'last_results')
+
+    def new_stream_state(self):
+        """Fresh tracker / gender cache / motion gate for one more video stream."""
+        return {
+            'tracker': FaceTracker(self.detect_face_rects) if config.ENABLE_FACE_TRACKING else None,
+            'gender_cache': GenderCache() if config.ENABLE_GENDER_CACHE and self.gender_detector.enabled else None,
+            'motion_gate': MotionGate() if config.ENABLE_MOTION_GATING else None,
+            'last_results': None,
+        }
+
+    def use_stream_state(self, state):
+        """Swap a stream's state in before detect()."""
+        for attr in self.STREAM_STATE:
+            setattr(self, attr, state[attr])
+        if self.tracker:
+            # The tracker may have been created by another worker's detector
+            self.tracker.detect_fn = self.detect_face_rects
+
+    def save_stream_state(self, state):
+        """Copy the state back out after detect()."""
+        for attr in self.STREAM_STATE:
+            state[attr] = getattr(self, attr)
+
+    def reset(self):
+        """Forget tracks and cached genders (e.g. when switching to another video)."""
+        if self.tracker:
+            self.tracker.reset()
+        if self.gender_cache:
+            self.gender_cache = GenderCache()
+        self.object_scheduler.reset()
+        if self.motion_gate:
+            self.motion_gate.reset()
+        self.last_results = None
+
+    def close(self):
+        """Stop the object scheduler's worker thread (if any); call when the detector is discarded."""
+        self.object_scheduler.close()
+
+    def detect_face_rects(self, gray, roi=None):
+        """Haar face boxes (x, y, w, h) in frame coordinates, optionally only inside roi."""
+        if self.cpu_cascade is None:
+            return [] # cascade still loading
+        if roi is not None:
+            rx, ry, rw, rh = roi
+            rects = self.cpu_cascade.detectMultiScale(
+                gray[ry:ry + rh, rx:rx + rw], config.SCALE_FACTOR, config.MIN_NEIGHBORS, minSize=config.MIN_SIZE
+            )
+            return [(x + rx, y + ry, w, h) for (x, y, w, h) in rects]
+
         faces_rects = []
-        
-        # 1. Face Detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
         if self.use_cuda and self.cuda_cascade:
             try:
                 gpu_frame = cv2.cuda_GpuMat()
@@ -191,14 +678,32 @@ class FaceDetector:
                 faces_rects = self.cpu_cascade.detectMultiScale(
                     gray, config.SCALE_FACTOR, config.MIN_NEIGHBORS, minSize=config.MIN_SIZE
                 )
+        elif self.haar_scale < 1.0:
+            faces_rects = self.detect_face_rects_scaled(gray, self.haar_scale)
         else:
             faces_rects = self.cpu_cascade.detectMultiScale(
                 gray, config.SCALE_FACTOR, config.MIN_NEIGHBORS, minSize=config.MIN_SIZE
             )
+        return faces_rects
+
+    def detect_face_rects_scaled(self, gray, scale):
+        """Run Haar on a downscaled copy of gray and map the boxes back to full resolution."""
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        min_w = max(config.HAAR_WINDOW[0], int(round(config.MIN_SIZE[0] * scale)))
+        min_h = max(config.HAAR_WINDOW[1], int(round(config.MIN_SIZE[1] * scale)))
+        rects = self.cpu_cascade.detectMultiScale(
+            small, config.SCALE_FACTOR, config.MIN_NEIGHBORS, minSize=(min_w, min_h)
+        )
+        return [
+            (int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+            for (x, y, w, h) in rects
+        ]
 
-        # 2. Gender Detection (on detected faces)
-        faces_data = [] # List of (rect, gender_label)
-        for (x, y, w, h) in faces_rects:
+    def classify_genders(self, frame, faces_rects):
+        """Gender label per face box, classified in one batch."""
+        face_imgs = []
+        face_slots = [] # index into faces_rects for each crop sent to the net
+        for idx, (x, y, w, h) in enumerate(faces_rects):
             # Padding
             padding = 10
             x1 = max(0, x - padding)
@@ -209,18 +714,127 @@ class FaceDetector:
             face_img = frame[y1:y2, x1:x2]
             # Skip if too small
             if face_img.size > 0 and w > 20 and h > 20: 
-                gender = self.gender_detector.predict_gender(face_img)
-            else:
-                 gender = "Unknown"
-            faces_data.append(((x, y, w, h), gender))
+                face_imgs.append(face_img)
+                face_slots.append(idx)
+
+        genders = ["Unknown"] * len(faces_rects)
+        for idx, gender in zip(face_slots, self.gender_detector.predict_genders(face_imgs)):
+            genders[idx] = gender
+        return genders
+
+    def detect(self, frame, objects=None, object_times=None):
+        """
+        Detect faces, gender, and objects.
+        objects: precomputed object results (e.g. from ObjectDetector.detect_batch);
+        when given, YOLO is not run for this frame. object_times: stage times of
+        the batch that produced them (default: this detector's object_detector).
+        Returns: 
+           faces: list of ((x, y, w, h), gender_label)
+           objects: list of (label, confidence, (x,y,w,h))
+           objects_age / objects_age_ms: how old the object results are (0 when run inline)
+           tracks: track id per face (only when face tracking is enabled)
+           motion_skipped: True when the motion gate reused the previous results
+           latency: ms
+        Per-stage timings (ms) for the frame are left in self.stage_times:
+        motion, grayscale, haar, gender, yolo_forward, yolo_decode.
+        """
+        start_time = time.time()
+        timings = {}
+        results = {}
+
+        # 0. Motion Gate: reuse the previous results when nothing changed
+        rois = None
+        if self.motion_gate:
+            t0 = time.perf_counter()
+            changed, rois = self.motion_gate.check(frame)
+            timings['motion'] = (time.perf_counter() - t0) * 1000
+            if self.last_results is None:
+                rois = None
+            elif not changed:
+                self.stage_times = timings
+                metrics.observe_stages(timings, self.STAGES)
+                results = dict(self.last_results)
+                results['motion_skipped'] = True
+                return results, (time.time() - start_time) * 1000
+        
+        # 1. Face Detection
+        t0 = time.perf_counter()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        t1 = time.perf_counter()
+        timings['grayscale'] = (t1 - t0) * 1000
+
+        if self.tracker:
+            tracks = self.tracker.update(gray)
+            faces_rects = [t.box for t in tracks]
+        elif rois is not None:
+            # Keep faces in static areas, re-detect only where something moved
+            faces_rects = [
+                rect for rect, _ in self.last_results['faces']
+                if not any(iou(rect, roi) > 0 for roi in rois)
+            ]
+            for roi in rois:
+                faces_rects.extend(self.detect_face_rects(gray, roi))
+        else:
+            faces_rects = self.detect_face_rects(gray)
+        t2 = time.perf_counter()
+        timings['haar'] = (t2 - t1) * 1000
+
+        # 2. Gender Detection (on detected faces, one batch per frame)
+        if self.tracker:
+            results['tracks'] = [t.track_id for t in tracks]
+        if self.gender_cache:
+            # Only classify faces the cache cannot answer for yet
+            cache = self.gender_cache
+            cache.next_frame()
+            rects = [tuple(int(v) for v in r) for r in faces_rects]
+            keys = cache.keys_for(rects, results.get('tracks'))
+            pending = [i for i, key in enumerate(keys) if cache.needs_inference(key)]
+            fresh = dict(zip(pending, self.classify_genders(frame, [rects[i] for i in pending])))
+            for i, key in enumerate(keys):
+                cache.update(key, rects[i], fresh.get(i))
+            genders = [cache.label(key) for key in keys]
+        elif self.tracker:
+            # Without the cache, each track keeps the label of its first classification
+            new_tracks = [t for t in tracks if t.gender in (None, "Unknown", "Error")]
+            for track, gender in zip(new_tracks, self.classify_genders(frame, [t.box for t in new_tracks])):
+                track.gender = gender
+            genders = [t.gender for t in tracks]
+        else:
+            genders = self.classify_genders(frame, faces_rects)
+        faces_data = [((x, y, w, h), gender) for (x, y, w, h), gender in zip(faces_rects, genders)]
+        t3 = time.perf_counter()
+        timings['gender'] = (t3 - t2) * 1000
 
-        # 3. Object Detection (YOLO)
-        objects_data = self.object_detector.detect(frame)
+        # 3. Object Detection (YOLO), inline, batched by the caller, or on its own cadence
+        if objects is not None:
+            objects_data, age_frames, age_ms = objects, 0, 0.0
+            # Batched forward time is shared by every frame in the batch
+            batch = object_times if object_times is not None else self.object_detector.stage_times
+            n = batch.get('batch_size', 1)
+            timings['yolo_forward'] = batch.get('yolo_forward', 0.0) / n
+            timings['yolo_decode'] = batch.get('yolo_decode', 0.0) / n
+            results['objects_age'] = 0
+            results['objects_age_ms'] = 0.0
+            return self._finish(results, faces_data, objects_data, timings, start_time)
 
+        objects_data, age_frames, age_ms = self.object_scheduler.submit(frame)
+        results['objects_age'] = age_frames
+        results['objects_age_ms'] = age_ms
+        # Only inline YOLO time counts against this frame
+        yolo_times = self.object_scheduler.get_stage_times() if self.object_scheduler.mode == 'sync' else {}
+        timings['yolo_forward'] = yolo_times.get('yolo_forward', 0.0)
+        timings['yolo_decode'] = yolo_times.get('yolo_decode', 0.0)
+        return self._finish(results, faces_data, objects_data, timings, start_time)
+
+    def _finish(self, results, faces_data, objects_data, timings, start_time):
         end_time = time.time()
         latency = (end_time - start_time) * 1000 
-        
-        return {
-            'faces': faces_data, 
-            'objects': objects_data
-        }, latency
+        self.stage_times = timings
+        metrics.observe_stages(timings, self.STAGES)
+
+        results['faces'] = faces_data
+        results['objects'] = objects_data
+        if self.motion_gate:
+            self.last_results = results
+            self.motion_gate.record_detect(latency)
+        return results, latency
@@ -0,0 +1,99 @@
+import queue
+import time
+import config
+import metrics
+
+class DisplayScheduler:
+    """
+    Paces the GUI thread to DISPLAY_REFRESH_HZ instead of polling the frame
+    queue. A frame is shown no earlier than one refresh period after the
+    last one; if a newer frame arrives while it waits for that slot, the
+    older one is released undrawn, so overlay and conversion work is only
+    spent on frames that actually reach the screen. Also tracks the CPU
+    time of the thread that calls it (time.thread_time), i.e. the GUI thread.
+    """
+    def __init__(self, frame_queue, refresh_hz=None):
+        self.frame_queue = frame_queue
+        self.period = 1.0 / (refresh_hz or config.DISPLAY_REFRESH_HZ)
+        self.next_due = 0.0
+        self.shown = 0
+        self.skipped = 0
+        self.shown_metric = metrics.FRAMES.labels('display')
+        self.skipped_metric = metrics.FRAMES_DROPPED.labels('display')
+        self.cpu_metric = metrics.GUI_CPU_SECONDS
+        self.cpu_start = self.cpu_last = time.thread_time()
+        self.wall_start = self.wall_last = time.perf_counter()
+        self.cpu_percent = 0.0
+
+    def _supersede(self, item, newer):
+        item[0].release()
+        self.skipped += 1
+        self.skipped_metric.inc()
+        return newer
+
+    def _take(self, item):
+        now = time.perf_counter()
+        # Slots advance from now when we fell behind, so a stall does not trigger a burst
+        self.next_due = max(self.next_due + self.period, now)
+        self.shown += 1
+        self.shown_metric.inc()
+        return item
+
+    def next_frame(self, timeout=None):
+        """
+        Block until a frame is due: wait up to timeout seconds for one to
+        arrive, then hold it until its refresh slot, swapping in any newer
+        frame that shows up meanwhile. Returns the frame_queue item (whose
+        Frame the caller must release, see VideoThread) or None on timeout.
+        """
+        try:
+            item = self.frame_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        while True:
+            remaining = self.next_due - time.perf_counter()
+            if remaining <= 0:
+                return self._take(item)
+            try:
+                item = self._supersede(item, self.frame_queue.get(timeout=remaining))
+            except queue.Empty:
+                return self._take(item)
+
+    def poll(self):
+        """
+        Non-blocking variant for event loops that cannot sleep (Tk): the
+        newest queued frame if its slot has come, else None. Older queued
+        frames are released.
+        """
+        if time.perf_counter() < self.next_due:
+            return None
+        item = None
+        while True:
+            try:
+                newer = self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+            item = newer if item is None else self._supersede(item, newer)
+        return self._take(item) if item is not None else None
+
+    def delay_ms(self):
+        """Milliseconds until the next refresh slot; a full period when it has passed with no frame to show."""
+        remaining = self.next_due - time.perf_counter()
+        if remaining <= 0:
+            return max(1, round(self.period * 1000))
+        return max(1, int(remaining * 1000))
+
+    def get_stats(self):
+        """Frames shown/skipped and GUI-thread CPU (latest window of >= 0.5 s, and overall); call from the GUI thread."""
+        cpu, wall = time.thread_time(), time.perf_counter()
+        # Shorter windows are too noisy; keep the previous reading until half a second has passed
+        if wall - self.wall_last >= 0.5:
+            self.cpu_metric.inc(cpu - self.cpu_last)
+            self.cpu_percent = 100.0 * (cpu - self.cpu_last) / (wall - self.wall_last)
+            self.cpu_last, self.wall_last = cpu, wall
+        return {
+            'shown': self.shown,
+            'skipped': self.skipped,
+            'cpu_percent': self.cpu_percent,
+            'cpu_total_percent': 100.0 * (cpu - self.cpu_start) / max(wall - self.wall_start, 1e-9),
+        }
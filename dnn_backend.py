@@ -0,0 +1,76 @@
+import cv2
+import config
+
+BACKENDS = {
+    'default': 'DNN_BACKEND_DEFAULT',
+    'opencv': 'DNN_BACKEND_OPENCV',
+    'openvino': 'DNN_BACKEND_INFERENCE_ENGINE',
+    'cuda': 'DNN_BACKEND_CUDA',
+}
+TARGETS = {
+    'cpu': 'DNN_TARGET_CPU',
+    'opencl': 'DNN_TARGET_OPENCL',
+    'opencl_fp16': 'DNN_TARGET_OPENCL_FP16',
+    'myriad': 'DNN_TARGET_MYRIAD',
+    'cuda': 'DNN_TARGET_CUDA',
+    'cuda_fp16': 'DNN_TARGET_CUDA_FP16',
+    'cpu_fp16': 'DNN_TARGET_CPU_FP16', # OpenCV >= 4.10
+}
+
+def _constant(table, name):
+    attr = table.get(name)
+    return getattr(cv2.dnn, attr, None) if attr else None
+
+def available_pairs():
+    """(backend, target) names this OpenCV build can run, e.g. ('openvino', 'cpu')."""
+    backend_names = {_constant(BACKENDS, b): b for b in BACKENDS if b != 'default' and _constant(BACKENDS, b) is not None}
+    target_names = {_constant(TARGETS, t): t for t in TARGETS if _constant(TARGETS, t) is not None}
+    pairs = []
+    try:
+        for backend, target in cv2.dnn.getAvailableBackends():
+            if backend in backend_names and target in target_names:
+                pairs.append((backend_names[backend], target_names[target]))
+    except AttributeError:
+        pairs.append(('opencv', 'cpu'))
+    return pairs
+
+def resolve(backend, target):
+    """
+    The requested pair if the build supports it, else the closest one:
+    'auto' prefers OpenVINO on CPU, and anything unavailable falls back to
+    OpenCV's own CPU backend.
+    """
+    pairs = available_pairs()
+    if backend == 'auto':
+        for candidate in (('openvino', target), ('openvino', 'cpu'), ('opencv', target)):
+            if candidate in pairs:
+                return candidate
+        return 'opencv', 'cpu'
+    if backend == 'default' or (backend, target) in pairs:
+        return backend, target
+    print(f"DNN backend {backend}/{target} is not available in this OpenCV build. Using opencv/cpu.")
+    return 'opencv', 'cpu'
+
+def apply(net, backend, target):
+    """Set a network's backend/target by name ('default' leaves OpenCV's choice)."""
+    if backend != 'default':
+        net.setPreferableBackend(_constant(BACKENDS, backend))
+        net.setPreferableTarget(_constant(TARGETS, target))
+
+def configure(net, role):
+    """Apply DNN_SETTINGS[role] ('gender' or 'objects') to a freshly loaded network. Returns the pair used."""
+    settings = config.DNN_SETTINGS.get(role, {})
+    backend, target = resolve(settings.get('backend', 'default'), settings.get('target', 'cpu'))
+    apply(net, backend, target)
+    return backend, target
+
+def apply_thread_settings(num_threads=None):
+    """
+    Size OpenCV's worker pool. The pool is shared by every network and Haar
+    in the process, so this is a per-process setting (process workers get
+    their own). 0 keeps OpenCV's default of one thread per core.
+    """
+    num_threads = config.DNN_NUM_THREADS if num_threads is None else num_threads
+    if num_threads:
+        cv2.setNumThreads(num_threads)
+    return cv2.getNumThreads()
@@ -0,0 +1,120 @@
+import threading
+import cv2
+import numpy as np
+
+class Frame:
+    """
+    A captured image lent out from a FrameRing.
+    Every holder that keeps the frame past its own call retains it and
+    releases it when done; the slot is reused once the count reaches zero.
+    Readers must treat .image as read-only, overlays go on a separate buffer.
+    """
+    __slots__ = ('ring', 'index', 'image', 'refs', 'seq', 'stamp')
+
+    def __init__(self, ring, index, image):
+        self.ring = ring
+        self.index = index
+        self.image = image
+        self.refs = 0
+        self.seq = 0
+        self.stamp = 0.0 # perf_counter() of the last hand-off, for queue wait metrics
+
+    def retain(self):
+        self.ring._retain(self)
+        return self
+
+    def release(self):
+        self.ring._release(self)
+
+class FrameRing:
+    """
+    Fixed set of preallocated frame buffers shared by capture, inference and
+    display. The capture thread reads straight into a free slot
+    (cap.read(image=...)), so steady-state capture allocates nothing. When
+    every slot is still borrowed the new camera frame is dropped (counted as
+    misses) instead of stalling capture or allocating a one-off buffer.
+    """
+    def __init__(self, size, shape=None, dtype=np.uint8):
+        self.cond = threading.Condition()
+        self.frames = [
+            Frame(self, i, np.empty(shape, dtype) if shape else None)
+            for i in range(size)
+        ]
+        self.free = list(reversed(self.frames))
+        self.acquired = 0
+        self.misses = 0
+
+    def acquire(self):
+        """A free frame with one reference held by the caller, or None (a miss) when every slot is borrowed."""
+        with self.cond:
+            if not self.free:
+                self.misses += 1
+                return None
+            self.acquired += 1
+            frame = self.free.pop()
+            frame.refs = 1
+            return frame
+
+    def read(self, cap):
+        """
+        Capture one frame into a ring slot. Returns the frame (one reference
+        held by the caller) or None when the camera returned nothing or no
+        slot was free; in that case the camera frame is grabbed and discarded,
+        so the next read is still the freshest.
+        """
+        frame = self.acquire()
+        if frame is None:
+            cap.grab()
+            return None
+        ret, image = cap.read(image=frame.image)
+        if not ret:
+            frame.release()
+            return None
+        # OpenCV reallocates when the slot does not match the camera's format;
+        # keep the new buffer so later reads into this slot are in place
+        frame.image = image
+        return frame
+
+    def _retain(self, frame):
+        with self.cond:
+            frame.refs += 1
+
+    def _release(self, frame):
+        with self.cond:
+            if frame.refs <= 0:
+                return
+            frame.refs -= 1
+            if frame.refs == 0:
+                self.free.append(frame)
+                self.cond.notify()
+
+    def get_stats(self):
+        with self.cond:
+            return {
+                'size': len(self.frames),
+                'free': len(self.free),
+                'acquired': self.acquired,
+                'misses': self.misses,
+            }
+
+class OverlayCanvas:
+    """
+    Reusable display buffer: copies a source frame in (optionally converting
+    its colour space) so overlays can be drawn without touching the frame
+    that detectors and other consumers may still be reading.
+    """
+    def __init__(self):
+        self.buffer = None
+
+    def compose(self, image, conversion=None):
+        if conversion is not None:
+            self.buffer = cv2.cvtColor(image, conversion, dst=self._fit(image.shape))
+        else:
+            self.buffer = self._fit(image.shape)
+            np.copyto(self.buffer, image)
+        return self.buffer
+
+    def _fit(self, shape):
+        if self.buffer is None or self.buffer.shape != shape:
+            return np.empty(shape, np.uint8)
+        return self.buffer
@@ -5,6 +5,9 @@ from PIL import Image, ImageTk
 import queue
 import time
 import config
+from frame_ring import OverlayCanvas
+from display import DisplayScheduler
+import metrics
 
 class FaceDetectionApp:
     def __init__(self, root, db_manager, video_thread, detector):
@@ -18,6 +21,11 @@ class FaceDetectionApp:
         
         self.is_detecting = False
         self.is_benchmarking = False
+        # RGB display buffer and Tk image, reused across frames
+        self.canvas = OverlayCanvas()
+        self.photo = None
+        # Paces update_ui to the display refresh rate and skips superseded frames
+        self.display = DisplayScheduler(video_thread.frame_queue)
         
         self.setup_ui()
         
@@ -25,7 +33,7 @@ class FaceDetectionApp:
         self.thread.start()
         
         # Start UI Update Loop
-        self.root.after(10, self.update_ui)
+        self.root.after(self.display.delay_ms(), self.update_ui)
 
     def setup_ui(self):
         # Top Control Frame
@@ -43,6 +51,22 @@ class FaceDetectionApp:
         self.combo_mode.pack(side="left", padx=5)
         self.combo_mode.bind("<<ComboboxSelected>>", self.change_mode)
         
+        # YOLO Model / Input Size (switchable while running)
+        objects = self.detector.object_detector
+        ttk.Label(control_frame, text="YOLO:").pack(side="left", padx=5)
+        self.variant_var = tk.StringVar(value=objects.variant)
+        self.combo_variant = ttk.Combobox(control_frame, textvariable=self.variant_var, values=["tiny", "full", "ssd"], state="readonly", width=5)
+        self.combo_variant.pack(side="left", padx=2)
+        self.combo_variant.bind("<<ComboboxSelected>>", self.change_yolo)
+        
+        self.size_var = tk.StringVar(value=str(objects.input_size))
+        self.combo_size = ttk.Combobox(control_frame, textvariable=self.size_var, values=[str(s) for s in config.YOLO_INPUT_SIZES], state="readonly", width=4)
+        self.combo_size.pack(side="left", padx=2)
+        self.combo_size.bind("<<ComboboxSelected>>", self.change_yolo)
+        
+        self.auto_var = tk.BooleanVar(value=bool(objects.auto_tuner))
+        ttk.Checkbutton(control_frame, text="Auto", variable=self.auto_var, command=self.change_yolo).pack(side="left", padx=2)
+        
         # Benchmark Button
         self.btn_benchmark = ttk.Button(control_frame, text="Run Benchmark", command=self.run_benchmark)
         self.btn_benchmark.pack(side="left", padx=5)
@@ -60,6 +84,12 @@ class FaceDetectionApp:
         self.lbl_faces = ttk.Label(stats_frame, text="Faces Detected: 0")
         self.lbl_faces.pack(side="left", padx=10)
         
+        self.lbl_yolo = ttk.Label(stats_frame, text="YOLO: -")
+        self.lbl_yolo.pack(side="left", padx=10)
+        
+        self.lbl_pipeline = ttk.Label(stats_frame, text="Pipeline: -")
+        self.lbl_pipeline.pack(side="left", padx=10)
+        
         # Video Display
         self.video_frame = tk.Label(self.root)
         self.video_frame.pack(padx=10, pady=10)
@@ -83,6 +113,19 @@ class FaceDetectionApp:
             messagebox.showwarning("GPU Unavailable", "CUDA GPU is not available. Falling back to CPU.")
             self.mode_var.set("CPU")
 
+    def change_yolo(self, event=None):
+        objects = self.detector.object_detector
+        objects.set_auto_tune(self.auto_var.get())
+        if not self.auto_var.get():
+            variant = self.variant_var.get()
+            if not objects.set_variant(variant):
+                if variant in objects.loading:
+                    messagebox.showinfo("YOLO", f"Loading the {variant} model; it switches in when ready.")
+                else:
+                    messagebox.showwarning("YOLO", f"The {variant} model is not available.")
+            objects.set_input_size(int(self.size_var.get()))
+        self.variant_var.set(objects.variant)
+
     def run_benchmark(self):
         if self.is_benchmarking:
             return
@@ -114,59 +157,62 @@ class FaceDetectionApp:
 
     def update_ui(self):
         try:
-            # Empty the queue to get the latest frame
-            # Wait, if we empty it we lose frames. Just get one.
-            # But if processing is slow, queue builds up.
-            # We should probably drain queue until empty or just get one.
-            # Standard: Get one. If Main thread is slow, queue fills => thread drops frames.
-            if not self.thread.frame_queue.empty():
-                frame_data = self.thread.frame_queue.get_nowait()
-                frame, faces, fps, latency, benchmark_active = frame_data
+            # Latest frame once its refresh slot has come; Tk cannot block, so this is
+            # checked once per refresh period instead of every 10 ms
+            frame_data = self.display.poll()
+            if frame_data is not None:
+                source, detection_results, fps, latency, benchmark_active = frame_data
+                # A results dict while detection runs, [] while frames pass straight through
+                faces = detection_results.get('faces', []) if isinstance(detection_results, dict) else []
+                render_start = time.perf_counter()
+                metrics.QUEUE_WAIT_SECONDS.labels('display').observe(render_start - source.stamp)
+                # Convert into the reusable display buffer and hand the ring frame back
+                try:
+                    frame = self.canvas.compose(source.image, cv2.COLOR_BGR2RGB)
+                finally:
+                    source.release()
                 
                 # Draw faces
-                for (x, y, w, h) in faces:
+                for (x, y, w, h), _ in faces:
                     cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
                 
                 # Update Labels
                 self.lbl_fps.config(text=f"FPS: {fps:.1f}")
                 self.lbl_latency.config(text=f"Latency: {latency:.1f} ms")
                 self.lbl_faces.config(text=f"Faces Detected: {len(faces)}")
+                if self.detector.models_ready.is_set():
+                    self.lbl_yolo.config(text=f"YOLO: {self.detector.object_detector.setting_label()}")
+                else:
+                    self.lbl_yolo.config(text="Loading: " + ", ".join(
+                        name for name, state in self.detector.model_status().items() if state != 'ready'
+                    ))
+                stats = self.thread.get_pipeline_stats()
+                display = self.display.get_stats()
+                self.lbl_pipeline.config(text="Pipeline: " + " | ".join(
+                    f"{name} {s['fps']:.0f}fps ({s['dropped']} dropped)" for name, s in stats.items()
+                ) + f" | GUI {display['cpu_percent']:.0f}% CPU ({display['skipped']} skipped)")
                 
-                # Convert to ImageTk
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(rgb_frame)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.video_frame.imgtk = imgtk
-                self.video_frame.configure(image=imgtk)
+                # Update the Tk image in place (a new PhotoImage only when the size changes)
+                height, width = frame.shape[:2]
+                img = Image.frombuffer('RGB', (width, height), frame, 'raw', 'RGB', 0, 1)
+                if self.photo is None or (self.photo.width(), self.photo.height()) != (width, height):
+                    self.photo = ImageTk.PhotoImage(image=img)
+                    self.video_frame.imgtk = self.photo
+                    self.video_frame.configure(image=self.photo)
+                else:
+                    self.photo.paste(img)
+                metrics.STAGE_SECONDS.labels('render').observe(time.perf_counter() - render_start)
                 
-                # Log detection to DB periodically or every frame?
-                # User req: "Log: Each detection event."
-                # Logging every frame with detection might be heavy.
-                # Let's log if faces > 0.
+                # Log detection to DB (queued; the background writer batches inserts)
                 if len(faces) > 0:
                     mode = self.mode_var.get()
-                    # To prevent DB flooding (30 inserts/sec), maybe logic here?
-                    # The prompt implies "Each detection event".
-                    # Realistically, we should maybe batch or only log on change.
-                    # I'll log it as requested, but user beware of DB size.
-                    # Or maybe I'll log once per second? 
-                    # For a "production-ready" app, thousands of inserts/min is bad for a local app UI thread.
-                    # But I'll stick to the requirement literally for now, or just delegate to a background task?
-                    # `db.log_detection` is blocking. Doing it in UI thread will kill FPS.
-                    # I should probably spawn a thread for logging or trust the DB is fast enough (it isn't).
-                    # I'll fire-and-forget in a simple way or just accept the performance hit for this MVP.
-                    # Better: The video thread could invoke DB logging asynchronously.
-                    # Since I am in `update_ui` (Main Thread), blocking here freezes UI.
-                    # I will assume for this task that direct logging is acceptable, or use a separate thread for logging.
-                    # Optimally: Create a DBQueue and a DBWorker thread.
-                    # I'll stick to direct call for simplicity unless it lags, but note it.
-                    # Actually, I'll add a quick threaded call for logging to be safe.
-                    threading.Thread(target=self.db.log_detection, args=(len(faces), mode, fps, latency)).start()
+                    self.db.log_detection(len(faces), mode, fps, latency)
 
         except queue.Empty:
             pass
-        
-        self.root.after(10, self.update_ui)
+        finally:
+            # Keep polling even if one frame failed to draw
+            self.root.after(self.display.delay_ms(), self.update_ui)
 
     def on_closing(self):
         self.thread.stop()
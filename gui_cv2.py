@@ -2,6 +2,11 @@ import cv2
 import time
 import queue
 from db import DatabaseManager
+import config
+from frame_ring import OverlayCanvas
+from renderer import OverlayRenderer
+from display import DisplayScheduler
+import metrics
 
 class CV2GUI:
     def __init__(self, root, db_manager, video_thread, detector):
@@ -11,6 +16,11 @@ class CV2GUI:
         
         self.is_detecting = False
         self.is_benchmarking = False
+        # Overlays are drawn on this copy, never on the shared ring frame
+        self.canvas = OverlayCanvas()
+        self.renderer = OverlayRenderer()
+        # Sleeps until a frame is due rather than polling the queue
+        self.display = DisplayScheduler(video_thread.frame_queue)
         
         # Start Video Thread
         self.thread.start()
@@ -25,6 +35,9 @@ class CV2GUI:
         print(" [S] - Start/Stop Detection")
         print(" [B] - Run Benchmark (10s)")
         print(" [G] - Toggle GPU/CPU Mode")
+        print(" [Y] - Switch Object Model (tiny/full/ssd)")
+        print(" [R] - Cycle YOLO Input Size")
+        print(" [A] - Toggle YOLO Auto-Tune")
         print(" [Q] - Quit")
         print("========================================")
 
@@ -33,12 +46,39 @@ class CV2GUI:
         self.db.close()
         cv2.destroyAllWindows()
 
+    def objects_text(self, objects, detection_results):
+        age = detection_results.get('objects_age') if isinstance(detection_results, dict) else None
+        if age:
+            return f"Objects: {len(objects)} ({age} frames old)"
+        return f"Objects: {len(objects)}"
+
+    def models_text(self):
+        status = self.detector.model_status()
+        return "Models: " + " | ".join(f"{name} {state}" for name, state in status.items())
+
+    def pipeline_text(self):
+        stats = self.thread.get_pipeline_stats()
+        return "Pipe: " + " | ".join(
+            f"{name[:3]} {s['fps']:.0f}fps -{s['dropped']}" for name, s in stats.items()
+        )
+
+    def display_text(self):
+        stats = self.display.get_stats()
+        return f"GUI: {stats['cpu_percent']:.0f}% CPU, {stats['skipped']} frames skipped"
+
     def run(self):
         while True:
             try:
-                if not self.thread.frame_queue.empty():
-                    frame_data = self.thread.frame_queue.get_nowait()
-                    frame, detection_results, fps, latency, benchmark_active = frame_data
+                # Wait at most one refresh period so window events keep being pumped
+                frame_data = self.display.next_frame(timeout=self.display.period)
+                if frame_data is not None:
+                    source, detection_results, fps, latency, benchmark_active = frame_data
+                    render_start = time.perf_counter()
+                    metrics.QUEUE_WAIT_SECONDS.labels('display').observe(render_start - source.stamp)
+                    try:
+                        frame = self.canvas.compose(source.image)
+                    finally:
+                        source.release()
                     
                     # Unpack results
                     # detection_results is now a dict: {'faces': [(rect, gender)], 'objects': [(lbl, conf, rect)]}
@@ -55,24 +95,9 @@ class CV2GUI:
                         # But handle empty case
                         curr_faces = [] 
                     
-                    # Draw Objects
-                    for (label, conf, (x, y, w, h)) in curr_objects:
-                        # Don't draw 'person' if it overlaps significantly with face? 
-                        # Actually 'person' detects the whole body. Face detects face.
-                        # Maybe draw all.
-                        color = (255, 0, 0) # Blue for objects
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                        text = f"{label} {conf*100:.0f}%"
-                        cv2.putText(frame, text, (x, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-
-                    # Draw Faces & Gender
-                    for ((x, y, w, h), gender) in curr_faces:
-                        color = (0, 255, 0) # Green for faces
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                        
-                        # Label: "Male" or "Female"
-                        label_color = (255, 100, 100) if gender == "Female" else (100, 100, 255)
-                        cv2.putText(frame, gender, (x, y+h+20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, label_color, 2)
+                    # Draw Objects (blue) and Faces & Gender (green); boxes batched, labels from cached sprites
+                    self.renderer.draw_objects(frame, curr_objects)
+                    self.renderer.draw_faces(frame, curr_faces)
                     
                     # Stats Loop
                     mode_str = "GPU" if self.detector.use_cuda else "CPU"
@@ -80,23 +105,28 @@ class CV2GUI:
                         f"FPS: {fps:.1f}",
                         f"Latency: {latency:.1f} ms",
                         f"Faces: {len(curr_faces)}",
-                        f"Objects: {len(curr_objects)}",
+                        self.objects_text(curr_objects, detection_results),
                         f"Mode: {mode_str}",
-                        " Controls: [S]tart/Stop [B]enchmark [G]PU [Q]uit"
+                        f"YOLO: {self.detector.object_detector.setting_label()}",
+                        self.pipeline_text(),
+                        self.display_text(),
+                        " Controls: [S]tart/Stop [B]enchmark [G]PU [Y]OLO [R]es [A]uto [Q]uit"
                     ]
+                    if not self.detector.models_ready.is_set():
+                        # Preview runs while models load; each stage starts once its model is in
+                        stats_text.insert(-1, self.models_text())
                     
                     y0, dy = 30, 25
-                    for i, line in enumerate(stats_text):
-                        y = y0 + i*dy
-                        cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                    self.renderer.draw_panel(frame, stats_text, (10, y0), dy)
                     
                     if benchmark_active:
-                         cv2.putText(frame, "BENCHMARKING...", (10, y0 + len(stats_text)*dy + 10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+                         self.renderer.text(frame, "BENCHMARKING...", (10, y0 + len(stats_text)*dy + 10), (0, 0, 255), 0.8)
 
                     cv2.imshow(self.window_name, frame)
+                    metrics.STAGE_SECONDS.labels('render').observe(time.perf_counter() - render_start)
                     
                 # Handle Keys
-                key = cv2.waitKey(10) & 0xFF
+                key = cv2.waitKey(1) & 0xFF
                 
                 if key == ord('q'):
                     self.on_closing()
@@ -111,6 +141,21 @@ class CV2GUI:
                 elif key == ord('g'):
                     new_mode = not self.detector.use_cuda
                     self.detector.set_mode(new_mode)
+                elif key == ord('y'):
+                    # Variants not loaded yet load in the background and switch in when ready
+                    objects = self.detector.object_detector
+                    available = objects.available_variants()
+                    if available:
+                        idx = available.index(objects.variant) if objects.variant in available else -1
+                        objects.set_variant(available[(idx + 1) % len(available)])
+                elif key == ord('r'):
+                    objects = self.detector.object_detector
+                    sizes = list(config.YOLO_INPUT_SIZES)
+                    idx = sizes.index(objects.input_size) if objects.input_size in sizes else -1
+                    objects.set_input_size(sizes[(idx + 1) % len(sizes)])
+                elif key == ord('a'):
+                    objects = self.detector.object_detector
+                    objects.set_auto_tune(not (objects.auto_tuner and objects.auto_tuner.enabled))
 
                 if self.is_benchmarking and not self.thread.benchmark_active:
                     self.is_benchmarking = False
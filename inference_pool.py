@@ -0,0 +1,393 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+import config
+from affinity import CORES
+
+# Swapped in for frames that are not pinned to a stream: consecutive frames of
+# one stream land on different workers, so trackers, motion gates and gender
+# caches would each see only every Nth frame
+STATELESS = {'tracker': None, 'gender_cache': None, 'motion_gate': None, 'last_results': None}
+
+def _empty_results():
+    return {'faces': [], 'objects': []}
+
+def _worker_main(worker_id, task_queue, result_queue, cores=None):
+    """
+    Worker process: loads its own FaceDetector once, then serves frames from shared memory.
+    Frames submitted with a stream id keep that stream's per-stream state here;
+    the pool always routes a stream to the same worker.
+    """
+    try:
+        import dnn_backend
+        from affinity import pin_current_thread
+        from detection import FaceDetector
+        if cores:
+            # Own slice of cores, and an OpenCV pool sized to it, so workers do not oversubscribe
+            pin_current_thread(cores)
+            dnn_backend.apply_thread_settings(config.DNN_NUM_THREADS or len(cores))
+        else:
+            dnn_backend.apply_thread_settings()
+        # Object results must belong to the frame they are returned with
+        detector = FaceDetector(cadence='sync', preload_variants=False)
+    except Exception as e:
+        result_queue.put(('error', worker_id, repr(e)))
+        return
+    attached = {} # shared memory name -> SharedMemory
+    streams = {} # stream id -> detector state
+    result_queue.put(('ready', worker_id, detector.model_status()))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        if task[0] == 'detach':
+            # The parent replaced this segment; unmap it so it can be unlinked
+            shm = attached.pop(task[1], None)
+            if shm is not None:
+                shm.close()
+            result_queue.put(('detached', worker_id, task[1]))
+            continue
+
+        _, seq, shm_name, shape, stream = task
+        shm = attached.get(shm_name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            attached[shm_name] = shm
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        if stream is None:
+            state = STATELESS
+        else:
+            state = streams.get(stream)
+            if state is None:
+                state = streams[stream] = detector.new_stream_state()
+        try:
+            detector.use_stream_state(state)
+            results, latency = detector.detect(frame)
+            if state is not STATELESS:
+                detector.save_stream_state(state)
+        except Exception as e:
+            print(f"Worker {worker_id} Error: {e}")
+            results, latency = _empty_results(), 0
+        del frame
+        result_queue.put(('result', worker_id, seq, results, latency))
+
+    detector.close()
+    for shm in attached.values():
+        shm.close()
+
+class _Slot:
+    """One shared-memory frame buffer owned by the parent process."""
+    def __init__(self, nbytes):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        self.nbytes = self.shm.size
+        self.released = False
+
+    def release(self):
+        """Close and unlink the segment; safe to call more than once."""
+        if self.released:
+            return
+        self.released = True
+        self.shm.close()
+        self.shm.unlink()
+
+class ProcessInferencePool:
+    """
+    Runs FaceDetector.detect in N worker processes.
+    Frames are copied once into shared-memory slots instead of being pickled;
+    only the small result lists travel back through a queue. Use detect() for
+    blocking per-frame calls (thread-safe), or submit() + get_ordered() to
+    stream results back in frame-sequence order.
+
+    Frames submitted with a stream id always go to the same worker, which
+    keeps that stream's tracker, motion gate and gender cache. Frames without
+    one are spread over all workers and processed without per-stream state
+    (see STATELESS). Workers run object detection inline.
+
+    A worker that dies or fails to start is taken out of rotation and its
+    in-flight frames complete with empty results; detect() gives up after
+    PROCESS_TASK_TIMEOUT seconds, so a stuck worker cannot hang the caller.
+
+    With start=False no process is spawned until start(); callers that must
+    not block (the app's startup path) start the pool and wait_until_ready()
+    from a background thread. Until then detect() returns empty results.
+    """
+    def __init__(self, num_workers=None, frame_shape=None, slots=None, start=True):
+        self.num_workers = num_workers or config.PROCESS_WORKERS
+        frame_shape = frame_shape or (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3)
+        nbytes = int(np.prod(frame_shape))
+
+        self.ctx = mp.get_context('spawn')
+        # One task queue per worker, so a stream can be pinned and every worker gets its detach messages
+        self.task_queues = [self.ctx.Queue() for _ in range(self.num_workers)]
+        self.result_queue = self.ctx.Queue()
+
+        # Twice as many slots as workers keeps every worker busy while the next frame is copied in
+        self.slots = [_Slot(nbytes) for _ in range(slots or self.num_workers * 2)]
+        self.free_slots = queue.Queue()
+        for idx in range(len(self.slots)):
+            self.free_slots.put(idx)
+        self.slot_of_seq = {}
+        self.retired = {} # shm name -> (slot, workers that may still have it mapped)
+
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self.next_seq = 0
+        self.completed = {} # seq -> (results, latency)
+        self.ordered = deque() # seqs submitted with ordered=True, in submission order
+        self.worker_of_seq = {} # in-flight seq -> worker index
+        self.abandoned = set() # seqs whose caller stopped waiting
+        self.worker_state = ['loading'] * self.num_workers # -> 'ready' | 'failed' | 'dead'
+        self.model_state = {} # model status reported by the first ready worker
+        self.stream_worker = {} # stream id -> worker index
+        self.next_worker = 0
+        self.ready = threading.Event()
+        self.running = True
+        self.processes = []
+        self.collector = None
+
+        if start:
+            self.start()
+            # Wait until every worker has loaded its models (or given up)
+            if not self.wait_until_ready():
+                self.close()
+                raise RuntimeError("No inference worker process started.")
+
+    def start(self):
+        """Spawn the worker processes (they load their models in parallel); returns immediately."""
+        if self.processes:
+            return
+        core_slices = CORES.partition(self.num_workers) if config.CPU_AFFINITY else [None] * self.num_workers
+        self.processes = [
+            self.ctx.Process(target=_worker_main, args=(i, self.task_queues[i], self.result_queue, core_slices[i]),
+                             daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for p in self.processes:
+            p.start()
+
+        self.collector = threading.Thread(target=self._collect, daemon=True)
+        self.collector.start()
+
+    def wait_until_ready(self, timeout=None):
+        """
+        Block until every worker is ready or has failed; workers still loading
+        after timeout (default PROCESS_START_TIMEOUT) are stopped. Returns
+        True when at least one worker is serving. Starts the pool if needed.
+        """
+        timeout = config.PROCESS_START_TIMEOUT if timeout is None else timeout
+        self.start()
+        if not self.ready.wait(timeout):
+            for i, state in enumerate(list(self.worker_state)):
+                if state == 'loading':
+                    print(f"Inference worker {i} not ready after {timeout:.0f} s; stopping it.")
+                    self.processes[i].terminate()
+                    self._mark_dead(i)
+        return self.live_workers() > 0
+
+    def live_workers(self):
+        with self.cond:
+            return sum(1 for state in self.worker_state if state == 'ready')
+
+    def _check_ready(self):
+        """Callers hold self.cond."""
+        if 'loading' not in self.worker_state and not self.ready.is_set():
+            print(f"Process pool ready with {self.worker_state.count('ready')}/{self.num_workers} workers.")
+            self.ready.set()
+
+    def _collect(self):
+        last_check = time.time()
+        while self.running:
+            try:
+                message = self.result_queue.get(timeout=0.1)
+            except queue.Empty:
+                message = None
+            if message is not None:
+                self._handle(message)
+            if time.time() - last_check >= 0.5:
+                last_check = time.time()
+                for i, p in enumerate(self.processes):
+                    if self.worker_state[i] in ('loading', 'ready') and not p.is_alive():
+                        print(f"Inference worker {i} exited (code {p.exitcode}).")
+                        self._mark_dead(i)
+
+    def _handle(self, message):
+        kind, worker = message[0], message[1]
+        if kind == 'result':
+            _, _, seq, results, latency = message
+            with self.cond:
+                if seq not in self.slot_of_seq:
+                    return # already failed when its worker was declared dead
+                self._finish(seq, results, latency)
+        elif kind == 'ready':
+            with self.cond:
+                self.worker_state[worker] = 'ready'
+                if not self.model_state:
+                    self.model_state = dict(message[2])
+                self._check_ready()
+        elif kind == 'error':
+            print(f"Inference worker {worker} failed to start: {message[2]}")
+            with self.cond:
+                self.worker_state[worker] = 'failed'
+                self._check_ready()
+        elif kind == 'detached':
+            with self.cond:
+                self._detached(message[2], worker)
+
+    def _finish(self, seq, results, latency):
+        """Complete an in-flight seq and free its slot; callers hold self.cond."""
+        self.worker_of_seq.pop(seq, None)
+        self.free_slots.put(self.slot_of_seq.pop(seq))
+        if seq in self.abandoned:
+            self.abandoned.discard(seq)
+        else:
+            self.completed[seq] = (results, latency)
+        self.cond.notify_all()
+
+    def _detached(self, name, worker):
+        """Callers hold self.cond."""
+        entry = self.retired.get(name)
+        if entry is None:
+            return
+        slot, waiting = entry
+        waiting.discard(worker)
+        if not waiting:
+            slot.release()
+            del self.retired[name]
+
+    def _mark_dead(self, worker):
+        with self.cond:
+            if self.worker_state[worker] in ('dead', 'failed'):
+                return
+            self.worker_state[worker] = 'dead'
+            for seq in [s for s, w in self.worker_of_seq.items() if w == worker]:
+                self._finish(seq, _empty_results(), 0)
+            for name in list(self.retired):
+                self._detached(name, worker)
+            for stream in [s for s, w in self.stream_worker.items() if w == worker]:
+                del self.stream_worker[stream]
+            self._check_ready()
+
+    def _pick_worker(self, stream):
+        """Worker for the next frame (callers hold self.cond); None when none is serving."""
+        live = [i for i, state in enumerate(self.worker_state) if state == 'ready']
+        if not live:
+            return None
+        if stream is None:
+            worker = live[self.next_worker % len(live)]
+            self.next_worker += 1
+            return worker
+        worker = self.stream_worker.get(stream)
+        if worker not in live:
+            # New (or orphaned) stream: the live worker serving the fewest streams
+            load = {i: 0 for i in live}
+            for w in self.stream_worker.values():
+                if w in load:
+                    load[w] += 1
+            worker = self.stream_worker[stream] = min(live, key=lambda i: load[i])
+        return worker
+
+    def _retire(self, slot):
+        """Unlink slot's segment once every live worker has unmapped it."""
+        with self.cond:
+            live = [i for i, state in enumerate(self.worker_state) if state == 'ready']
+            if not live:
+                slot.release()
+                return
+            # The collector shrinks the stored set as workers detach, so it gets its own copy
+            self.retired[slot.shm.name] = (slot, set(live))
+            for i in live:
+                self.task_queues[i].put(('detach', slot.shm.name))
+
+    def submit(self, frame, ordered=True, stream=None, timeout=None):
+        """
+        Copy frame into a free slot and queue it. Blocks while all slots are
+        in flight, up to timeout (default PROCESS_TASK_TIMEOUT) seconds.
+        Returns the frame's seq, or None when no worker is serving or no slot
+        freed up in time.
+        """
+        timeout = config.PROCESS_TASK_TIMEOUT if timeout is None else timeout
+        if not self.live_workers():
+            return None
+        try:
+            slot_idx = self.free_slots.get(timeout=timeout)
+        except queue.Empty:
+            print(f"No free inference slot after {timeout:.0f} s.")
+            return None
+        slot = self.slots[slot_idx]
+        if frame.nbytes > slot.nbytes:
+            # Camera delivered a larger frame than configured; grow this slot. The new
+            # segment travels with the task; the old one is unlinked after workers detach.
+            try:
+                self.slots[slot_idx] = _Slot(frame.nbytes)
+            except OSError as e:
+                self.free_slots.put(slot_idx)
+                print(f"Could not grow inference slot to {frame.nbytes} bytes: {e}")
+                return None
+            self._retire(slot)
+            slot = self.slots[slot_idx]
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=slot.shm.buf)
+        view[:] = frame
+
+        with self.cond:
+            worker = self._pick_worker(stream)
+            if worker is None:
+                self.free_slots.put(slot_idx)
+                return None
+            seq = self.next_seq
+            self.next_seq += 1
+            self.slot_of_seq[seq] = slot_idx
+            self.worker_of_seq[seq] = worker
+            if ordered:
+                self.ordered.append(seq)
+            # Queued under the lock so a worker declared dead meanwhile still fails this seq
+            self.task_queues[worker].put(('task', seq, slot.shm.name, frame.shape, stream))
+        return seq
+
+    def get_ordered(self, timeout=None):
+        """Next (seq, results, latency) in submission order, or None on timeout."""
+        with self.cond:
+            ok = self.cond.wait_for(lambda: self.ordered and self.ordered[0] in self.completed, timeout)
+            if not ok:
+                return None
+            seq = self.ordered.popleft()
+            results, latency = self.completed.pop(seq)
+            return seq, results, latency
+
+    def detect(self, frame, stream=None, timeout=None):
+        """
+        Drop-in for FaceDetector.detect: returns (results, latency). Empty
+        results when no worker is serving or none answered within timeout
+        (default PROCESS_TASK_TIMEOUT).
+        """
+        timeout = config.PROCESS_TASK_TIMEOUT if timeout is None else timeout
+        seq = self.submit(frame, ordered=False, stream=stream, timeout=timeout)
+        if seq is None:
+            return _empty_results(), 0
+        with self.cond:
+            if not self.cond.wait_for(lambda: seq in self.completed, timeout):
+                self.abandoned.add(seq)
+                print(f"Inference timed out after {timeout:.0f} s.")
+                return _empty_results(), 0
+            return self.completed.pop(seq)
+
+    def close(self):
+        for i, p in enumerate(self.processes):
+            if p.is_alive():
+                self.task_queues[i].put(None)
+        for p in self.processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self.running = False
+        if self.collector:
+            self.collector.join(timeout=1)
+        for slot in self.slots:
+            slot.release()
+        for slot, _ in self.retired.values():
+            slot.release()
+        self.retired.clear()
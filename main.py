@@ -1,45 +1,82 @@
 import cv2
 import queue
+import threading
 import setup_data
 from db import DatabaseManager
 from detection import FaceDetector
 from threading_manager import VideoThread
+from startup import STARTUP
+import metrics
+import dnn_backend
 import config
 
+def load_in_background(video_thread, detector):
+    """
+    Fetch missing model files, then load the models; stages switch on as they
+    finish. Thread workers' detectors load in parallel. In process mode the
+    pool is started only now, and the GUI's detector mirrors its model status.
+    """
+    with STARTUP.measure('setup data'):
+        setup_data.setup()
+    pool = video_thread.pool
+    if pool is not None:
+        detector.model_state.update({name: 'loading' for name in detector.MODELS})
+        pool.start()
+        ready = pool.wait_until_ready()
+        detector.model_state.update(pool.model_state if ready else {name: 'off' for name in detector.MODELS})
+        detector.models_ready.set()
+    else:
+        detectors = []
+        for worker in video_thread.workers:
+            if isinstance(worker.detector, FaceDetector) and worker.detector not in detectors:
+                detectors.append(worker.detector)
+        threads = [threading.Thread(target=d.load_models, name=f"load-worker-{i}", daemon=True)
+                   for i, d in enumerate(detectors)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    STARTUP.mark('models ready')
+    STARTUP.report()
+
 def main():
     print("Starting Face Detection App...")
-    
-    # Ensure data exists
-    setup_data.setup()
-    
-    # Initialize Database
+    metrics.start_server()
+    dnn_backend.apply_thread_settings()
+
+    # Initialize Database (connects in the background)
     print("Initializing Database...")
-    db = DatabaseManager()
-    
-    # Initialize Face Detector
+    db = DatabaseManager(connect_async=True)
+
+    # Initialize Face Detector; models load after the preview is up
     print("Initializing Detector...")
-    detector = FaceDetector()
-    
+    detector = FaceDetector(lazy=True)
+
     # Communication Queue
     frame_queue = queue.Queue(maxsize=1)
-    
+
     # Initialize Video Thread
     print("Starting Video Thread...")
-    video_thread = VideoThread(detector, frame_queue)
-    
+    video_thread = VideoThread(detector, frame_queue, detector_factory=lambda: FaceDetector(lazy=True, preload_variants=False))
+
+    # Ensure data exists and load models without blocking the preview
+    threading.Thread(target=load_in_background, args=(video_thread, detector), name="model-loader", daemon=True).start()
+
     # Initialize GUI
     print(f"Starting GUI ({config.GUI_BACKEND})...")
-    
+
     if config.GUI_BACKEND == 'tk':
         import tkinter as tk
         from gui import FaceDetectionApp
-        root = tk.Tk()
-        app = FaceDetectionApp(root, db, video_thread, detector)
+        with STARTUP.measure('gui'):
+            root = tk.Tk()
+            app = FaceDetectionApp(root, db, video_thread, detector)
         root.protocol("WM_DELETE_WINDOW", app.on_closing)
         root.mainloop()
     else:
         from gui_cv2 import CV2GUI
-        app = CV2GUI(None, db, video_thread, detector)
+        with STARTUP.measure('gui'):
+            app = CV2GUI(None, db, video_thread, detector)
         app.run()
 
 if __name__ == "__main__":
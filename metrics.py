@@ -0,0 +1,199 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+
+# Latency buckets in seconds, from sub-millisecond stages up to a slow DB flush
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+def _label_text(labelnames, values, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _CounterChild:
+    __slots__ = ('lock', 'value')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        if not config.METRICS_ENABLED:
+            return
+        with self.lock:
+            self.value += amount
+
+class _HistogramChild:
+    __slots__ = ('lock', 'buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets) # per bucket, made cumulative when rendered
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        if not config.METRICS_ENABLED:
+            return
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            if i < len(self.counts):
+                self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+class Metric:
+    """A metric family; labels(*values) returns (and caches) the child for one label set."""
+    TYPE = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children = {}
+        self.lock = threading.Lock()
+        if not self.labelnames:
+            self.children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        values = tuple(str(v) for v in values)
+        child = self.children.get(values)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(values, self._new_child())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for values, child in sorted(self.children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+class Counter(Metric):
+    TYPE = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.children[()].inc(amount)
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{_label_text(self.labelnames, values)} {child.value}"]
+
+class Histogram(Metric):
+    TYPE = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, seconds):
+        self.children[()].observe(seconds)
+
+    def _render_child(self, values, child):
+        with child.lock:
+            counts, total, count = list(child.counts), child.sum, child.count
+        lines = []
+        cumulative = 0
+        labels = _label_text(self.labelnames, values)
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            le = _label_text(self.labelnames, values, 'le="%s"' % bound)
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        le = _label_text(self.labelnames, values, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{le} {count}")
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """Named metric families, rendered together in Prometheus text format."""
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+# Pipeline metrics
+STAGE_SECONDS = REGISTRY.histogram(
+    "face_app_stage_seconds", "Time spent per processing stage.", ("stage",))
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "face_app_queue_wait_seconds", "Time a frame waited in a pipeline buffer before being picked up.", ("queue",))
+FRAMES = REGISTRY.counter(
+    "face_app_frames_total", "Frames handled per pipeline stage.", ("stage",))
+FRAMES_DROPPED = REGISTRY.counter(
+    "face_app_frames_dropped_total", "Frames dropped (superseded) per pipeline stage.", ("stage",))
+GUI_CPU_SECONDS = REGISTRY.counter(
+    "face_app_gui_cpu_seconds_total", "CPU time used by the GUI thread.")
+DB_ROWS = REGISTRY.counter(
+    "face_app_db_rows_total", "Detection rows by outcome: written, dropped or failed.", ("result",))
+
+def observe_stages(timings_ms, stages):
+    """Record per-stage timings (ms, as in FaceDetector.stage_times) for the given stages."""
+    if not config.METRICS_ENABLED:
+        return
+    for stage in stages:
+        if stage in timings_ms:
+            STAGE_SECONDS.labels(stage).observe(timings_ms[stage] / 1000.0)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # scrapes are frequent; keep the console quiet
+
+def start_server(port=None, host=None):
+    """Serve /metrics from a daemon thread. Returns the server, or None if disabled or the port is taken."""
+    if not config.METRICS_ENABLED:
+        return None
+    port = port if port is not None else config.METRICS_PORT
+    host = host or config.METRICS_HOST
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        print(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"Metrics available at http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import cv2
+import numpy as np
+import config
+
+class ModelCache:
+    """
+    Fingerprints network source files and loads cached conversions of them.
+    Each model's fingerprint is a hash of its source files' names, sizes and
+    mtimes, so startup only stats the files instead of reading a few hundred
+    MB of weights. An ONNX file registered for the current fingerprint is read
+    instead of the Darknet/Caffe sources; editing, replacing or touching a
+    source file changes the fingerprint, so stale conversions are never used
+    (at worst a conversion has to be registered again). OpenCV cannot write a parsed network back out, so the ONNX
+    files come from an external converter (see `python -m model_cache add`)
+    and must keep the original output layout.
+    The manifest also records cold/warm load and warm-up times per model.
+    """
+    MANIFEST = "manifest.json"
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or config.MODEL_CACHE_DIR
+        self.lock = threading.Lock()
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        path = os.path.join(self.cache_dir, self.MANIFEST)
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault('models', {})
+        return manifest
+
+    def _save(self):
+        """Write the manifest atomically (callers hold self.lock)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, self.MANIFEST)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, path)
+
+    def file_key(self, path):
+        stat = os.stat(path)
+        return f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def fingerprint(self, paths):
+        """Short hash of a model's source files (name, size, mtime; contents are not read)."""
+        combined = hashlib.sha256("|".join(self.file_key(p) for p in paths).encode())
+        return combined.hexdigest()[:16]
+
+    def artifact_path(self, name, fingerprint):
+        return os.path.join(self.cache_dir, f"{name}-{fingerprint}.onnx")
+
+    def load(self, name, paths, reader):
+        """
+        Load model `name`, built from the source files in paths by reader().
+        Returns (net, info); info says where the net came from and how long
+        hashing and loading took.
+        """
+        t0 = time.perf_counter()
+        fingerprint = self.fingerprint(paths)
+        t1 = time.perf_counter()
+
+        artifact = self.artifact_path(name, fingerprint)
+        net = None
+        source = 'source'
+        if config.MODEL_CACHE_ENABLED and os.path.exists(artifact):
+            try:
+                net = cv2.dnn.readNetFromONNX(artifact)
+                source = 'onnx'
+            except cv2.error as e:
+                print(f"Cached model {artifact} could not be read ({e}); using the original files.")
+        if net is None:
+            net = reader()
+        t2 = time.perf_counter()
+
+        with self.lock:
+            previous = self.manifest['models'].get(name, {})
+            # Warm: this exact model has been loaded before (files likely in the OS page cache)
+            warm = previous.get('fingerprint') == fingerprint and previous.get('loads', 0) > 0
+            entry = dict(previous) if previous.get('fingerprint') == fingerprint else {}
+            entry.setdefault('loads', 0)
+            entry['fingerprint'] = fingerprint
+            entry['loads'] += 1
+            entry['source'] = source
+            entry['hash_ms'] = (t1 - t0) * 1000
+            entry['warm_load_ms' if warm else 'cold_load_ms'] = (t2 - t1) * 1000
+            self.manifest['models'][name] = entry
+            self._save()
+        info = {'fingerprint': fingerprint, 'source': source, 'warm': warm,
+                'hash_ms': (t1 - t0) * 1000, 'load_ms': (t2 - t1) * 1000}
+        return net, info
+
+    def warm_up(self, name, net, input_shape, outputs=None):
+        """
+        One throwaway forward pass so layer setup and buffer allocation happen
+        now rather than on the first real frame. Returns the pass time in ms.
+        """
+        t0 = time.perf_counter()
+        net.setInput(np.zeros(input_shape, dtype=np.float32))
+        if outputs:
+            net.forward(outputs)
+        else:
+            net.forward()
+        ms = (time.perf_counter() - t0) * 1000
+        with self.lock:
+            self.manifest['models'].setdefault(name, {})['warmup_ms'] = ms
+            self._save()
+        return ms
+
+    def add_artifact(self, name, onnx_path, paths):
+        """Register a converted ONNX file for the current fingerprint of paths."""
+        fingerprint = self.fingerprint(paths)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        target = self.artifact_path(name, fingerprint)
+        shutil.copyfile(onnx_path, target)
+        with self.lock:
+            if self.manifest['models'].get(name, {}).get('fingerprint') != fingerprint:
+                self.manifest['models'][name] = {'fingerprint': fingerprint, 'loads': 0}
+            self._save()
+        return target
+
+    def prune(self):
+        """Delete ONNX files whose fingerprint no longer matches a model's sources."""
+        with self.lock:
+            current = {f"{name}-{entry.get('fingerprint')}.onnx" for name, entry in self.manifest['models'].items()}
+        removed = []
+        if not os.path.isdir(self.cache_dir):
+            return removed
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".onnx") and filename not in current:
+                os.remove(os.path.join(self.cache_dir, filename))
+                removed.append(filename)
+        return removed
+
+# Source files per cacheable model, relative to data/
+MODEL_SOURCES = {
+    'gender': (config.GENDER_MODEL, config.GENDER_PROTO),
+    'yolo-tiny': (config.OBJECT_WEIGHTS_TINY, config.OBJECT_CONFIG_TINY),
+    'yolo-full': (config.OBJECT_WEIGHTS_FULL, config.OBJECT_CONFIG_FULL),
+    'mobilenet-ssd': (config.SSD_MODEL, config.SSD_PROTO),
+}
+
+def source_paths(name):
+    return [os.path.join("data", filename) for filename in MODEL_SOURCES[name]]
+
+# Shared cache for the running app
+MODEL_CACHE = ModelCache()
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the converted-model cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="register an ONNX conversion of a model")
+    add.add_argument("model", choices=sorted(MODEL_SOURCES))
+    add.add_argument("onnx", help="converted .onnx file")
+    sub.add_parser("list", help="show fingerprints, load times and cached files")
+    sub.add_parser("prune", help="delete conversions of outdated source files")
+    args = parser.parse_args()
+
+    cache = MODEL_CACHE
+    if args.command == "add":
+        target = cache.add_artifact(args.model, args.onnx, source_paths(args.model))
+        print(f"Cached {args.onnx} as {target}")
+    elif args.command == "list":
+        for name in sorted(MODEL_SOURCES):
+            paths = source_paths(name)
+            if not all(os.path.exists(p) for p in paths):
+                print(f"{name}: source files missing")
+                continue
+            fingerprint = cache.fingerprint(paths)
+            entry = cache.manifest['models'].get(name, {})
+            cached = os.path.exists(cache.artifact_path(name, fingerprint))
+            timings = ", ".join(f"{k} {entry[k]:.0f} ms" for k in ('cold_load_ms', 'warm_load_ms', 'warmup_ms')
+                                if k in entry)
+            print(f"{name}: {fingerprint} onnx={'yes' if cached else 'no'} {timings}")
+    else:
+        for filename in cache.prune():
+            print(f"Removed {filename}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import time
+import cv2
+import config
+
+class MotionGate:
+    """
+    Cheap change detector run in front of the full detectors.
+    Works on a downscaled, blurred grayscale copy of the frame, using either
+    frame differencing against the last frame that was processed ('diff') or
+    MOG2 background subtraction ('mog2'). check() reports whether anything
+    changed and, if so, which regions (in full-frame coordinates).
+    """
+    def __init__(self, method=None, scale=None, threshold=None, min_changed=None, roi_margin=None):
+        self.method = method or config.MOTION_METHOD
+        self.scale = scale or config.MOTION_SCALE
+        self.threshold = threshold or config.MOTION_THRESHOLD
+        self.min_changed = min_changed if min_changed is not None else config.MOTION_MIN_CHANGED
+        self.roi_margin = roi_margin if roi_margin is not None else config.MOTION_ROI_MARGIN
+        self.reference = None
+        self.subtractor = None
+        if self.method == 'mog2':
+            self.subtractor = cv2.createBackgroundSubtractorMOG2(history=300, detectShadows=False)
+
+        self.frames = 0
+        self.skipped = 0
+        self.gate_ms = 0.0
+        self.detect_ms_avg = 0.0 # moving average cost of a full detect(), for the savings estimate
+        self.saved_ms = 0.0
+
+    def reset(self):
+        self.reference = None
+
+    def _changed_mask(self, small):
+        if self.subtractor is not None:
+            return self.subtractor.apply(small)
+        if self.reference is None:
+            return None
+        diff = cv2.absdiff(small, self.reference)
+        _, mask = cv2.threshold(diff, self.threshold, 255, cv2.THRESH_BINARY)
+        return mask
+
+    def check(self, frame):
+        """
+        Returns (changed, rois). rois is None when the whole frame should be
+        processed, otherwise a list of (x, y, w, h) regions that changed.
+        """
+        start = time.perf_counter()
+        self.frames += 1
+        height, width = frame.shape[:2]
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+
+        mask = self._changed_mask(small)
+        if mask is None:
+            # First frame: nothing to compare against yet
+            self.reference = small
+            self.gate_ms += (time.perf_counter() - start) * 1000
+            return True, None
+
+        changed = cv2.countNonZero(mask) / float(mask.size)
+        if changed < self.min_changed:
+            # Keep the old reference so slow changes still add up
+            self.skipped += 1
+            self.saved_ms += self.detect_ms_avg
+            self.gate_ms += (time.perf_counter() - start) * 1000
+            return False, []
+
+        self.reference = small
+        mask = cv2.dilate(mask, None, iterations=2)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        rois = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            # Back to full resolution, with room for the face around the moving pixels
+            x, y, w, h = int(x / self.scale), int(y / self.scale), int(w / self.scale), int(h / self.scale)
+            dx, dy = int(w * self.roi_margin), int(h * self.roi_margin)
+            x1, y1 = max(0, x - dx), max(0, y - dy)
+            x2, y2 = min(width, x + w + dx), min(height, y + h + dy)
+            rois.append((x1, y1, x2 - x1, y2 - y1))
+        rois = merge_boxes(rois)
+
+        self.gate_ms += (time.perf_counter() - start) * 1000
+        # Large changes (camera moved, lights switched) are cheaper to scan in one go
+        if sum(w * h for _, _, w, h in rois) > config.MOTION_FULL_FRAME_FRACTION * width * height:
+            return True, None
+        return True, rois
+
+    def record_detect(self, latency_ms):
+        """Feed the cost of a full detection so skipped frames can be priced."""
+        if self.detect_ms_avg == 0:
+            self.detect_ms_avg = latency_ms
+        else:
+            self.detect_ms_avg = 0.9 * self.detect_ms_avg + 0.1 * latency_ms
+
+    def get_stats(self):
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skip_fraction': self.skipped / self.frames if self.frames else 0.0,
+            'gate_ms_total': self.gate_ms,
+            'est_saved_ms': max(0.0, self.saved_ms - self.gate_ms),
+        }
+
+def merge_boxes(boxes):
+    """Merge overlapping (x, y, w, h) boxes until none overlap."""
+    boxes = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                ax, ay, aw, ah = boxes[i]
+                bx, by, bw, bh = boxes[j]
+                if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                    x1, y1 = min(ax, bx), min(ay, by)
+                    x2, y2 = max(ax + aw, bx + bw), max(ay + ah, by + bh)
+                    boxes[i] = (x1, y1, x2 - x1, y2 - y1)
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return boxes
@@ -0,0 +1,283 @@
+"""
+Multi-camera processing with a shared detector worker pool.
+
+Each source (webcam index, RTSP URL or video file) gets its own capture
+thread; a fixed pool of FaceDetector workers serves all of them. Sources are
+scheduled round-robin with at most one frame per stream in flight, and each
+stream only keeps its freshest frame, so one slow or very fast stream cannot
+starve the others. Object detection for all workers goes through one
+YoloBatchDispatcher, so frames of different streams share batched YOLO
+forward passes (up to YOLO_MAX_BATCH frames, waiting at most
+YOLO_MAX_WAIT_MS). Results are routed back per stream.
+
+Usage (local files standing in for cameras):
+    python multi_camera.py lobby.mp4 door.mp4 0 rtsp://cam3/stream --workers 4 --duration 60
+"""
+import argparse
+import threading
+import time
+from collections import deque
+import cv2
+import config
+from object_scheduler import YoloBatchDispatcher
+from threading_manager import LatestBuffer, StageStats
+import metrics
+
+class StreamSource(threading.Thread):
+    """Capture thread for one source; keeps only the freshest frame."""
+    def __init__(self, stream_id, source, on_frame, realtime=True, loop=False):
+        super().__init__(daemon=True)
+        self.stream_id = stream_id
+        self.source = int(source) if str(source).isdigit() else source
+        self.is_file = isinstance(self.source, str) and "://" not in self.source
+        self.on_frame = on_frame
+        self.realtime = realtime
+        self.loop = loop
+        self.buffer = LatestBuffer()
+        self.stats = StageStats(f"{stream_id}-capture")
+        self.running = True
+        self.finished = False
+        self.seq = 0
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.source)
+        if not self.is_file:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.FRAME_WIDTH)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.FRAME_HEIGHT)
+        return cap
+
+    def run(self):
+        cap = self._open()
+        # Files are paced at their native FPS so they behave like live cameras
+        fps = cap.get(cv2.CAP_PROP_FPS) if self.is_file else 0
+        interval = 1.0 / fps if self.realtime and fps and fps > 0 else 0
+        next_time = time.time()
+        while self.running:
+            ret, frame = cap.read()
+            if not ret:
+                if self.is_file and self.loop:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                if self.is_file:
+                    break
+                # Camera/RTSP hiccup: reconnect
+                cap.release()
+                time.sleep(0.5)
+                cap = self._open()
+                continue
+
+            self.seq += 1
+            dropped_before = self.buffer.dropped
+            self.buffer.put((self.seq, frame, time.time()))
+            if self.buffer.dropped > dropped_before:
+                self.stats.drop()
+            self.stats.mark()
+            self.on_frame()
+
+            if interval:
+                next_time += interval
+                delay = next_time - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.time()
+        cap.release()
+        self.finished = True
+        self.on_frame()
+
+class StreamState:
+    """Scheduling state, results and metrics for one stream."""
+    def __init__(self, source):
+        self.source = source
+        self.in_flight = False
+        self.detector_state = None
+        self.results = LatestBuffer() # (seq, frame, results, latency) for consumers
+        self.processed = StageStats(f"{source.stream_id}-processed")
+        self.detect_ms = deque(maxlen=200)
+        self.end_to_end_ms = deque(maxlen=200)
+
+class MultiSourceManager:
+    """
+    Runs N capture threads into a shared, fairly scheduled detector pool.
+    on_result(stream_id, seq, frame, results, latency) is called from worker
+    threads; alternatively read each stream's .results buffer.
+    """
+    def __init__(self, sources, num_workers=None, batch_size=None, detector_factory=None, on_result=None,
+                 realtime=True, loop=False):
+        if detector_factory is None:
+            from detection import FaceDetector
+            # The cadence scheduler keeps one set of latest objects per detector, not per
+            # stream, so workers shared by several streams run object detection inline
+            detector_factory = lambda: FaceDetector(cadence='sync', preload_variants=False)
+
+        self.cond = threading.Condition()
+        self.streams = []
+        for i, src in enumerate(sources):
+            source = StreamSource(f"cam{i}", src, self._notify, realtime=realtime, loop=loop)
+            self.streams.append(StreamState(source))
+        self.batch_size = batch_size or config.MULTI_BATCH_SIZE
+        self.on_result = on_result
+        self.next_index = 0
+        self.running = False
+
+        num_workers = num_workers or config.MULTI_WORKERS
+        print(f"Loading {num_workers} detector workers for {len(self.streams)} streams...")
+        self.detectors = [detector_factory() for _ in range(num_workers)]
+        if any(d.object_scheduler.mode != 'sync' for d in self.detectors):
+            print("Warning: detectors with a non-'sync' object cadence mix object results between streams.")
+        for stream in self.streams:
+            stream.detector_state = self.detectors[0].new_stream_state()
+        # Workers pass their frames' objects in, so the first detector's object
+        # network is free for the dispatcher thread
+        self.dispatcher = YoloBatchDispatcher(self.detectors[0].object_detector) if config.MULTI_BATCH_YOLO else None
+        self.workers = [threading.Thread(target=self._work, args=(d,), daemon=True) for d in self.detectors]
+
+    def _notify(self):
+        with self.cond:
+            self.cond.notify_all()
+
+    def _ready(self, stream):
+        return not stream.in_flight and stream.source.buffer.has_item
+
+    def _next_batch(self):
+        """Round-robin pick of up to batch_size streams with a fresh frame and nothing in flight."""
+        with self.cond:
+            self.cond.wait_for(lambda: not self.running or any(self._ready(s) for s in self.streams), timeout=0.1)
+            batch = []
+            n = len(self.streams)
+            for k in range(n):
+                stream = self.streams[(self.next_index + k) % n]
+                if self._ready(stream):
+                    item = stream.source.buffer.get(timeout=0)
+                    if item is None:
+                        continue
+                    stream.in_flight = True
+                    batch.append((stream, item))
+                    if len(batch) >= self.batch_size:
+                        break
+            if batch:
+                # Start after the last stream served so every stream gets its turn
+                self.next_index = (self.streams.index(batch[-1][0]) + 1) % n
+            return batch
+
+    def _work(self, detector):
+        while self.running:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            # Queue every frame first so they can share a forward pass with other workers' frames
+            futures = [None] * len(batch)
+            if self.dispatcher:
+                futures = [self.dispatcher.submit(item[1]) for _, item in batch]
+
+            for (stream, (seq, frame, captured_at)), future in zip(batch, futures):
+                frame_objects, object_times = None, None
+                if future is not None:
+                    try:
+                        frame_objects = future.result()
+                        object_times = future.stage_times
+                    except Exception as e:
+                        print(f"Batched Object Detection Error: {e}")
+                        frame_objects = []
+                try:
+                    detector.use_stream_state(stream.detector_state)
+                    results, latency = detector.detect(frame, objects=frame_objects, object_times=object_times)
+                    detector.save_stream_state(stream.detector_state)
+                except Exception as e:
+                    print(f"{stream.source.stream_id} Detection Error: {e}")
+                    results, latency = {'faces': [], 'objects': []}, 0
+
+                stream.detect_ms.append(latency)
+                stream.end_to_end_ms.append((time.time() - captured_at) * 1000)
+                stream.processed.mark()
+                stream.results.put((seq, frame, results, latency))
+                if self.on_result:
+                    self.on_result(stream.source.stream_id, seq, frame, results, latency)
+                with self.cond:
+                    stream.in_flight = False
+                    self.cond.notify_all()
+
+    def start(self):
+        self.running = True
+        for stream in self.streams:
+            stream.source.start()
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self):
+        self.running = False
+        self._notify()
+        for stream in self.streams:
+            stream.source.running = False
+        for worker in self.workers:
+            worker.join(timeout=5)
+        if self.dispatcher:
+            self.dispatcher.close()
+        for stream in self.streams:
+            stream.source.join(timeout=2)
+        for detector in self.detectors:
+            detector.close()
+
+    def all_finished(self):
+        return all(s.source.finished and not s.source.buffer.has_item and not s.in_flight for s in self.streams)
+
+    def get_stats(self):
+        """Per-stream capture/processed FPS, drops and latency."""
+        stats = {}
+        for stream in self.streams:
+            detect = list(stream.detect_ms)
+            e2e = sorted(stream.end_to_end_ms)
+            stats[stream.source.stream_id] = {
+                'source': str(stream.source.source),
+                'capture_fps': stream.source.stats.fps(),
+                'processed_fps': stream.processed.fps(),
+                'captured': stream.source.stats.count,
+                'processed': stream.processed.count,
+                'dropped': stream.source.stats.dropped,
+                'detect_ms': sum(detect) / len(detect) if detect else 0.0,
+                'e2e_p90_ms': e2e[int(0.9 * (len(e2e) - 1))] if e2e else 0.0,
+            }
+        return stats
+
+def print_stats(stats):
+    print(f"{'stream':<6} {'cap fps':>8} {'proc fps':>8} {'processed':>9} {'dropped':>8} {'detect ms':>9} {'e2e p90':>8}  source")
+    for stream_id, s in stats.items():
+        print(f"{stream_id:<6} {s['capture_fps']:>8.1f} {s['processed_fps']:>8.1f} {s['processed']:>9} "
+              f"{s['dropped']:>8} {s['detect_ms']:>9.1f} {s['e2e_p90_ms']:>8.1f}  {s['source']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-camera detection with a shared worker pool")
+    parser.add_argument("sources", nargs="+", help="webcam indexes, RTSP URLs or video files")
+    parser.add_argument("--workers", type=int, default=config.MULTI_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=config.MULTI_BATCH_SIZE)
+    parser.add_argument("--duration", type=float, default=0, help="seconds to run (0 = until files end)")
+    parser.add_argument("--loop", action="store_true", help="loop video files")
+    parser.add_argument("--no-realtime", action="store_true", help="read files as fast as possible")
+    parser.add_argument("--report-every", type=float, default=5.0)
+    args = parser.parse_args()
+
+    metrics.start_server()
+    manager = MultiSourceManager(args.sources, num_workers=args.workers, batch_size=args.batch_size,
+                                 realtime=not args.no_realtime, loop=args.loop)
+    manager.start()
+    start = time.time()
+    last_report = start
+    try:
+        while True:
+            time.sleep(0.2)
+            now = time.time()
+            if args.duration and now - start >= args.duration:
+                break
+            if not args.duration and manager.all_finished():
+                break
+            if now - last_report >= args.report_every:
+                print_stats(manager.get_stats())
+                last_report = now
+    except KeyboardInterrupt:
+        pass
+    manager.stop()
+    print(f"\nFinal ({time.time() - start:.1f} s):")
+    print_stats(manager.get_stats())
+
+if __name__ == "__main__":
+    main()
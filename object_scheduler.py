@@ -0,0 +1,193 @@
+import threading
+import time
+from concurrent.futures import Future
+import config
+from threading_manager import LatestBuffer
+from affinity import CORES
+
+class ObjectScheduler:
+    """
+    Decouples ObjectDetector (YOLO) from the face path.
+    Cadence modes:
+        'sync'     - run inline on every frame (original behaviour)
+        'interval' - hand every Nth frame to a background worker
+        'adaptive' - hand over a frame whenever the worker is idle, so YOLO
+                     runs at whatever rate the hardware sustains
+    Frames in between get the most recent object results plus their age.
+    """
+    MODES = ('sync', 'interval', 'adaptive')
+
+    def __init__(self, object_detector, mode=None, interval=None):
+        self.detector = object_detector
+        self.mode = mode or config.OBJECT_DETECTION_CADENCE
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown object detection cadence: {self.mode}")
+        self.interval = max(1, interval or config.OBJECT_DETECTION_INTERVAL)
+
+        self.lock = threading.Lock()
+        self.latest = []
+        self.latest_index = 0 # frame index the latest results belong to
+        self.latest_time = 0
+        self.stage_times = {}
+        self.generation = 0 # bumped by reset(); results from an older generation are dropped
+        self.frame_index = 0
+        self.last_submitted = None
+        self.busy = False
+        self.runs = 0
+
+        self.pending = LatestBuffer()
+        self.running = True
+        self.worker = None
+        if self.mode != 'sync':
+            self.worker = threading.Thread(target=self._run, daemon=True)
+            self.worker.start()
+
+    def _due(self):
+        if self.mode == 'interval':
+            return self.last_submitted is None or self.frame_index - self.last_submitted >= self.interval
+        # adaptive: only when nothing is running or queued
+        return not self.busy and not self.pending.has_item
+
+    def submit(self, frame):
+        """Advance one frame; returns (objects, age_frames, age_ms) for the newest available results."""
+        self.frame_index += 1
+        if self.mode == 'sync':
+            # No worker thread in sync mode, so the detector's stage_times are ours to reset
+            self.detector.stage_times = {}
+            objects = self.detector.detect(frame)
+            self._publish(objects, self.generation, self.frame_index, dict(self.detector.stage_times))
+            return objects, 0, 0.0
+
+        if self._due():
+            self.last_submitted = self.frame_index
+            with self.lock:
+                self.busy = True
+            # Capture buffers are recycled once the pipeline releases them, so the worker gets its own copy
+            self.pending.put((self.generation, self.frame_index, frame.copy()))
+
+        with self.lock:
+            objects = self.latest
+            age_frames = self.frame_index - self.latest_index if self.latest_time else None
+            age_ms = (time.time() - self.latest_time) * 1000 if self.latest_time else None
+        return objects, age_frames, age_ms
+
+    def _publish(self, objects, generation, index, stage_times):
+        with self.lock:
+            if generation != self.generation:
+                return # frame from before the last reset(); its index means nothing now
+            self.latest = objects
+            self.latest_index = index
+            self.latest_time = time.time()
+            self.stage_times = stage_times
+            self.runs += 1
+
+    def get_stage_times(self):
+        """Stage times of the latest published run (written by the worker, so read under the lock)."""
+        with self.lock:
+            return dict(self.stage_times)
+
+    def _run(self):
+        CORES.pin('yolo')
+        while self.running:
+            item = self.pending.get(timeout=0.1)
+            if item is None:
+                continue
+            generation, index, frame = item
+            try:
+                objects = self.detector.detect(frame)
+                self._publish(objects, generation, index, dict(self.detector.stage_times))
+            except Exception as e:
+                print(f"Object Detection Error: {e}")
+            finally:
+                with self.lock:
+                    self.busy = self.pending.has_item
+
+    def reset(self):
+        """Forget results of the previous sequence; a run still in flight is discarded when it finishes."""
+        self.pending.get(timeout=0) # drop a queued frame of the old sequence
+        with self.lock:
+            self.generation += 1
+            self.busy = False
+            self.latest = []
+            self.latest_index = 0
+            self.latest_time = 0
+        self.frame_index = 0
+        self.last_submitted = None
+
+    def close(self):
+        self.running = False
+        self.pending.close()
+        if self.worker:
+            self.worker.join(timeout=2)
+
+class YoloBatchDispatcher:
+    """
+    Collects frames from any number of producer threads and runs them through
+    ObjectDetector.detect_batch, flushing when max_batch frames are waiting or
+    the oldest has waited max_wait_ms. submit() returns a Future per frame;
+    its .stage_times holds the batch's timings once it is done.
+    Used by multi_camera (frames of all streams and workers) and
+    batch_process (consecutive frames of a file). The dispatcher's thread is
+    the only caller of object_detector while it runs.
+    """
+    def __init__(self, object_detector, max_batch=None, max_wait_ms=None):
+        self.detector = object_detector
+        self.max_batch = max_batch or config.YOLO_MAX_BATCH
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.YOLO_MAX_WAIT_MS) / 1000.0
+        self.cond = threading.Condition()
+        self.pending = [] # (enqueued_at, frame, future)
+        self.running = True
+        self.batches = 0
+        self.frames = 0
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, frame):
+        future = Future()
+        with self.cond:
+            self.pending.append((time.time(), frame, future))
+            self.cond.notify()
+        return future
+
+    def detect(self, frame):
+        """Blocking single-frame call that still shares a forward pass with other callers."""
+        return self.submit(frame).result()
+
+    def _take_batch(self):
+        with self.cond:
+            while self.running:
+                if self.pending:
+                    waited = time.time() - self.pending[0][0]
+                    if len(self.pending) >= self.max_batch or waited >= self.max_wait:
+                        break
+                    self.cond.wait(self.max_wait - waited)
+                else:
+                    self.cond.wait(0.1)
+            batch = self.pending[:self.max_batch]
+            del self.pending[:self.max_batch]
+            return batch
+
+    def _run(self):
+        CORES.pin('yolo')
+        while self.running or self.pending:
+            batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                results = self.detector.detect_batch([frame for _, frame, _ in batch])
+                # Shared forward/decode time of this batch, for the frames' stage timings
+                stage_times = dict(self.detector.stage_times)
+                for (_, _, future), objects in zip(batch, results):
+                    future.stage_times = stage_times
+                    future.set_result(objects)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+            self.batches += 1
+            self.frames += len(batch)
+
+    def close(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.worker.join(timeout=5)
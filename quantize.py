@@ -0,0 +1,150 @@
+import argparse
+import glob
+import os
+import cv2
+import config
+from model_cache import MODEL_CACHE, source_paths
+
+# Input preprocessing per quantizable model, matching what the detectors feed the nets
+INPUT_SIZES = {'gender': 227, 'yolo-tiny': config.INT8_INPUT_SIZE}
+
+def int8_path(name):
+    """Path of the INT8 variant of model `name` when USE_INT8_MODELS is on and the file exists, else None."""
+    filename = config.INT8_MODELS.get(name)
+    if not config.USE_INT8_MODELS or not filename:
+        return None
+    path = os.path.join("data", filename)
+    return path if os.path.exists(path) else None
+
+def load_calibration_frames(source, limit=100):
+    """Frames from a video file, an image glob or a directory of images."""
+    frames = []
+    if os.path.isdir(source) or any(c in source for c in "*?["):
+        pattern = os.path.join(source, "*") if os.path.isdir(source) else source
+        for path in sorted(glob.glob(pattern)):
+            image = cv2.imread(path)
+            if image is not None:
+                frames.append(image)
+            if len(frames) >= limit:
+                break
+    else:
+        cap = cv2.VideoCapture(source)
+        while len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+    return frames
+
+def face_crops(frames, limit=None):
+    """
+    Padded Haar face crops, cut the way FaceDetector.classify_genders cuts
+    them. Frames without a face contribute their centre square instead, so
+    a calibration set never comes back empty.
+    """
+    cascade = cv2.CascadeClassifier(os.path.join("data", config.HAAR_CASCADE_FILENAME))
+    crops = []
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        rects = cascade.detectMultiScale(gray, config.SCALE_FACTOR, config.MIN_NEIGHBORS,
+                                         minSize=config.MIN_SIZE) if not cascade.empty() else []
+        found = False
+        for (x, y, w, h) in rects:
+            if w <= 20 or h <= 20:
+                continue
+            x1, y1 = max(0, x - 10), max(0, y - 10)
+            x2, y2 = min(frame.shape[1], x + w + 10), min(frame.shape[0], y + h + 10)
+            crops.append(frame[y1:y2, x1:x2])
+            found = True
+        if not found:
+            side = min(frame.shape[:2])
+            top, left = (frame.shape[0] - side) // 2, (frame.shape[1] - side) // 2
+            crops.append(frame[top:top + side, left:left + side])
+        if limit and len(crops) >= limit:
+            return crops[:limit]
+    return crops
+
+def calibration_blobs(name, frames, size=None):
+    """Single-image input blobs for model `name`, preprocessed exactly like inference."""
+    size = size or INPUT_SIZES[name]
+    if name == 'gender':
+        return [cv2.dnn.blobFromImage(face, 1.0, (size, size), config.GENDER_MEAN, swapRB=False)
+                for face in face_crops(frames)]
+    return [cv2.dnn.blobFromImage(frame, 0.00392, (size, size), (0, 0, 0), True, crop=False)
+            for frame in frames]
+
+def quantize_model(name, fp32_path, output, mode='static', frames=None, size=None):
+    """
+    Write an INT8 copy of the FP32 ONNX network fp32_path to output.
+    'dynamic' only quantizes weights; activations are scaled at run time by
+    integer ops that OpenCV's ONNX importer does not support, so it is for
+    ONNX Runtime consumers. 'static' calibrates activation ranges on frames
+    and writes QuantizeLinear/DequantizeLinear pairs, which OpenCV >= 4.7
+    runs with its int8 kernels.
+    """
+    try:
+        import onnx
+        from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                              quantize_dynamic, quantize_static)
+    except ImportError:
+        raise SystemExit("INT8 quantization needs onnx and onnxruntime: pip install onnx onnxruntime")
+
+    if mode == 'dynamic':
+        quantize_dynamic(fp32_path, output, weight_type=QuantType.QInt8)
+        return output
+
+    input_name = onnx.load(fp32_path).graph.input[0].name
+    blobs = calibration_blobs(name, frames, size)
+    if not blobs:
+        raise SystemExit("Static quantization needs calibration frames (--calibration).")
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.blobs = iter(blobs)
+
+        def get_next(self):
+            blob = next(self.blobs, None)
+            return None if blob is None else {input_name: blob}
+
+    print(f"Calibrating {name} on {len(blobs)} inputs")
+    quantize_static(fp32_path, output, FrameReader(), quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QInt8, weight_type=QuantType.QInt8, per_channel=True)
+    return output
+
+def main():
+    parser = argparse.ArgumentParser(description="Build INT8 variants of the gender and YOLO-tiny networks")
+    parser.add_argument("model", choices=sorted(config.INT8_MODELS))
+    parser.add_argument("--onnx", help="FP32 ONNX export (default: the model cache's conversion of data/)")
+    parser.add_argument("--mode", choices=['static', 'dynamic'], default='static')
+    parser.add_argument("--calibration", help="video file, image glob or directory (required for static mode)")
+    parser.add_argument("--frames", type=int, default=100, help="calibration frames to use")
+    parser.add_argument("--size", type=int, help="network input size (must match the ONNX export and INT8_INPUT_SIZE)")
+    parser.add_argument("--output", help="default: data/<INT8_MODELS entry>")
+    args = parser.parse_args()
+
+    fp32_path = args.onnx
+    if not fp32_path:
+        # OpenCV cannot export ONNX; reuse the conversion registered with `python -m model_cache add`
+        paths = source_paths(args.model)
+        if not all(os.path.exists(p) for p in paths):
+            raise SystemExit(f"{args.model} source files missing; run setup_data.py first.")
+        fp32_path = MODEL_CACHE.artifact_path(args.model, MODEL_CACHE.fingerprint(paths))
+        if not os.path.exists(fp32_path):
+            raise SystemExit(f"No ONNX conversion of {args.model} is cached; pass --onnx "
+                             f"or register one with `python -m model_cache add {args.model} <file>`.")
+
+    frames = None
+    if args.mode == 'static':
+        if not args.calibration:
+            raise SystemExit("Static quantization needs --calibration frames (a clip or images like the camera sees).")
+        frames = load_calibration_frames(args.calibration, limit=args.frames)
+        if not frames:
+            raise SystemExit(f"No frames could be read from {args.calibration}.")
+    output = args.output or os.path.join("data", config.INT8_MODELS[args.model])
+    quantize_model(args.model, fp32_path, output, args.mode, frames, args.size)
+    print(f"Wrote {output} ({os.path.getsize(fp32_path) / 1e6:.1f} MB -> {os.path.getsize(output) / 1e6:.1f} MB)")
+    print("Set USE_INT8_MODELS = True in config.py to use it; python -m benchmarks.quantized compares it with FP32.")
+
+if __name__ == "__main__":
+    main()
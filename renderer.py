@@ -0,0 +1,174 @@
+from collections import OrderedDict
+import cv2
+import numpy as np
+import config
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+class Sprite:
+    """
+    A rasterized piece of text: a uint8 coverage mask of shape (h, w) and a
+    solid colour patch of the same size to copy through it. (dx, dy) is the
+    offset of the top-left corner from the putText-style origin (left end of
+    the baseline).
+    """
+    __slots__ = ('mask', 'patch', 'dx', 'dy')
+
+    def __init__(self, mask, patch, dx, dy):
+        self.mask = mask
+        self.patch = patch
+        self.dx, self.dy = dx, dy
+
+    @property
+    def shape(self):
+        return self.mask.shape
+
+# color -> solid uint8 image, grown as needed; sprites of one colour share views of it
+_patches = {}
+
+def color_patch(color, h, w):
+    color = tuple(color)
+    patch = _patches.get(color)
+    if patch is None or patch.shape[0] < h or patch.shape[1] < w:
+        ph, pw = (max(h, patch.shape[0]), max(w, patch.shape[1])) if patch is not None else (h, w)
+        patch = _patches[color] = np.empty((ph, pw, 3), np.uint8)
+        patch[:] = color
+    return patch[:h, :w]
+
+def rasterize(text, color, scale, thickness):
+    """Draw text once into a binary mask (the pixels putText sets with LINE_8) and wrap it as a Sprite."""
+    (w, h), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+    pad = thickness
+    mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), np.uint8)
+    cv2.putText(mask, text, (pad, pad + h), FONT, scale, 255, thickness, cv2.LINE_8)
+    # OpenCV 5 anti-aliases text regardless of lineType; keep hard edges so blit is a plain masked copy
+    cv2.threshold(mask, 127, 255, cv2.THRESH_BINARY, dst=mask)
+    return Sprite(mask, color_patch(color, *mask.shape), -pad, -(pad + h))
+
+def blit(image, sprite, org):
+    """Copy sprite's colour onto image through its mask at a putText-style origin, clipped to the image."""
+    x, y = org[0] + sprite.dx, org[1] + sprite.dy
+    h, w = sprite.mask.shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, image.shape[1]), min(y + h, image.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    if x1 - x0 == w and y1 - y0 == h:
+        cv2.copyTo(sprite.patch, sprite.mask, image[y0:y1, x0:x1])
+        return
+    sx, sy = x0 - x, y0 - y
+    cv2.copyTo(sprite.patch[sy:sy + y1 - y0, sx:sx + x1 - x0], sprite.mask[sy:sy + y1 - y0, sx:sx + x1 - x0],
+               image[y0:y1, x0:x1])
+
+class SpriteCache:
+    """LRU of text sprites keyed on (text, color, scale, thickness)."""
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or config.RENDER_SPRITE_CACHE_SIZE
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, color, scale, thickness):
+        key = (text, tuple(color), scale, thickness)
+        sprite = self.entries.get(key)
+        if sprite is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        sprite = rasterize(text, color, scale, thickness)
+        self.entries[key] = sprite
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return sprite
+
+# Corner directions (top-left, top-right, bottom-right, bottom-left) for growing a rectangle outward
+_SPREAD = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], np.int32)
+
+class OverlayRenderer:
+    """
+    Draws detection overlays with as few OpenCV calls as possible: boxes of
+    one colour go out in a single polylines() call, labels are copied
+    through cached masks instead of re-rasterized with putText every frame
+    (one cv2.copyTo per label, no float blending), and
+    stats panel lines are cached per row once they stop changing. Panel
+    lines never enter the label LRU, so volatile readouts (FPS, latency)
+    cannot evict label sprites.
+    """
+    OBJECT_COLOR = (255, 0, 0)
+    FACE_COLOR = (0, 255, 0)
+    GENDER_COLORS = {'Female': (255, 100, 100)}
+    DEFAULT_GENDER_COLOR = (100, 100, 255)
+
+    def __init__(self, max_sprites=None):
+        self.sprites = SpriteCache(max_sprites)
+        self.panel_rows = [] # row -> ((text, color, scale), sprite or None while the line is changing)
+        self.panel_redraws = 0 # lines rasterized for the panel
+
+    def text(self, image, text, org, color, scale, thickness=2):
+        blit(image, self.sprites.get(text, color, scale, thickness), org)
+
+    def boxes(self, image, rects, color, thickness=2):
+        """
+        Outline every (x, y, w, h) in rects with one polylines() call. Thick
+        outlines are drawn as nested 1-pixel rectangles (the same band
+        rectangle() covers, with square corners): OpenCV's 1-pixel line is
+        about twice as fast as its thick-line path.
+        """
+        if not len(rects):
+            return
+        r = np.asarray(rects, np.int32).reshape(-1, 4)
+        x0, y0 = r[:, 0], r[:, 1]
+        x1, y1 = x0 + r[:, 2], y0 + r[:, 3]
+        corners = np.stack([x0, y0, x1, y0, x1, y1, x0, y1], 1).reshape(-1, 4, 2)
+        offsets = np.arange(-(thickness // 2), thickness // 2 + 1, dtype=np.int32).reshape(-1, 1, 1, 1)
+        polygons = corners + offsets * _SPREAD
+        cv2.polylines(image, polygons.reshape(-1, 4, 2), True, color, 1)
+
+    def draw_objects(self, image, objects):
+        """objects: [(label, conf, (x, y, w, h))]"""
+        color, get = self.OBJECT_COLOR, self.sprites.get
+        self.boxes(image, [rect for _, _, rect in objects], color)
+        for label, conf, (x, y, w, h) in objects:
+            blit(image, get(f"{label} {conf*100:.0f}%", color, 0.5, 2), (x, y - 5))
+
+    def draw_faces(self, image, faces):
+        """faces: [((x, y, w, h), gender)]"""
+        self.boxes(image, [rect for rect, _ in faces], self.FACE_COLOR)
+        for (x, y, w, h), gender in faces:
+            color = self.GENDER_COLORS.get(gender, self.DEFAULT_GENDER_COLOR)
+            self.text(image, gender, (x, y + h + 20), color, 0.7)
+
+    def draw_panel(self, image, lines, org=(10, 30), line_height=25, color=(0, 255, 0), scale=0.6):
+        """
+        Draw the stats panel line by line. A line that just changed is drawn
+        with putText; once it has stayed the same for a frame it is
+        rasterized and copied from then on, so readouts that change every
+        frame never pay for rasterizing on top of drawing.
+        """
+        rows = self.panel_rows
+        del rows[len(lines):]
+        for i, line in enumerate(lines):
+            key = (line, tuple(color), scale)
+            y = org[1] + i * line_height
+            if i < len(rows) and rows[i][0] == key:
+                sprite = rows[i][1]
+                if sprite is None:
+                    sprite = rasterize(line, color, scale, 2)
+                    rows[i] = (key, sprite)
+                    self.panel_redraws += 1
+                blit(image, sprite, (org[0], y))
+                continue
+            if i < len(rows):
+                rows[i] = (key, None)
+            else:
+                rows.append((key, None))
+            cv2.putText(image, line, (org[0], y), FONT, scale, color, 2, cv2.LINE_8)
+
+    def get_stats(self):
+        return {
+            'sprites': len(self.sprites.entries),
+            'hits': self.sprites.hits,
+            'misses': self.sprites.misses,
+            'panel_redraws': self.panel_redraws,
+        }
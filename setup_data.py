@@ -55,5 +55,8 @@ def setup():
     
     download_file_curl(config.OBJECT_MODEL_URL_NAMES, os.path.join("data", config.OBJECT_NAMES))
 
+    # MobileNet-SSD (the prototxt ships in data/)
+    download_file_curl(config.SSD_MODEL_URL, os.path.join("data", config.SSD_MODEL))
+
 if __name__ == "__main__":
     setup()
@@ -0,0 +1,42 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupTimer:
+    """Records how long each startup component takes and when milestones happen."""
+    def __init__(self):
+        self.start = time.time()
+        self.lock = threading.Lock()
+        self.durations = [] # (component, seconds, thread name)
+        self.milestones = {} # name -> seconds since start
+
+    @contextmanager
+    def measure(self, component):
+        t0 = time.time()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.durations.append((component, time.time() - t0, threading.current_thread().name))
+
+    def mark(self, milestone):
+        """Record the first time a milestone (e.g. 'first frame') is reached."""
+        with self.lock:
+            if milestone not in self.milestones:
+                self.milestones[milestone] = time.time() - self.start
+
+    def report(self):
+        with self.lock:
+            durations = list(self.durations)
+            milestones = sorted(self.milestones.items(), key=lambda m: m[1])
+        print("========================================")
+        print("          STARTUP TIMING REPORT")
+        print("========================================")
+        for component, seconds, thread in durations:
+            print(f" {component:<24} {seconds * 1000:>8.0f} ms  [{thread}]")
+        for milestone, seconds in milestones:
+            print(f" -> {milestone:<21} {seconds * 1000:>8.0f} ms after launch")
+        print("========================================")
+
+# Shared timer for the running app
+STARTUP = StartupTimer()
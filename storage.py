@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import threading
+import config
+
+class StorageBackend:
+    """Interface DatabaseManager talks to; one implementation per database engine."""
+    name = "base"
+
+    def connect(self):
+        raise NotImplementedError
+
+    def is_connected(self):
+        raise NotImplementedError
+
+    def create_tables(self):
+        raise NotImplementedError
+
+    def insert_detections(self, rows):
+        """Insert (faces_detected, mode, fps, latency_ms) rows in one transaction."""
+        raise NotImplementedError
+
+    def insert_benchmark(self, row):
+        """Insert one (cpu_fps, gpu_fps, cpu_latency_ms, gpu_latency_ms) row."""
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+class SQLiteBackend(StorageBackend):
+    """
+    Embedded SQLite database in WAL mode.
+    Statements use fixed SQL text so sqlite3's statement cache keeps them prepared.
+    """
+    name = "sqlite"
+    DETECTION_INSERT = "INSERT INTO detections (faces_detected, mode, fps, latency_ms) VALUES (?, ?, ?, ?)"
+    BENCHMARK_INSERT = "INSERT INTO benchmarks (cpu_fps, gpu_fps, cpu_latency_ms, gpu_latency_ms) VALUES (?, ?, ?, ?)"
+
+    def __init__(self, path=None):
+        self.path = path or config.SQLITE_PATH
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        try:
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            # isolation_level=None: we issue BEGIN/COMMIT ourselves around each batch
+            self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            print(f"Using SQLite database at {self.path}")
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite database: {e}")
+            self.connection = None
+
+    def is_connected(self):
+        return self.connection is not None
+
+    def create_tables(self):
+        if not self.is_connected():
+            return
+        try:
+            with open(config.SQLITE_SCHEMA_PATH, 'r') as f:
+                schema = f.read()
+            with self.lock:
+                self.connection.executescript(schema)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error creating tables: {e}")
+
+    def _write(self, query, rows):
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.executemany(query, rows)
+                self.connection.execute("COMMIT")
+            except sqlite3.Error:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def insert_detections(self, rows):
+        self._write(self.DETECTION_INSERT, rows)
+
+    def insert_benchmark(self, row):
+        self._write(self.BENCHMARK_INSERT, [row])
+
+    def close(self):
+        if self.connection:
+            with self.lock:
+                self.connection.close()
+            self.connection = None
+
+class MySQLBackend(StorageBackend):
+    """MySQL server backend with a connection pool (needs mysql-connector-python)."""
+    name = "mysql"
+    DETECTION_INSERT = "INSERT INTO detections (faces_detected, mode, fps, latency_ms) VALUES (%s, %s, %s, %s)"
+    BENCHMARK_INSERT = "INSERT INTO benchmarks (cpu_fps, gpu_fps, cpu_latency_ms, gpu_latency_ms) VALUES (%s, %s, %s, %s)"
+
+    def __init__(self):
+        self.pool = None
+
+    def connect(self):
+        try:
+            import mysql.connector
+            from mysql.connector import errorcode, pooling
+        except ImportError:
+            print("mysql-connector-python is not installed. Database logging disabled.")
+            return
+
+        params = dict(host=config.DB_HOST, user=config.DB_USER, password=config.DB_PASSWORD)
+        try:
+            try:
+                self.pool = pooling.MySQLConnectionPool(
+                    pool_name="sentinel", pool_size=config.DB_POOL_SIZE, database=config.DB_NAME, **params
+                )
+            except mysql.connector.Error as e:
+                if e.errno != errorcode.ER_BAD_DB_ERROR:
+                    raise
+                # Only create the database the first time it is missing
+                temp_conn = mysql.connector.connect(**params)
+                cursor = temp_conn.cursor()
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {config.DB_NAME}")
+                temp_conn.close()
+                self.pool = pooling.MySQLConnectionPool(
+                    pool_name="sentinel", pool_size=config.DB_POOL_SIZE, database=config.DB_NAME, **params
+                )
+            print("Successfully connected to the database.")
+        except mysql.connector.Error as e:
+            print(f"Error connecting to MySQL: {e}")
+            self.pool = None
+
+    def is_connected(self):
+        return self.pool is not None
+
+    def create_tables(self):
+        if not self.is_connected():
+            return
+        conn = self.pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            with open("data/schema.sql", 'r') as f:
+                statements = f.read().split(';')
+                for statement in statements:
+                    if statement.strip():
+                        cursor.execute(statement)
+            conn.commit()
+            print("Tables checked/created successfully.")
+        except Exception as e:
+            print(f"Error creating tables: {e}")
+        finally:
+            conn.close() # returns the connection to the pool
+
+    def _write(self, query, rows):
+        conn = self.pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(query, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def insert_detections(self, rows):
+        self._write(self.DETECTION_INSERT, rows)
+
+    def insert_benchmark(self, row):
+        self._write(self.BENCHMARK_INSERT, [row])
+
+    def close(self):
+        # Pooled connections are closed as they are garbage collected
+        self.pool = None
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'mysql': MySQLBackend,
+}
+
+def create_backend(name=None):
+    name = name or config.DB_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return BACKENDS[name]()
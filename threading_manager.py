@@ -2,10 +2,184 @@ import threading
 import cv2
 import time
 import queue
+from collections import deque
 import config
+from startup import STARTUP
+from frame_ring import FrameRing
+import metrics
+from affinity import CORES
+
+class LatestBuffer:
+    """
+    Single-slot buffer: a new item replaces any unconsumed one (latest wins).
+    on_drop(item) is called for every replaced item, e.g. to release its frame.
+    """
+    def __init__(self, on_drop=None):
+        self.cond = threading.Condition()
+        self.on_drop = on_drop
+        self.item = None
+        self.has_item = False
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        replaced = None
+        with self.cond:
+            if self.has_item:
+                self.dropped += 1
+                replaced = self.item
+            self.item = item
+            self.has_item = True
+            self.cond.notify()
+        if replaced is not None and self.on_drop:
+            self.on_drop(replaced)
+
+    def get(self, timeout=None):
+        """Pop the freshest item, or return None on timeout/close."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.has_item or self.closed, timeout)
+            if not self.has_item:
+                return None
+            item = self.item
+            self.item = None
+            self.has_item = False
+            return item
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+class StageStats:
+    """Throughput and drop counters for one pipeline stage."""
+    def __init__(self, name, window=30):
+        self.name = name
+        self.frames_metric = metrics.FRAMES.labels(name)
+        self.dropped_metric = metrics.FRAMES_DROPPED.labels(name)
+        self.count = 0
+        self.dropped = 0
+        self.stamps = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def mark(self):
+        with self.lock:
+            self.count += 1
+            self.stamps.append(time.time())
+        self.frames_metric.inc()
+
+    def drop(self, n=1):
+        with self.lock:
+            self.dropped += n
+        self.dropped_metric.inc(n)
+
+    def fps(self):
+        with self.lock:
+            if len(self.stamps) < 2:
+                return 0.0
+            span = self.stamps[-1] - self.stamps[0]
+            return (len(self.stamps) - 1) / span if span > 0 else 0.0
+
+    def snapshot(self):
+        fps = self.fps()
+        with self.lock:
+            return {'fps': fps, 'frames': self.count, 'dropped': self.dropped}
+
+class CaptureThread(threading.Thread):
+    """
+    Reads the camera as fast as it delivers, keeping only the freshest frame.
+    Frames are read into FrameRing slots; the reference taken here passes to
+    out_buffer with the frame. A frame that finds no free slot is dropped.
+    """
+    def __init__(self, cap, ring, out_buffer, stats):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.ring = ring
+        self.out_buffer = out_buffer
+        self.stats = stats
+        self.running = True
+        self.seq = 0
+        self.capture_metric = metrics.STAGE_SECONDS.labels('capture')
+
+    def run(self):
+        while self.running:
+            t0 = time.perf_counter()
+            misses_before = self.ring.misses
+            frame = self.ring.read(self.cap)
+            if frame is None:
+                if self.ring.misses > misses_before:
+                    self.stats.drop() # every ring slot still borrowed downstream
+                else:
+                    time.sleep(0.005)
+                continue
+            frame.stamp = time.perf_counter()
+            # Includes waiting for the camera, so it tracks the delivered frame interval
+            self.capture_metric.observe(frame.stamp - t0)
+            self.seq += 1
+            frame.seq = self.seq
+            dropped_before = self.out_buffer.dropped
+            self.out_buffer.put((self.seq, frame))
+            if self.out_buffer.dropped > dropped_before:
+                self.stats.drop()
+            self.stats.mark()
+
+class InferenceWorker(threading.Thread):
+    """Pulls the freshest captured frame and runs the detector on it (frame ownership passes through)."""
+    def __init__(self, owner, detector, in_buffer, out_buffer, stats):
+        super().__init__(daemon=True)
+        self.owner = owner
+        self.detector = detector
+        self.in_buffer = in_buffer
+        self.out_buffer = out_buffer
+        self.stats = stats
+        self.running = True
+        self.wait_metric = metrics.QUEUE_WAIT_SECONDS.labels('capture')
+
+    def run(self):
+        CORES.pin('haar', 'gender')
+        while self.running:
+            item = self.in_buffer.get(timeout=0.1)
+            if item is None:
+                continue
+            seq, frame = item
+            self.wait_metric.observe(time.perf_counter() - frame.stamp)
+
+            results = []
+            latency = 0
+            # Pass frames straight through while detection is off
+            if self.owner.detection_active or self.owner.benchmark_active:
+                try:
+                    results, latency = self.detector.detect(frame.image)
+                except Exception as e:
+                    # Keep the worker alive (the process pool raises on a dead worker); the frame goes back to the ring
+                    print(f"Inference error: {e}")
+                    frame.release()
+                    self.stats.drop()
+                    continue
+                self.owner.record_latency(latency)
+                self.stats.mark()
+
+            dropped_before = self.out_buffer.dropped
+            frame.stamp = time.perf_counter()
+            self.out_buffer.put((seq, frame, results, latency))
+            if self.out_buffer.dropped > dropped_before:
+                self.stats.drop()
 
 class VideoThread(threading.Thread):
-    def __init__(self, detector, frame_queue):
+    """
+    Capture -> inference -> output pipeline.
+    Stages are connected by latest-wins buffers so a slow detector never
+    throttles capture; the output stage puts
+    (frame, results, fps, latency, benchmark_active) tuples on frame_queue.
+
+    frame_queue contract: frame is a borrowed ring Frame, not an ndarray, so
+    the pipeline never copies an image. Consumers read the BGR image from
+    frame.image (read-only; draw overlays on a copy such as OverlayCanvas)
+    and must call frame.release() exactly once for every item they take off
+    the queue, drawn or not (DisplayScheduler does this for frames it skips).
+    A consumer that keeps frames without releasing them starves capture,
+    which then drops frames (counted as capture drops).
+    """
+    def __init__(self, detector, frame_queue, detector_factory=None, num_workers=None):
         super().__init__()
         self.detector = detector
         self.frame_queue = frame_queue
@@ -14,62 +188,142 @@ class VideoThread(threading.Thread):
         self.benchmark_active = False
         self.benchmark_start_time = 0
         self.benchmark_duration = 0
-        self.benchmark_data = [] # List of (fps, latency)
+        self.benchmark_data = [] # List of latencies (ms)
+        self.benchmark_lock = threading.Lock()
+
+        with STARTUP.measure('camera open'):
+            self.cap = cv2.VideoCapture(config.CAMERA_INDEX)
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.FRAME_WIDTH)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.FRAME_HEIGHT)
 
-        self.cap = cv2.VideoCapture(config.CAMERA_INDEX)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.FRAME_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.FRAME_HEIGHT)
+        # Pipeline wiring; frames dropped by a buffer go back to the ring
+        self.capture_buffer = LatestBuffer(on_drop=lambda item: item[1].release())
+        self.result_buffer = LatestBuffer(on_drop=lambda item: item[1].release())
+        self.stats = {
+            'capture': StageStats('capture'),
+            'inference': StageStats('inference'),
+            'output': StageStats('output'),
+        }
+
+        self.pool = None
+        if config.INFERENCE_BACKEND == 'process':
+            # One feeder thread per worker process; the pool's detect() is thread-safe.
+            # Processes are spawned by the model loader (see main.load_in_background),
+            # after setup_data has fetched the files they load.
+            from inference_pool import ProcessInferencePool
+            self.pool = ProcessInferencePool(config.PROCESS_WORKERS, start=False)
+            detectors = [self.pool] * self.pool.num_workers
+        else:
+            # Detectors are not thread-safe, so every extra worker needs its own instance
+            num_workers = num_workers or config.INFERENCE_WORKERS
+            if num_workers > 1 and detector_factory is None:
+                print("Warning: extra inference workers need a detector_factory. Using 1 worker.")
+                num_workers = 1
+            detectors = [detector] + [detector_factory() for _ in range(num_workers - 1)]
+        self.workers = [
+            InferenceWorker(self, d, self.capture_buffer, self.result_buffer, self.stats['inference'])
+            for d in detectors
+        ]
+
+        # Frames in flight: one being captured, one per buffer, one per worker, the
+        # output stage's, the queued ones, and two on the GUI thread (DisplayScheduler
+        # holds one for its refresh slot while it takes the next from the queue)
+        ring_size = config.FRAME_RING_SIZE or len(self.workers) + 6 + max(1, frame_queue.maxsize)
+        self.ring = FrameRing(ring_size, (config.FRAME_HEIGHT, config.FRAME_WIDTH, 3))
+        self.capture_thread = CaptureThread(self.cap, self.ring, self.capture_buffer, self.stats['capture'])
 
     def run(self):
         prev_frame_time = 0
-        new_frame_time = 0
+        last_seq = 0
+        wait_metric = metrics.QUEUE_WAIT_SECONDS.labels('result')
+
+        self.capture_thread.start()
+        for worker in self.workers:
+            worker.start()
 
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
+            item = self.result_buffer.get(timeout=0.1)
+            if item is None:
                 continue
+            seq, frame, results, latency = item
+            wait_metric.observe(time.perf_counter() - frame.stamp)
 
-            faces = []
-            latency = 0
-            
-            # Detection Logic
-            if self.detection_active or self.benchmark_active:
-                # Detector returns ({'faces':..., 'objects':...}, latency)
-                results_dict, latency = self.detector.detect(frame)
-                
-                # Check for legacy faces list just in case detector isn't updated? 
-                # No, we updated it. 
-                # extract faces for queue/fps logic if needed? 
-                # Actually, queue just passes it through.
-                # Update variable 'faces' to be valid for queue tuple if needed
-                # But we can just pass results_dict in place of 'faces' in queue tuple
-                # The queue was: (frame, faces, fps, latency, benchmark_active)
-                # We will change it to: (frame, results_dict, fps, latency, benchmark_active)
-                faces = results_dict
-
-                # Benchmark Storage
-                if self.benchmark_active:
-                    self.benchmark_data.append(latency)
-                    if time.time() - self.benchmark_start_time > self.benchmark_duration:
-                        self.benchmark_active = False
-                        # Notify GUI or Main that benchmark is done (via queue or callback? 
-                        # simpler to just let GUI poll or use a specific event, 
-                        # but here we'll just stop collecting). 
-                        print("Benchmark complete.")
-
-            # FPS Calculation
+            # Workers can finish out of order; never show an older frame
+            if seq <= last_seq:
+                frame.release()
+                self.stats['output'].drop()
+                continue
+            last_seq = seq
+
+            # FPS of the frames actually delivered to the GUI
             new_frame_time = time.time()
             fps = 1 / (new_frame_time - prev_frame_time) if prev_frame_time > 0 else 0
             prev_frame_time = new_frame_time
-            
-            # Push to Queue (drop if full to avoid lag)
-            if not self.frame_queue.full():
-                self.frame_queue.put((frame, faces, fps, latency, self.benchmark_active))
 
-            # Maintain Target FPS (optional sleep)
-            # time.sleep(max(0, 1/config.TARGET_FPS - (time.time() - new_frame_time)))
+            # Push to Queue, replacing a frame the GUI has not picked up yet
+            frame.stamp = time.perf_counter()
+            try:
+                self.frame_queue.put_nowait((frame, results, fps, latency, self.benchmark_active))
+            except queue.Full:
+                try:
+                    self.frame_queue.get_nowait()[0].release()
+                    self.stats['output'].drop()
+                except queue.Empty:
+                    pass
+                try:
+                    self.frame_queue.put_nowait((frame, results, fps, latency, self.benchmark_active))
+                except queue.Full:
+                    frame.release()
+                    self.stats['output'].drop()
+            self.stats['output'].mark()
+            STARTUP.mark('first frame')
 
+        self._shutdown_stages()
         self.cap.release()
+        # Hand back frames the GUI never picked up
+        while True:
+            try:
+                self.frame_queue.get_nowait()[0].release()
+            except queue.Empty:
+                break
+
+    def _shutdown_stages(self):
+        self.capture_thread.running = False
+        for worker in self.workers:
+            worker.running = False
+        self.capture_buffer.close()
+        self.result_buffer.close()
+        self.capture_thread.join(timeout=2)
+        for worker in self.workers:
+            worker.join(timeout=2)
+        # Stages are stopped; hand back the frames still parked between them
+        for buffer in (self.capture_buffer, self.result_buffer):
+            item = buffer.get(timeout=0)
+            if item is not None:
+                item[1].release()
+        # Detectors may own a worker thread (async object cadence); stop each one once
+        detectors = []
+        for d in [self.detector] + [w.detector for w in self.workers]:
+            if d is not self.pool and d not in detectors:
+                detectors.append(d)
+        for d in detectors:
+            d.close()
+        if self.pool:
+            self.pool.close()
+
+    def record_latency(self, latency):
+        """Called by inference workers after each detect()."""
+        if not self.benchmark_active:
+            return
+        with self.benchmark_lock:
+            self.benchmark_data.append(latency)
+            if time.time() - self.benchmark_start_time > self.benchmark_duration:
+                self.benchmark_active = False
+                print("Benchmark complete.")
+
+    def get_pipeline_stats(self):
+        """Per-stage throughput (fps), processed frame counts and drops."""
+        return {name: stats.snapshot() for name, stats in self.stats.items()}
 
     def start_detection(self):
         self.detection_active = True
@@ -78,15 +332,18 @@ class VideoThread(threading.Thread):
         self.detection_active = False
 
     def start_benchmark(self, duration=10):
-        self.benchmark_data = []
-        self.benchmark_duration = duration
-        self.benchmark_start_time = time.time()
-        self.benchmark_active = True
+        with self.benchmark_lock:
+            self.benchmark_data = []
+            self.benchmark_duration = duration
+            self.benchmark_start_time = time.time()
+            self.benchmark_active = True
 
     def get_benchmark_results(self):
-        if not self.benchmark_data:
+        with self.benchmark_lock:
+            data = list(self.benchmark_data)
+        if not data:
             return 0, 0
-        avg_latency = sum(self.benchmark_data) / len(self.benchmark_data)
+        avg_latency = sum(data) / len(data)
         avg_fps = 1000 / avg_latency if avg_latency > 0 else 0
         return avg_fps, avg_latency
 
@@ -0,0 +1,222 @@
+from collections import Counter, OrderedDict, deque
+import config
+
+def iou(a, b):
+    """Intersection-over-union of two (x, y, w, h) boxes."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+def expand_box(box, margin, width, height):
+    """Grow a box by margin (fraction of its size) on every side, clipped to the frame."""
+    x, y, w, h = box
+    dx = int(w * margin)
+    dy = int(h * margin)
+    x1 = max(0, x - dx)
+    y1 = max(0, y - dy)
+    x2 = min(width, x + w + dx)
+    y2 = min(height, y + h + dy)
+    return (x1, y1, x2 - x1, y2 - y1)
+
+class Track:
+    """One followed face with a stable id."""
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = box
+        self.misses = 0
+        self.gender = None # label from the first successful classification (used without GenderCache)
+
+class FaceTracker:
+    """
+    Runs full-frame face detection every detect_interval frames and, in
+    between, re-detects each known face inside a small ROI around its last
+    box. A face lost in its ROI forces a full detection on the next frame.
+    detect_fn(gray, roi=None) must return (x, y, w, h) boxes in frame coordinates.
+    """
+    def __init__(self, detect_fn, detect_interval=None, roi_margin=None, max_misses=None, iou_threshold=0.3):
+        self.detect_fn = detect_fn
+        self.detect_interval = detect_interval or config.FACE_DETECT_INTERVAL
+        self.roi_margin = roi_margin if roi_margin is not None else config.TRACK_ROI_MARGIN
+        self.max_misses = max_misses if max_misses is not None else config.TRACK_MAX_MISSES
+        self.iou_threshold = iou_threshold
+
+        self.tracks = []
+        self.next_id = 1
+        self.frame_index = 0
+        self.last_full = None
+        self.need_full = True
+        self.full_detections = 0
+        self.roi_detections = 0
+
+    def reset(self):
+        self.tracks = []
+        self.need_full = True
+
+    def update(self, gray):
+        """Advance one frame and return the active tracks."""
+        self.frame_index += 1
+        due = self.last_full is None or self.frame_index - self.last_full >= self.detect_interval
+
+        if due or self.need_full:
+            self.last_full = self.frame_index
+            self.need_full = False
+            self.full_detections += 1
+            self._associate(self.detect_fn(gray))
+        else:
+            self.roi_detections += 1
+            self._follow(gray)
+
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+        return [t for t in self.tracks if t.misses == 0]
+
+    def _follow(self, gray):
+        height, width = gray.shape[:2]
+        for track in self.tracks:
+            roi = expand_box(track.box, self.roi_margin, width, height)
+            candidates = self.detect_fn(gray, roi)
+            best = max(candidates, key=lambda r: iou(track.box, r), default=None)
+            if best is not None and iou(track.box, best) > 0:
+                track.box = tuple(int(v) for v in best)
+                track.misses = 0
+            else:
+                track.misses += 1
+                # Lost face: confidence dropped, re-scan the whole frame next time
+                self.need_full = True
+
+    def _associate(self, rects):
+        """Greedy IoU matching of fresh detections onto existing tracks."""
+        rects = [tuple(int(v) for v in r) for r in rects]
+        pairs = sorted(
+            ((iou(t.box, r), ti, ri) for ti, t in enumerate(self.tracks) for ri, r in enumerate(rects)),
+            reverse=True
+        )
+        used_tracks = set()
+        used_rects = set()
+        for score, ti, ri in pairs:
+            if score < self.iou_threshold:
+                break
+            if ti in used_tracks or ri in used_rects:
+                continue
+            self.tracks[ti].box = rects[ri]
+            self.tracks[ti].misses = 0
+            used_tracks.add(ti)
+            used_rects.add(ri)
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in used_tracks:
+                track.misses += 1
+        for ri, rect in enumerate(rects):
+            if ri not in used_rects:
+                self.tracks.append(Track(self.next_id, rect))
+                self.next_id += 1
+
+class GenderCache:
+    """
+    Per-face gender labels with a rolling vote.
+    Faces are keyed by tracker id when available, otherwise by IoU against
+    the boxes seen on previous frames. The Caffe net only re-runs for a face
+    every refresh_interval frames, or sooner while the vote is uncertain.
+    Entries expire after ttl frames unseen, and the least recently seen
+    entry is evicted once max_entries is reached.
+    """
+    UNLABELED = ("Unknown", "Error")
+
+    def __init__(self, refresh_interval=None, vote_window=None, min_agreement=None, ttl=None,
+                 max_entries=None, iou_threshold=0.4):
+        self.refresh_interval = refresh_interval or config.GENDER_CACHE_REFRESH
+        self.vote_window = vote_window or config.GENDER_CACHE_VOTES
+        self.min_agreement = min_agreement if min_agreement is not None else config.GENDER_CACHE_MIN_AGREEMENT
+        self.ttl = ttl or config.GENDER_CACHE_TTL
+        self.max_entries = max_entries or config.GENDER_CACHE_MAX_ENTRIES
+        self.iou_threshold = iou_threshold
+
+        self.entries = OrderedDict() # key -> {'box', 'votes', 'last_inferred', 'last_seen'}
+        self.frame_index = 0
+        self.next_key = 0
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def next_frame(self):
+        """Advance the frame clock and drop entries past their TTL."""
+        self.frame_index += 1
+        expired = [k for k, e in self.entries.items() if self.frame_index - e['last_seen'] > self.ttl]
+        for k in expired:
+            del self.entries[k]
+        self.evictions += len(expired)
+
+    def keys_for(self, boxes, track_ids=None):
+        """Resolve a cache key per face box for the current frame."""
+        track_ids = track_ids or [None] * len(boxes)
+        keys = []
+        claimed = set()
+        for box, track_id in zip(boxes, track_ids):
+            if track_id is not None:
+                key = ('track', track_id)
+            else:
+                key = None
+                best = self.iou_threshold
+                for k, entry in self.entries.items():
+                    if k[0] != 'box' or k in claimed:
+                        continue
+                    score = iou(box, entry['box'])
+                    if score >= best:
+                        key, best = k, score
+                if key is None:
+                    key = ('box', self.next_key)
+                    self.next_key += 1
+            claimed.add(key)
+            keys.append(key)
+        return keys
+
+    def needs_inference(self, key):
+        """True when this face has no label, is due for a refresh or has an uncertain vote."""
+        self.lookups += 1
+        entry = self.entries.get(key)
+        if entry is None or not entry['votes']:
+            return True
+        if self.frame_index - entry['last_inferred'] >= self.refresh_interval:
+            return True
+        top = Counter(entry['votes']).most_common(1)[0][1]
+        if top / len(entry['votes']) < self.min_agreement:
+            return True
+        self.hits += 1
+        return False
+
+    def update(self, key, box, gender=None):
+        """Mark a face as seen this frame, adding a vote when it was just classified."""
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {'box': box, 'votes': deque(maxlen=self.vote_window), 'last_inferred': self.frame_index,
+                     'last_seen': self.frame_index}
+            self.entries[key] = entry
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        entry['box'] = box
+        entry['last_seen'] = self.frame_index
+        self.entries.move_to_end(key)
+        if gender is not None:
+            entry['last_inferred'] = self.frame_index
+            if gender not in self.UNLABELED:
+                entry['votes'].append(gender)
+
+    def label(self, key):
+        entry = self.entries.get(key)
+        if entry is None or not entry['votes']:
+            return "Unknown"
+        return Counter(entry['votes']).most_common(1)[0][0]
+
+    def get_stats(self):
+        return {
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.lookups if self.lookups else 0.0,
+            'saved_inferences': self.hits,
+            'entries': len(self.entries),
+            'evictions': self.evictions,
+        }